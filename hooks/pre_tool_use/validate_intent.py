@@ -26,20 +26,52 @@ def debug_log(msg, project_root=None):
         pass
 
 
+def _iter_lines_reversed(path, chunk_size=65536):
+    """Yield the lines of a file last-to-first, reading it from the end in chunks."""
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        position = f.tell()
+        tail = b""
+        while position > 0:
+            step = min(chunk_size, position)
+            position -= step
+            f.seek(position)
+            lines = (f.read(step) + tail).split(b"\n")
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if tail.strip():
+            yield tail
+
+
+def _session_messages_reversed(root):
+    """Session messages, newest first: session.jsonl (streamed), else legacy session.json."""
+    logs = root / ".opencode" / "logs"
+    session_jsonl = logs / "session.jsonl"
+    if session_jsonl.exists():
+        for line in _iter_lines_reversed(session_jsonl):
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+        return
+
+    session_log = logs / "session.json"
+    if session_log.exists():
+        data = json.loads(session_log.read_text())
+        yield from reversed(data.get("messages", []))
+
+
 def load_session_agent(project_root, session_id):
-    """Resolve agent/mode for the current session from .opencode/logs/session.json."""
+    """Resolve agent/mode for the current session from the copied session log."""
     if not project_root or not session_id:
         return None
 
     try:
-        root = Path(project_root)
-        session_log = root / ".opencode" / "logs" / "session.json"
-        if not session_log.exists():
-            return None
-
-        data = json.loads(session_log.read_text())
-        messages = data.get("messages", [])
-        for msg in reversed(messages):
+        for msg in _session_messages_reversed(Path(project_root)):
+            if not isinstance(msg, dict):
+                continue
             if msg.get("sessionID") != session_id:
                 continue
             if msg.get("role") != "assistant":
@@ -18,6 +18,13 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Set, Tuple, Optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+import task_id_codec
+
+# Compiled once per process, not per detector instance
+MISSING_TASK_ID_RE = re.compile(rf'^(?!.*{task_id_codec.TASK_ID_PATTERN}).*\.(md|json|txt|py|js|ts|yaml|yml)$')
+GLOBAL_MEMORY_RE = re.compile(r'.*01_memory.*')
+
 class ContextContaminationDetector:
     """Detects and reports contamination in parallel task execution."""
     
@@ -73,7 +80,7 @@ class ContextContaminationDetector:
         # Pattern 1: Missing task ID in files
         patterns.append({
             'name': 'missing_task_id',
-            'pattern': re.compile(r'^(?!.*task_[0-9]+_[0-9]+_[a-z]+_[a-f0-9]+_[0-9]+).*\.(md|json|txt|py|js|ts|yaml|yml)$'),
+            'pattern': MISSING_TASK_ID_RE,
             'severity': 'high',
             'description': 'File missing task ID prefix'
         })
@@ -81,7 +88,7 @@ class ContextContaminationDetector:
         # Pattern 2: Task ID in wrong context (cross-task reference)
         patterns.append({
             'name': 'cross_task_reference',
-            'pattern': re.compile(r'task_([0-9]+)_([0-9]+)_([a-z]+)_([a-f0-9]+)_([0-9]+)'),
+            'pattern': task_id_codec.TASK_ID_SEARCH_RE,
             'severity': 'medium',
             'description': 'Cross-task file reference'
         })
@@ -89,7 +96,7 @@ class ContextContaminationDetector:
         # Pattern 3: Global memory modification
         patterns.append({
             'name': 'global_memory_modification',
-            'pattern': re.compile(r'.*01_memory.*'),
+            'pattern': GLOBAL_MEMORY_RE,
             'severity': 'critical',
             'description': 'Modification of global memory'
         })
@@ -133,15 +140,15 @@ class ContextContaminationDetector:
             for file in files:
                 file_path = Path(root) / file
                 rel_path = file_path.relative_to(self.tasks_base)
+                rel_str = str(rel_path)
                 
                 # Check each detection pattern
                 for pattern_info in self.detection_patterns:
-                    if pattern_info['pattern'].search(str(rel_path)):
+                    match = pattern_info['pattern'].search(rel_str)
+                    if match:
                         # Check if this is a valid self-reference
-                        if pattern_info['name'] == 'cross_task_reference':
-                            match = pattern_info['pattern'].search(str(rel_path))
-                            if match and match.group(0) == task_id:
-                                continue  # Self-reference is OK
+                        if pattern_info['name'] == 'cross_task_reference' and match.group(0) == task_id:
+                            continue  # Self-reference is OK
                         
                         event = {
                             'type': pattern_info['name'],
@@ -194,21 +201,18 @@ class ContextContaminationDetector:
             return []
         
         events = []
-        task_id_pattern = re.compile(r'task_([0-9]+)_([0-9]+)_([a-z]+)_([a-f0-9]+)_([0-9]+)')
         
         for root, dirs, files in os.walk(self.global_memory):
-            for file in files:
+            # Check if files have a task ID but are in global memory (one regex pass per directory)
+            for file in task_id_codec.search_many(files):
                 file_path = Path(root) / file
-                
-                # Check if file has task ID but is in global memory
-                if task_id_pattern.search(file):
-                    events.append({
-                        'type': 'task_file_in_global_memory',
-                        'severity': 'high',
-                        'message': f'Task-specific file in global memory: {file_path.relative_to(self.global_memory)}',
-                        'file_path': str(file_path),
-                        'timestamp': datetime.now().isoformat()
-                    })
+                events.append({
+                    'type': 'task_file_in_global_memory',
+                    'severity': 'high',
+                    'message': f'Task-specific file in global memory: {file_path.relative_to(self.global_memory)}',
+                    'file_path': str(file_path),
+                    'timestamp': datetime.now().isoformat()
+                })
         
         return events
     
@@ -362,14 +366,15 @@ class ContextContaminationDetector:
         """
         Validate that a task ID follows the expected format.
         
+        Strict: an 8-digit hash and no subtask suffix, as generated.
+        
         Args:
             task_id: Task ID to validate
             
         Returns:
             True if valid format
         """
-        pattern = re.compile(r'^task_\d{8}_\d{6}_[a-z]+_[a-f0-9]{8}_\d+$')
-        return bool(pattern.match(task_id))
+        return task_id_codec.validate(task_id, oracle=False, strict=True)
 
 def main():
     """Command-line interface for contamination detector."""
@@ -1,59 +1,303 @@
 #!/usr/bin/env python3
+"""
+NSO Session Import — Stream OpenCode Session Messages into the Project
+
+Copies the messages of this workspace's most recent OpenCode session
+into .opencode/logs/session.jsonl, one message per line.
+
+- The session is found through a cached workspace -> session map
+  (.opencode/cache/session_map.json). Only session directories that are
+  new or changed since the last run are opened, and only the first
+  message that records a working directory is read.
+- Messages are streamed: each file is read, written as one JSONL line and
+  dropped, so memory does not grow with the session.
+- Imports are incremental. A cursor (the (mtime_ns, name) of the last
+  imported message file) is kept in .opencode/cache/session_cursor.json,
+  and later runs append only messages written after it. A message that is
+  rewritten after import is appended again; readers take the last line
+  for a message ID.
+- --watch keeps the log current: it polls the storage and session
+  directory mtimes and mirrors new messages as they appear, in batches of
+  at most WATCH_BATCH files. Restarts resume from the cursor.
+
+Usage:
+    python3 copy_session.py [--storage DIR] [--full]
+    python3 copy_session.py --watch [--interval SECONDS]
+
+    OPENCODE_STORAGE_PATH overrides the default message storage
+    (~/.local/share/opencode/storage/message).
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
 import json
-import sys
 import os
-import shutil
-import glob
+import sys
+import threading
+import time
 from pathlib import Path
+from typing import Any, Iterator, Optional
 
-def copy_session():
-    # Target project name and workspace root
-    project_name = Path.cwd().name
-    workspace_root = str(Path.cwd())
-    storage_path = "/Users/opencode/.local/share/opencode/storage/message"
-    
-    # We look for the most recent session that has messages related to this workspace
-    session_dirs = sorted(glob.glob(os.path.join(storage_path, "ses_*")), key=os.path.getmtime, reverse=True)
-    
-    found_session = None
-    for ses_dir in session_dirs:
-        # Check a few messages to see if they belong to this project
-        msg_files = glob.glob(os.path.join(ses_dir, "msg_*.json"))
-        for msg_file in msg_files[:5]:
+sys.path.insert(0, str(Path(__file__).parent))
+from file_lock import atomic_write_json, file_lock, read_json
+
+
+DEFAULT_STORAGE_PATH = "~/.local/share/opencode/storage/message"
+SESSION_LOG = Path(".opencode/logs/session.jsonl")
+SESSION_MAP = Path(".opencode/cache/session_map.json")
+SESSION_CURSOR = Path(".opencode/cache/session_cursor.json")
+PROBE_MESSAGES = 5  # messages read per session when looking for its workspace
+WATCH_INTERVAL = 1.0  # seconds between storage polls in --watch mode
+WATCH_BATCH = 500  # max message files held in memory per sync step
+SETTLE_SECONDS = 2.0  # an unreadable message younger than this may still be being written
+
+
+def storage_path() -> str:
+    return os.path.expanduser(os.environ.get("OPENCODE_STORAGE_PATH", DEFAULT_STORAGE_PATH))
+
+
+# ─── Session Discovery ──────────────────────────────────────────────
+
+def _message_files(session_dir: str) -> Iterator[os.DirEntry]:
+    """Message files of a session, streamed in directory order."""
+    try:
+        with os.scandir(session_dir) as it:
+            for entry in it:
+                if entry.name.startswith("msg_") and entry.name.endswith(".json"):
+                    yield entry
+    except FileNotFoundError:
+        return
+
+
+def _first_messages(session_dir: str) -> list[os.DirEntry]:
+    """The PROBE_MESSAGES message files with the lowest names (the session start)."""
+    return heapq.nsmallest(PROBE_MESSAGES, _message_files(session_dir), key=lambda e: e.name)
+
+
+def _session_workspace(session_dir: str) -> Optional[str]:
+    """Working directory recorded in the session's first messages (None if unknown)."""
+    for entry in _first_messages(session_dir):
+        try:
+            with open(entry.path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        path = data.get("path") if isinstance(data, dict) else None
+        if isinstance(path, dict):
+            workspace = path.get("cwd") or path.get("root")
+            if workspace:
+                return str(workspace)
+    return None
+
+
+def _mentions_workspace(session_dir: str, workspace_root: str) -> bool:
+    """Fallback for sessions without path metadata: raw text search of the first messages."""
+    for entry in _first_messages(session_dir):
+        try:
+            with open(entry.path, "r") as f:
+                if workspace_root in f.read():
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+def find_session(workspace_root: str, storage: Optional[str] = None,
+                 map_path: Path = SESSION_MAP) -> Optional[str]:
+    """
+    Return the directory of the most recent session for a workspace.
+
+    Args:
+        workspace_root: Absolute path of the project.
+        storage: OpenCode message storage (default: storage_path()).
+        map_path: Cached session -> workspace map; updated in place.
+    """
+    storage = storage or storage_path()
+    cache = read_json(map_path, {})
+    if cache.get("storage") != storage:
+        cache = {"storage": storage, "sessions": {}}
+    sessions: dict[str, dict[str, Any]] = cache["sessions"]
+
+    try:
+        with os.scandir(storage) as it:
+            dirs = [(e.stat().st_mtime_ns, e.name, e.path) for e in it
+                    if e.name.startswith("ses_") and e.is_dir()]
+    except FileNotFoundError:
+        return None
+
+    changed = False
+    live = set()
+    for mtime_ns, name, path in dirs:
+        live.add(name)
+        known = sessions.get(name)
+        # A session's workspace never changes; unknown ones are re-probed when they grow
+        if known and (known["workspace"] or known["mtime_ns"] == mtime_ns):
+            continue
+        sessions[name] = {"workspace": _session_workspace(path), "mtime_ns": mtime_ns}
+        changed = True
+
+    for name in set(sessions) - live:
+        del sessions[name]
+        changed = True
+    if changed:
+        atomic_write_json(map_path, cache)
+
+    dirs.sort(reverse=True)
+    for _, name, path in dirs:
+        if sessions[name]["workspace"] == workspace_root:
+            return path
+    for _, name, path in dirs:
+        if sessions[name]["workspace"] is None and _mentions_workspace(path, workspace_root):
+            return path
+    return None
+
+
+# ─── Import ─────────────────────────────────────────────────────────
+
+def iter_new_messages(session_dir: str, after: Optional[list] = None,
+                      limit: Optional[int] = None) -> Iterator[tuple[list, dict]]:
+    """
+    Yield ((mtime_ns, name), message) for message files newer than the
+    cursor, oldest first; at most `limit` files (the oldest) if given.
+
+    Stops at an unreadable file that was modified in the last
+    SETTLE_SECONDS (it is probably still being written, and the cursor
+    must not pass it); older unreadable files are skipped.
+    """
+    def newer():
+        # Filtered against the cursor while the directory is listed, so only
+        # the files after it are ever held or ordered
+        after_mtime, after_name = after if after is not None else (-1, "")
+        for entry in _message_files(session_dir):
             try:
-                with open(msg_file, 'r') as f:
-                    data = json.load(f)
-                    # Check if 'cwd' or 'workspace' matches our project
-                    if workspace_root in str(data):
-                        found_session = ses_dir
-                        break
-            except:
+                mtime = entry.stat().st_mtime_ns
+            except FileNotFoundError:
                 continue
-        if found_session:
-            break
-            
-    if not found_session:
-        print("⚠️ No active session found for this project.")
-        return
+            if mtime > after_mtime or (mtime == after_mtime and entry.name > after_name):
+                yield [mtime, entry.name], entry.path
 
-    dest_dir = Path(workspace_root) / ".opencode" / "logs"
-    dest_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Merge all messages into a single session file
-    all_messages = []
-    msg_files = sorted(glob.glob(os.path.join(found_session, "msg_*.json")), key=os.path.getmtime)
-    for msg_file in msg_files:
+    entries = heapq.nsmallest(limit, newer()) if limit else sorted(newer())
+
+    for key, path in entries:
         try:
-            with open(msg_file, 'r') as f:
-                all_messages.append(json.load(f))
-        except:
+            with open(path, "r") as f:
+                message = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            if time.time_ns() - key[0] < SETTLE_SECONDS * 1e9:
+                return
             continue
-            
-    session_file = dest_dir / "session.json"
-    with open(session_file, 'w') as f:
-        json.dump({"session_id": os.path.basename(found_session), "messages": all_messages}, f, indent=2)
-        
-    print(f"✅ Session {os.path.basename(found_session)} copied to {session_file}")
+        yield key, message
+
+
+def sync_session(session_dir: str, log_path: Path = SESSION_LOG,
+                 cursor_path: Path = SESSION_CURSOR, full: bool = False,
+                 limit: Optional[int] = None) -> int:
+    """
+    Append the session's new messages to the JSONL log.
+
+    Starts a fresh log when the session changed or `full` is set. With
+    `limit`, only the oldest `limit` new messages are written; call again
+    until it returns less than `limit`.
+
+    Returns:
+        Number of messages written.
+    """
+    session_id = os.path.basename(session_dir)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with file_lock(log_path):
+        cursor = read_json(cursor_path, {})
+        fresh = full or cursor.get("session_id") != session_id or not log_path.exists()
+        after = None if fresh else cursor.get("last")
+
+        written = 0
+        last = after
+        with open(log_path, "w" if fresh else "a") as out:
+            for key, message in iter_new_messages(session_dir, after, limit):
+                out.write(json.dumps(message, separators=(",", ":")) + "\n")
+                last = key
+                written += 1
+
+        if fresh or written:
+            atomic_write_json(cursor_path, {"session_id": session_id, "last": last})
+    return written
+
+
+def copy_session(storage: Optional[str] = None, full: bool = False) -> Optional[Path]:
+    workspace_root = str(Path.cwd())
+    found_session = find_session(workspace_root, storage)
+
+    if not found_session:
+        print("⚠️ No active session found for this project.")
+        return None
+
+    written = sync_session(found_session, full=full)
+    print(f"✅ Session {os.path.basename(found_session)}: {written} new messages -> {SESSION_LOG}")
+    return SESSION_LOG
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def watch(storage: Optional[str] = None, interval: float = WATCH_INTERVAL,
+          stop: Optional[threading.Event] = None, batch: int = WATCH_BATCH) -> None:
+    """
+    Mirror new session messages into the JSONL log until `stop` is set.
+
+    Each poll is two stat() calls while nothing changes: the session is
+    looked up again only when the storage directory changes (a session was
+    added), and the session directory is listed only when its mtime moves
+    (a message was added).
+    """
+    storage = storage or storage_path()
+    workspace_root = str(Path.cwd())
+    stop = stop or threading.Event()
+
+    storage_seen = session_seen = None
+    session = None
+    while not stop.is_set():
+        storage_mtime = _mtime_ns(storage)
+        if storage_mtime != storage_seen:
+            storage_seen = storage_mtime
+            found = find_session(workspace_root, storage)
+            if found != session:
+                session, session_seen = found, None
+                if session:
+                    print(f"👀 Watching session {os.path.basename(session)}")
+
+        session_mtime = _mtime_ns(session) if session else None
+        if session and session_mtime != session_seen:
+            session_seen = session_mtime
+            written = sync_session(session, limit=batch)
+            while not stop.is_set() and written == batch:
+                written = sync_session(session, limit=batch)
+            # session_mtime is None if the session vanished since find_session()
+            if written or session_mtime is None or time.time_ns() - session_mtime < SETTLE_SECONDS * 1e9:
+                session_seen = None  # list again next poll: a message may still be being written
+
+        stop.wait(interval)
+
 
 if __name__ == "__main__":
-    copy_session()
+    parser = argparse.ArgumentParser(description="Copy this project's OpenCode session into .opencode/logs")
+    parser.add_argument("--storage", help=f"Message storage (default: $OPENCODE_STORAGE_PATH or {DEFAULT_STORAGE_PATH})")
+    parser.add_argument("--full", action="store_true", help="Re-import the whole session")
+    parser.add_argument("--watch", action="store_true", help="Keep mirroring new messages as they appear")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="Seconds between polls in --watch mode")
+    args = parser.parse_args()
+
+    if args.watch:
+        if args.full:
+            copy_session(args.storage, full=True)
+        try:
+            watch(args.storage, args.interval)
+        except KeyboardInterrupt:
+            pass
+    else:
+        copy_session(args.storage, args.full)
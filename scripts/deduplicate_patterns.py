@@ -3,10 +3,22 @@
 Deduplicate patterns - Group identical patterns and show counts.
 
 This script:
-1. Loads pattern_candidates.json
-2. Groups patterns by type + description
+1. Streams pattern records from pattern_candidates.jsonl (one pattern
+   per line) or pattern_candidates.json ({"patterns": [...]})
+2. Groups patterns by type + severity + description key
 3. Outputs deduplicated report
 
+Records are read one at a time, and each group keeps its count and at
+most MAX_EXAMPLES evidence items, so memory grows with the number of
+distinct patterns, not with the number of records. The .json input is
+parsed incrementally too, but JSONL is the preferred format.
+
+Grouping keys (--key):
+- normalized (default): hash of the description with case, numbers,
+  quoted values, paths and bare file names masked ("File a.ts modified
+  7 times" == "File b.ts modified 9 times")
+- exact: the full description
+
 PATTERN GROUPS:
 - bypass: Consecutive build agent calls
 - repeated_failure: File modified N times
@@ -15,81 +27,202 @@ PATTERN GROUPS:
 - missing_approval: Phases without user input
 
 USAGE:
-    python3 .opencode/scripts/deduplicate_patterns.py
+    python3 .opencode/scripts/deduplicate_patterns.py [--input FILE] [--key exact|normalized]
 """
 
+import argparse
+import hashlib
 import json
-from collections import defaultdict
+import re
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Iterator, Optional
 
 INPUT_PATH = Path(".opencode/logs/pattern_candidates.json")
+JSONL_INPUT_PATH = INPUT_PATH.with_suffix(".jsonl")
 OUTPUT_PATH = Path(".opencode/logs/pattern_deduplicated.json")
 
+MAX_EXAMPLES = 3
+READ_CHUNK = 1 << 16
+SEVERITY_WEIGHT = {"high": 3, "medium": 2}
 
-def deduplicate_patterns():
-    """Group patterns by type and description."""
-    print("📊 Pattern Deduplication")
-    print("=" * 50)
+# Bare file names ("a.ts") are masked like paths when they end in one of these
+FILE_EXTENSIONS = (
+    "c", "cfg", "cjs", "cpp", "cs", "css", "csv", "env", "go", "h", "hpp", "html", "ini",
+    "java", "js", "json", "jsx", "kt", "lock", "md", "mjs", "php", "py", "pyi", "rb", "rs",
+    "scss", "sh", "sql", "svelte", "swift", "toml", "ts", "tsx", "txt", "vue", "xml", "yaml", "yml",
+)
+
+_NORMALIZERS = [
+    (re.compile(r"'[^']*'|\"[^\"]*\"|`[^`]*`"), "<str>"),
+    (re.compile(r"(?:[\w.-]*[\\/])+[\w.-]+"), "<path>"),
+    (re.compile(rf"(?<![\w.-])[\w.-]+\.(?:{'|'.join(FILE_EXTENSIONS)})(?![\w-]|\.\w)"), "<path>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "#"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_description(description: str) -> str:
+    """Description with case, numbers, quoted values, paths and file names masked."""
+    text = description.strip().lower()
+    for pattern, placeholder in _NORMALIZERS:
+        text = pattern.sub(placeholder, text)
+    return text
+
+
+def group_key(pattern: dict, mode: str = "normalized") -> bytes:
+    """Fixed-size grouping key for a pattern record."""
+    description = pattern.get("description", "")
+    if mode == "normalized":
+        description = normalize_description(description)
+    raw = "\0".join((pattern.get("type", ""), pattern.get("severity", ""), description))
+    return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+
+# ─── Input ──────────────────────────────────────────────────────────
+
+class _Reader:
+    """Incremental JSON value reader over a text stream."""
     
-    if not INPUT_PATH.exists():
-        print(f"⚠️  No patterns file found: {INPUT_PATH}")
-        print("   Run: python3 .opencode/skills/pattern-detector/analyze.py first")
-        return
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
     
-    with open(INPUT_PATH) as f:
-        data = json.load(f)
+    def _fill(self) -> bool:
+        chunk = self.f.read(READ_CHUNK)
+        if not chunk:
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
     
-    patterns = data.get("patterns", [])
-    summary = data.get("summary", {})
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of input)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
     
-    print(f"\n📦 Original: {len(patterns)} patterns")
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in pattern file")
+        self.pos += 1
     
-    # Group by type + key characteristics
-    grouped = defaultdict(lambda: {
-        "type": "",
-        "severity": "",
-        "description": "",
-        "suggestion": "",
-        "count": 0,
-        "examples": []
-    })
+    def value(self):
+        """Decode the next JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_json_patterns(f) -> Iterator[dict]:
+    """Stream the elements of the top-level "patterns" array of a JSON object."""
+    reader = _Reader(f)
+    reader.expect("{")
+    while reader.peek() not in ("}", ""):
+        key = reader.value()
+        reader.expect(":")
+        if key == "patterns":
+            reader.expect("[")
+            while reader.peek() not in ("]", ""):
+                yield reader.value()
+                if reader.peek() == ",":
+                    reader.pos += 1
+            reader.expect("]")
+        else:
+            reader.value()  # other members (summary) are skipped
+        if reader.peek() == ",":
+            reader.pos += 1
+
+
+def iter_patterns(path: Path) -> Iterator[dict]:
+    """Yield pattern records one at a time from a .jsonl or .json file."""
+    with open(path) as f:
+        if path.suffix == ".jsonl":
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_patterns(f)
+
+
+def default_input() -> Path:
+    return JSONL_INPUT_PATH if JSONL_INPUT_PATH.exists() else INPUT_PATH
+
+
+# ─── Deduplication ──────────────────────────────────────────────────
+
+def group_patterns(patterns, key_mode: str = "normalized", max_examples: int = MAX_EXAMPLES):
+    """
+    Fold pattern records into groups in one pass.
+    
+    Returns:
+        Tuple of (groups in first-seen order, number of records read)
+    """
+    groups: Dict[bytes, dict] = {}
+    total = 0
     
     for p in patterns:
-        # Create unique key for grouping
-        key = f"{p['type']}_{p['severity']}_{p['description'][:50]}"
-        
-        if not grouped[key]["type"]:
-            grouped[key] = {
-                "type": p["type"],
-                "severity": p["severity"],
-                "description": p["description"],
-                "suggestion": p["suggestion"],
+        total += 1
+        key = group_key(p, key_mode)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                "type": p.get("type", ""),
+                "severity": p.get("severity", ""),
+                "description": p.get("description", ""),
+                "suggestion": p.get("suggestion", ""),
                 "count": 0,
                 "examples": []
             }
+        group["count"] += 1
         
-        grouped[key]["count"] += 1
-        
-        # Keep first 3 examples
-        if len(grouped[key]["examples"]) < 3:
-            grouped[key]["examples"].extend(p.get("evidence", []))
+        # Keep at most max_examples evidence items
+        room = max_examples - len(group["examples"])
+        if room > 0:
+            group["examples"].extend(p.get("evidence", [])[:room])
+    
+    return list(groups.values()), total
+
+
+def deduplicate_patterns(input_path: Optional[Path] = None, output_path: Path = OUTPUT_PATH,
+                         key_mode: str = "normalized"):
+    """Group patterns by type, severity and description."""
+    print("📊 Pattern Deduplication")
+    print("=" * 50)
     
-    # Create deduplicated output
+    input_path = input_path or default_input()
+    if not input_path.exists():
+        print(f"⚠️  No patterns file found: {input_path}")
+        print("   Run: python3 .opencode/skills/pattern-detector/analyze.py first")
+        return
+    
+    groups, original_count = group_patterns(iter_patterns(input_path), key_mode)
+    
+    print(f"\n📦 Original: {original_count} patterns")
+    
+    # Create deduplicated output: one sort, by severity weight, then count
     deduplicated = []
-    for key, group in sorted(grouped.items(), key=lambda x: (-x[1]["count"], -len(x[1]["type"]))):
-        deduplicated.append({
-            "type": group["type"],
-            "severity": group["severity"],
-            "description": group["description"],
-            "suggestion": group["suggestion"],
-            "count": group["count"],
-            "examples": group["examples"],
-            "severity_weight": 3 if group["severity"] == "high" else 2 if group["severity"] == "medium" else 1
-        })
-    
-    # Sort by severity weight, then count
-    deduplicated.sort(key=lambda x: (-x["severity_weight"], -x["count"]))
+    for group in groups:
+        group["severity_weight"] = SEVERITY_WEIGHT.get(group["severity"], 1)
+        deduplicated.append(group)
+    deduplicated.sort(key=lambda x: (-x["severity_weight"], -x["count"], x["type"]))
     
     # Output summary
     print(f"📋 Deduplicated: {len(deduplicated)} unique pattern types")
@@ -98,7 +231,7 @@ def deduplicate_patterns():
     
     by_severity = {"high": [], "medium": [], "low": []}
     for p in deduplicated:
-        by_severity[p["severity"]].append(p)
+        by_severity.get(p["severity"], by_severity["low"]).append(p)
     
     print(f"\n🔴 HIGH SEVERITY ({len(by_severity['high'])} unique types, {sum(p['count'] for p in by_severity['high'])} total):")
     for p in by_severity["high"][:10]:
@@ -118,12 +251,13 @@ def deduplicate_patterns():
     # Key insight
     total_occurrences = sum(p["count"] for p in deduplicated)
     unique_types = len(deduplicated)
+    compression = original_count / unique_types if unique_types else 0.0
     
     print(f"\n{'='*70}")
     print(f"📊 SUMMARY:")
-    print(f"   Original patterns: {len(patterns)}")
+    print(f"   Original patterns: {original_count}")
     print(f"   Unique pattern types: {unique_types}")
-    print(f"   Compression ratio: {len(patterns) / unique_types:.1f}x fewer items")
+    print(f"   Compression ratio: {compression:.1f}x fewer items")
     print(f"   Total occurrences: {total_occurrences}")
     print(f"{'='*70}")
     
@@ -131,10 +265,11 @@ def deduplicate_patterns():
     result = {
         "deduplicated_patterns": deduplicated,
         "summary": {
-            "original_count": len(patterns),
+            "original_count": original_count,
             "deduplicated_count": unique_types,
-            "compression_ratio": round(len(patterns) / unique_types, 1),
+            "compression_ratio": round(compression, 1),
             "total_occurrences": total_occurrences,
+            "key_mode": key_mode,
             "by_severity": {
                 "high": len(by_severity["high"]),
                 "medium": len(by_severity["medium"]),
@@ -144,18 +279,25 @@ def deduplicate_patterns():
         }
     }
     
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_PATH, "w") as f:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
         json.dump(result, f, indent=2)
     
-    print(f"\n✅ Deduplicated report saved to: {OUTPUT_PATH}")
+    print(f"\n✅ Deduplicated report saved to: {output_path}")
     
     return result
 
 
 def main():
     """Entry point."""
-    result = deduplicate_patterns()
+    parser = argparse.ArgumentParser(description="Group identical patterns and show counts")
+    parser.add_argument("--input", type=Path, help=f"Pattern file (default: {JSONL_INPUT_PATH} if present, else {INPUT_PATH})")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH, help="Report file")
+    parser.add_argument("--key", choices=("normalized", "exact"), default="normalized",
+                        help="Group by normalized description hash (default) or exact description")
+    args = parser.parse_args()
+    
+    result = deduplicate_patterns(args.input, args.output, args.key)
     print("\n" + "=" * 50)
     return result
 
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+NSO File Locking — Advisory Locks and Atomic Writes for .opencode State
+
+Parallel agents run NSO scripts concurrently, and every state writer is a
+read-modify-write of a small JSON/markdown file. Without coordination two
+writers read the same old content and the second write silently drops the
+first update. This module provides the two primitives every state writer
+uses:
+
+- file_lock(path): exclusive advisory lock (fcntl.flock) on a sidecar
+  `.<name>.lock` file, with retry/backoff and a timeout. Re-entrant within
+  a thread, so helpers may lock a file their caller already holds.
+- atomic_write_text/atomic_write_json: write to a temp file in the same
+  directory and os.replace() it over the target, so readers never see a
+  half-written file.
+
+On platforms without fcntl (Windows) locks degrade to no-ops; writes
+stay atomic.
+
+Usage:
+    from file_lock import file_lock, atomic_write_json, read_json
+
+    with file_lock(path):
+        data = read_json(path, {})
+        data["count"] = data.get("count", 0) + 1
+        atomic_write_json(path, data)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+DEFAULT_TIMEOUT = 30.0
+
+# Per-thread lock depth, keyed by absolute lock path (makes file_lock re-entrant)
+_held = threading.local()
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a lock could not be acquired within the timeout."""
+
+
+def _lock_path(path: Path | str) -> Path:
+    path = Path(path)
+    return path.with_name(f".{path.name}.lock")
+
+
+@contextmanager
+def file_lock(
+    path: Path | str,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    retry_interval: float = 0.005,
+    max_interval: float = 0.25,
+) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock for `path` for the duration of the block.
+
+    Args:
+        path: The state file being protected (the lock lives next to it).
+        timeout: Seconds to keep retrying before raising LockTimeout;
+            None blocks until the lock is free.
+        retry_interval: Initial sleep between attempts (doubles, with jitter).
+        max_interval: Upper bound for the sleep between attempts.
+    """
+    lock_path = _lock_path(path)
+    key = os.path.abspath(lock_path)
+    depth: dict[str, int] = getattr(_held, "depth", None) or {}
+    _held.depth = depth
+
+    if depth.get(key):
+        depth[key] += 1
+        try:
+            yield
+        finally:
+            depth[key] -= 1
+        return
+
+    if fcntl is None:
+        depth[key] = 1
+        try:
+            yield
+        finally:
+            depth.pop(key, None)
+        return
+
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if timeout is None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            deadline = time.monotonic() + timeout
+            interval = retry_interval
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise LockTimeout(f"Timed out after {timeout}s waiting for lock on {path}")
+                    time.sleep(interval * (0.5 + random.random()))
+                    interval = min(interval * 2, max_interval)
+
+        depth[key] = 1
+        try:
+            yield
+        finally:
+            depth.pop(key, None)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path: Path | str, text: str, fsync: bool = False) -> None:
+    """Replace `path` with `text` so readers see either the old or the new content."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write_json(path: Path | str, data: Any, indent: Optional[int] = 2, **kwargs: Any) -> None:
+    """json.dumps `data` and write it atomically."""
+    atomic_write_text(path, json.dumps(data, indent=indent, **kwargs))
+
+
+def read_json(path: Path | str, default: Any = None) -> Any:
+    """Load JSON from `path`, returning `default` if it is missing or corrupt."""
+    try:
+        return json.loads(Path(path).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def update_json(
+    path: Path | str,
+    update: Callable[[Any], Any],
+    default: Callable[[], Any] = dict,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+) -> Any:
+    """
+    Locked read-modify-write of a JSON file.
+
+    `update` receives the current content (or default()) and returns the
+    new content, which is written atomically and returned.
+    """
+    with file_lock(path, timeout=timeout):
+        current = read_json(path, None)
+        new = update(default() if current is None else current)
+        atomic_write_json(path, new)
+        return new
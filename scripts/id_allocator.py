@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+NSO ID Allocator — Cross-Process Counter for Task IDs
+
+Task IDs carry a counter that must never repeat across the coordinators
+and agents running in parallel. The allocator keeps the high-water mark
+in one counter file (.opencode/.task_counter, a plain integer) and hands
+out numbers in leased blocks:
+
+- Leasing a block is a locked read-increment-write of the counter file
+  (see file_lock.py), so two processes can never lease overlapping ranges.
+- Numbers inside a leased block are handed out in-process without
+  touching the file, so the hot path is one thread-lock acquisition.
+- The block size adapts: a block used up within LEASE_WINDOW seconds
+  doubles the next lease (up to MAX_BLOCK), otherwise it resets to 1.
+  Occasional callers get dense counters; hot loops reach millions of IDs
+  per second. Numbers left in a block when a process exits are skipped.
+
+With NSO_STATE_BACKEND=sqlite the high-water mark is a counter in the
+state store instead (named after the counter file, e.g. "task_counter"),
+leased with one atomic increment per block.
+
+Counters are unique across processes but only increasing within one
+process; ordering between processes is not guaranteed.
+
+Usage:
+    from id_allocator import get_allocator
+
+    counter = get_allocator().next()
+
+    python3 id_allocator.py --bench --count 1000000 --processes 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from file_lock import atomic_write_text, file_lock
+from state_store import StateStore, open_state_store
+
+
+DEFAULT_COUNTER_PATH = Path(".opencode/.task_counter")
+MAX_BLOCK = 4096
+LEASE_WINDOW = 0.1  # seconds
+
+
+class CounterAllocator:
+    """Unique integers from a shared counter file, leased in adaptive blocks."""
+
+    def __init__(self, path: Path | str = DEFAULT_COUNTER_PATH, start: int = 1, max_block: int = MAX_BLOCK,
+                 store: Optional[StateStore] = None):
+        """
+        Args:
+            path: Counter file holding the last leased number.
+            start: First number handed out when the counter does not exist.
+            max_block: Largest block leased at once.
+            store: Keep the counter in this state store instead of the file.
+        """
+        self.path = Path(path)
+        self.start = start
+        self.max_block = max_block
+        self.store = store
+        self.counter = self.path.name.lstrip(".")
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._next = 1
+        self._limit = 0  # empty block: the first next() leases
+        self._block = 1
+        self._leased_at = 0.0
+
+    def _lease(self, minimum: int = 1) -> None:
+        """Reserve the next block of numbers in the counter file."""
+        now = time.monotonic()
+        if now - self._leased_at < LEASE_WINDOW:
+            self._block = min(self._block * 2, self.max_block)
+        else:
+            self._block = 1
+        size = max(self._block, minimum)
+
+        if self.store is not None:
+            last = self.store.increment(self.counter, size, start=self.start - 1) - size
+        else:
+            with file_lock(self.path):
+                try:
+                    last = int(self.path.read_text().strip() or 0)
+                except FileNotFoundError:
+                    last = self.start - 1
+                atomic_write_text(self.path, str(last + size))
+
+        self._next, self._limit = last + 1, last + size
+        self._leased_at = now
+
+    def next(self) -> int:
+        """Return a number no other caller (in any process) has received."""
+        with self._lock:
+            if self._next > self._limit:
+                self._lease()
+            value = self._next
+            self._next += 1
+            return value
+
+    def allocate(self, count: int) -> range:
+        """Return `count` consecutive unique numbers."""
+        with self._lock:
+            if self._limit - self._next + 1 < count:
+                self._lease(minimum=count)
+            block = range(self._next, self._next + count)
+            self._next += count
+            return block
+
+
+_allocators: dict[str, CounterAllocator] = {}
+_allocators_lock = threading.Lock()
+
+
+def get_allocator(path: Path | str = DEFAULT_COUNTER_PATH, start: int = 1) -> CounterAllocator:
+    """Return the process-wide allocator for a counter file (or its state store counter)."""
+    path = os.path.abspath(path)
+    store = open_state_store()
+    key = f"{path}|{getattr(store, 'path', '')}"
+    with _allocators_lock:
+        allocator = _allocators.get(key)
+        if allocator is None:
+            allocator = _allocators[key] = CounterAllocator(path, start=start, store=store)
+        return allocator
+
+
+def _after_fork() -> None:
+    # A forked child must not reuse the numbers left in its parent's block
+    global _allocators_lock
+    _allocators_lock = threading.Lock()
+    for allocator in _allocators.values():
+        allocator._lock = threading.Lock()
+        allocator._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+# ─── Benchmark ──────────────────────────────────────────────────────
+
+def _bench_worker(path: str, count: int, results) -> None:
+    allocator = CounterAllocator(path)
+    started = time.perf_counter()
+    for _ in range(count):
+        allocator.next()
+    results.put(time.perf_counter() - started)
+
+
+def benchmark(count: int, processes: int, path: Optional[Path] = None) -> dict:
+    """Allocate `count` numbers in each of `processes` processes and report throughput."""
+    import multiprocessing
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        counter_path = str(path or Path(tmp) / "counter")
+        results: multiprocessing.Queue = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_bench_worker, args=(counter_path, count, results))
+            for _ in range(processes)
+        ]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        runs = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+    total = count * processes
+    return {
+        "processes": processes,
+        "ids": total,
+        "elapsed_s": round(elapsed, 3),
+        "ids_per_second": int(total / elapsed),
+        "per_process_ids_per_second": [int(count / run) for run in runs],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NSO cross-process ID allocator")
+    parser.add_argument("--path", default=str(DEFAULT_COUNTER_PATH), help="Counter file")
+    parser.add_argument("--bench", action="store_true", help="Run the throughput benchmark")
+    parser.add_argument("--count", type=int, default=1_000_000, help="IDs per process (benchmark)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Processes (benchmark)")
+    args = parser.parse_args()
+
+    if args.bench:
+        import json
+        print(json.dumps(benchmark(args.count, args.processes), indent=2))
+    else:
+        print(get_allocator(args.path).next())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+NSO Test Impact — Run Only the Tests a Diff Can Affect
+
+Maps source files to the test files that exercise them, and selects the
+tests affected by the current git diff (staged, unstaged and untracked
+changes against HEAD).
+
+The map has two sources, merged:
+
+- The import graph (import_graph.py): a test depends on every project
+  file it imports, directly or transitively. It is rebuilt from its own
+  mtime cache on every selection, so it is never stale.
+- Coverage data, when `coverage` is installed: `--build-coverage` runs the
+  tests once under coverage, with one coverage context per test file, and
+  records every file each test file executed. This adds what static
+  analysis cannot see (modules loaded by path, plugins, fixtures in other
+  packages). It is as current as the last coverage run.
+
+The merged map is kept compactly in .opencode/cache/test_impact.json
+(test files listed once, sources point at their indices).
+
+A change to pytest configuration, a conftest.py or a dependency list can
+affect any test, so it selects everything. So does any change the map
+cannot account for: a non-Python file (fixtures, settings, SQL,
+templates), a deleted or renamed file, or a failed git call. A clean tree
+(a CI checkout, or work already committed) has no diff to go by and also
+selects everything.
+
+Selecting is read-only; only `--build-coverage` writes the map.
+
+Usage:
+    from impact_map import select_tests
+
+    select_tests(["tests/integration"])   # None = run everything
+
+    python3 impact_map.py tests/integration           # show the selection
+    python3 impact_map.py --build-coverage tests/integration
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).parent))
+from file_lock import atomic_write_json, read_json
+from import_graph import ImportGraph
+from pytest_shard import discover_test_files, pytest_command
+
+
+IMPACT_PATH = Path(".opencode/cache/test_impact.json")
+IMPACT_VERSION = 1
+COVERAGE_ENV = "NSO_IMPACT_COVERAGE"
+# Changes to these can affect any test
+RUN_ALL_NAMES = {
+    "conftest.py", "pytest.ini", "tox.ini", "setup.cfg", "pyproject.toml",
+    "requirements.txt", "requirements-dev.txt", "setup.py",
+}
+
+
+# ─── Git ────────────────────────────────────────────────────────────
+
+def changed_files(root: str | Path = ".") -> Optional[list[str]]:
+    """Files changed against HEAD, including untracked ones (None outside git)."""
+    names: set[str] = set()
+    for args in (["diff", "HEAD", "--name-only", "--no-renames", "-z"],
+                 ["ls-files", "--others", "--exclude-standard", "-z"]):
+        try:
+            result = subprocess.run(["git", *args, "--", "."], cwd=root, capture_output=True)
+        except FileNotFoundError:
+            return None
+        if result.returncode != 0:
+            return None
+        names.update(os.fsdecode(n) for n in result.stdout.split(b"\0") if n)
+
+    # git prints paths relative to the top level; make them relative to root
+    top = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=root,
+                         capture_output=True, text=True).stdout.strip()
+    prefix = os.path.relpath(Path(root).resolve(), Path(top).resolve()) if top else "."
+    if prefix == ".":
+        return sorted(names)
+    prefix = prefix.replace(os.sep, "/") + "/"
+    return sorted(name[len(prefix):] for name in names if name.startswith(prefix))
+
+
+# ─── Map ────────────────────────────────────────────────────────────
+
+def _encode(edges: dict[str, set[str]]) -> dict:
+    tests = sorted({t for targets in edges.values() for t in targets})
+    index = {test: i for i, test in enumerate(tests)}
+    return {"tests": tests,
+            "files": {src: sorted(index[t] for t in targets) for src, targets in sorted(edges.items())}}
+
+
+def _decode(data: dict) -> dict[str, set[str]]:
+    tests = data.get("tests", [])
+    return {src: {tests[i] for i in indices} for src, indices in data.get("files", {}).items()}
+
+
+def import_edges(root: Path, test_files: Iterable[str],
+                 graph: Optional[ImportGraph] = None) -> dict[str, set[str]]:
+    """source -> tests from the import graph (a test file maps to itself)."""
+    graph = graph or ImportGraph(root).build()
+    wanted = set(test_files)
+    edges: dict[str, set[str]] = {}
+    for path in graph.imports:
+        tests = wanted.intersection(graph.dependents(path))
+        if path in wanted:
+            tests.add(path)
+        if tests:
+            edges[path] = tests
+    return edges
+
+
+def coverage_edges(root: Path, test_files: Sequence[str],
+                   pytest_cmd: Optional[Sequence[str]] = None) -> dict[str, set[str]]:
+    """
+    source -> tests from one pytest run under coverage.
+
+    Each test file is its own coverage context (both while it is
+    collected and while its tests run), so module-level code imported by a
+    test counts for it too. Requires the `coverage` package.
+    """
+    import coverage  # noqa: F401 - fail early with ImportError
+
+    with tempfile.TemporaryDirectory(prefix="nso-impact-") as tmp:
+        data_file = os.path.join(tmp, "coverage.db")
+        env = dict(os.environ)
+        here = str(Path(__file__).resolve().parent)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [here, env.get("PYTHONPATH")]))
+        env[COVERAGE_ENV] = data_file
+        subprocess.run([*(pytest_cmd or pytest_command()), "-q", "-p", "impact_map", *test_files],
+                       cwd=root, env=env, capture_output=True)
+
+        from coverage import CoverageData
+        data = CoverageData(basename=data_file)
+        data.read()
+        edges: dict[str, set[str]] = {}
+        root = root.resolve()
+        for measured in data.measured_files():
+            try:
+                rel = Path(measured).resolve().relative_to(root).as_posix()
+            except ValueError:
+                continue  # outside the project
+            contexts = set()
+            for names in data.contexts_by_lineno(measured).values():
+                contexts.update(names)
+            tests = {c for c in contexts if c in test_files}
+            if tests:
+                edges[rel] = tests
+        return edges
+
+
+def _test_files(root: Path, test_paths: Sequence[str]) -> list[str]:
+    return [os.path.relpath(f, root).replace(os.sep, "/")
+            for f in discover_test_files((root / p for p in test_paths), root)]
+
+
+def _stored_coverage(root: Path, path: Path) -> dict:
+    stored = read_json(root / path, {})
+    return stored if stored.get("version") == IMPACT_VERSION else {}
+
+
+def _merge(import_map: dict[str, set[str]], covered: dict[str, set[str]],
+           test_files: Sequence[str]) -> dict[str, set[str]]:
+    wanted = set(test_files)
+    edges = {src: set(tests) for src, tests in import_map.items()}
+    for src, tests in covered.items():
+        edges.setdefault(src, set()).update(wanted.intersection(tests))
+    return edges
+
+
+def build_map(root: str | Path = ".", test_paths: Sequence[str] = ("tests",),
+              with_coverage: bool = False, path: Path = IMPACT_PATH,
+              graph: Optional[ImportGraph] = None) -> dict[str, set[str]]:
+    """
+    Build the impact map: a fresh import graph merged with coverage edges.
+
+    With `with_coverage`, the tests are run under coverage and the new
+    coverage edges are stored; otherwise the edges from the last coverage
+    run are read and nothing is written.
+    """
+    root = Path(root)
+    test_files = _test_files(root, test_paths)
+
+    if with_coverage:
+        covered = coverage_edges(root, test_files)
+        atomic_write_json(root / path, {
+            "version": IMPACT_VERSION,
+            "coverage_at": int(time.time()),
+            "coverage": _encode(covered),
+        }, indent=None)
+    else:
+        covered = _decode(_stored_coverage(root, path).get("coverage", {}))
+
+    return _merge(import_edges(root, test_files, graph), covered, test_files)
+
+
+def select_tests(test_paths: Sequence[str] = ("tests",), root: str | Path = ".",
+                 changed: Optional[Iterable[str]] = None) -> Optional[list[str]]:
+    """
+    Test files under `test_paths` affected by the changes. Read-only.
+
+    Args:
+        changed: Changed files relative to root (default: the git diff).
+
+    Returns:
+        Sorted test files (possibly empty), or None when everything must
+        run: no changes at all (a clean checkout, as in CI), a change to
+        shared test configuration, or a changed file that is not a Python
+        source present in the import graph (data files, deleted or renamed
+        modules).
+    """
+    root = Path(root)
+    changed = changed_files(root) if changed is None else list(changed)
+    if not changed:
+        return None
+    if any(os.path.basename(name) in RUN_ALL_NAMES for name in changed):
+        return None
+
+    graph = ImportGraph(root).build()
+    if any(name not in graph.imports or not (root / name).is_file() for name in changed):
+        return None
+
+    edges = build_map(root, test_paths, graph=graph)
+    test_files = set(_test_files(root, test_paths))
+    selected: set[str] = set()
+    for name in changed:
+        if name in test_files:
+            selected.add(name)
+        selected.update(edges.get(name, ()))
+    return sorted(selected)
+
+
+# ─── Coverage Plugin ────────────────────────────────────────────────
+# Loaded into the pytest run by coverage_edges() with -p impact_map.
+
+class _CoverageContexts:
+    def __init__(self, data_file: str, root: Path):
+        import coverage
+
+        self.root = root
+        self.cov = coverage.Coverage(data_file=data_file, source=[str(root)])
+        self.cov.start()
+
+    def _switch(self, path) -> None:
+        try:
+            self.cov.switch_context(Path(str(path)).resolve().relative_to(self.root).as_posix())
+        except ValueError:
+            pass
+
+    def pytest_collectstart(self, collector) -> None:
+        import pytest
+
+        if isinstance(collector, pytest.Module):  # a test file, whatever python_files says
+            self._switch(collector.path)
+
+    def pytest_runtest_setup(self, item) -> None:
+        self._switch(item.path)
+
+    def pytest_unconfigure(self, config) -> None:
+        self.cov.stop()
+        self.cov.save()
+
+
+def pytest_configure(config) -> None:
+    data_file = os.environ.get(COVERAGE_ENV)
+    if data_file:
+        root = Path(str(config.invocation_params.dir)).resolve()
+        config.pluginmanager.register(_CoverageContexts(data_file, root), "nso-impact-coverage")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Select the tests affected by the current git diff")
+    parser.add_argument("paths", nargs="*", default=["tests"], help="Test directories")
+    parser.add_argument("--build-coverage", action="store_true",
+                        help="Run the tests once under coverage to refresh the map (needs `coverage`)")
+    args = parser.parse_args()
+
+    if args.build_coverage:
+        edges = build_map(".", args.paths, with_coverage=True)
+        print(f"Mapped {len(edges)} source files to tests -> {IMPACT_PATH}")
+        return
+
+    selected = select_tests(args.paths)
+    if selected is None:
+        print("All tests (no changes, configuration or non-Python files changed, or no git diff available)")
+    else:
+        print(f"{len(selected)} affected test file(s)")
+        for path in selected:
+            print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
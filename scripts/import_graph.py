@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+NSO Import Graph — Which Files (and Tests) Depend on a Python File
+
+A lightweight, cached import graph of a project: every .py file is
+parsed once with ast for its import statements, and the result is kept in
+.opencode/cache/import_graph.json keyed by (mtime_ns, size). Later runs
+re-parse only files that changed, so building the graph is one directory
+walk plus a handful of parses.
+
+Module names are matched loosely: scripts/validate.py answers to both
+'scripts.validate' and 'validate', because NSO scripts import their
+siblings after putting their own directory on sys.path. A loose match can
+only add dependents, never drop one.
+
+Usage:
+    from import_graph import ImportGraph
+
+    graph = ImportGraph(".").build()
+    graph.tests_for("scripts/task_gc.py")   # ['tests/test_task_gc.py', ...]
+
+    python3 import_graph.py scripts/task_gc.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import os
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from file_lock import atomic_write_json, read_json
+
+
+CACHE_PATH = Path(".opencode/cache/import_graph.json")
+CACHE_VERSION = 1
+SKIP_DIRS = {
+    ".git", ".opencode", ".venv", "venv", "node_modules", "__pycache__",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", "_ARCHIVE_LEGACY",
+}
+
+
+def is_test_file(path: str) -> bool:
+    """pytest's default test file patterns."""
+    name = os.path.basename(path)
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def module_names(rel_path: str) -> set[str]:
+    """
+    Names a project file can be imported as: its dotted path from the
+    project root and every suffix of it ('scripts.validate', 'validate').
+    """
+    parts = Path(rel_path).with_suffix("").parts
+    if parts and parts[-1] == "__init__":
+        parts = parts[:-1]
+    return {".".join(parts[i:]) for i in range(len(parts))}
+
+
+def parse_imports(source: str, rel_path: str) -> list[str]:
+    """Modules imported by a file (absolute names; relative imports resolved)."""
+    try:
+        tree = ast.parse(source, filename=rel_path)
+    except (SyntaxError, ValueError):
+        return []
+
+    package = list(Path(rel_path).parent.parts)
+    imported: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package[:len(package) - node.level + 1] if node.level > 1 else package
+                prefix = ".".join(base + ([node.module] if node.module else []))
+            else:
+                prefix = node.module or ""
+            if prefix:
+                imported.add(prefix)
+            # 'from pkg import mod' may import a submodule
+            imported.update(f"{prefix}.{alias.name}" if prefix else alias.name
+                            for alias in node.names if alias.name != "*")
+        elif (isinstance(node, ast.Call) and node.args
+              and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str)
+              and getattr(node.func, "attr", getattr(node.func, "id", None)) == "import_module"):
+            # importlib.import_module("name") and helpers of the same name
+            imported.add(node.args[0].value)
+    return sorted(imported)
+
+
+class ImportGraph:
+    """Import relations between the Python files of one project."""
+
+    def __init__(self, root: Path | str = ".", cache_path: Optional[Path | str] = CACHE_PATH):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.imports: dict[str, list[str]] = {}
+        self._by_name: dict[str, set[str]] = {}
+        self._reverse: Optional[dict[str, set[str]]] = None
+
+    def _walk(self) -> Iterable[tuple[str, os.stat_result]]:
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.endswith(".egg-info"))
+            for name in sorted(filenames):
+                if name.endswith(".py"):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        yield os.path.relpath(path, self.root).replace(os.sep, "/"), os.stat(path)
+                    except FileNotFoundError:
+                        continue
+
+    def build(self) -> "ImportGraph":
+        """Scan the project, re-parsing only files changed since the cached run."""
+        cache = read_json(self.root / self.cache_path, {}) if self.cache_path else {}
+        cached = cache.get("files", {}) if cache.get("version") == CACHE_VERSION else {}
+
+        files: dict[str, dict] = {}
+        changed = False
+        for rel_path, st in self._walk():
+            stamp = [st.st_mtime_ns, st.st_size]
+            entry = cached.get(rel_path)
+            if not entry or entry["stamp"] != stamp:
+                try:
+                    source = (self.root / rel_path).read_text(encoding="utf-8", errors="replace")
+                except OSError:
+                    continue
+                entry = {"stamp": stamp, "imports": parse_imports(source, rel_path)}
+                changed = True
+            files[rel_path] = entry
+
+        if self.cache_path and (changed or len(files) != len(cached)):
+            atomic_write_json(self.root / self.cache_path,
+                              {"version": CACHE_VERSION, "files": files}, indent=None)
+
+        self.imports = {path: entry["imports"] for path, entry in files.items()}
+        self._by_name = {}
+        for path in self.imports:
+            for name in module_names(path):
+                self._by_name.setdefault(name, set()).add(path)
+        self._reverse = None
+        return self
+
+    def resolve(self, module: str) -> set[str]:
+        """Project files an imported module name may refer to."""
+        return self._by_name.get(module, set())
+
+    def dependencies(self, rel_path: str) -> set[str]:
+        """Project files imported directly by a file."""
+        found: set[str] = set()
+        for module in self.imports.get(rel_path, []):
+            found |= self.resolve(module)
+        found.discard(rel_path)
+        return found
+
+    def closure(self, rel_paths: Iterable[str]) -> set[str]:
+        """The files plus every project file they import, directly or transitively."""
+        seen = set(rel_paths)
+        queue = deque(seen)
+        while queue:
+            for dependency in self.dependencies(queue.popleft()):
+                if dependency not in seen:
+                    seen.add(dependency)
+                    queue.append(dependency)
+        return seen
+
+    def dependents(self, rel_path: str) -> set[str]:
+        """Project files that import the file, directly or transitively."""
+        if self._reverse is None:
+            self._reverse = {}
+            for path in self.imports:
+                for dependency in self.dependencies(path):
+                    self._reverse.setdefault(dependency, set()).add(path)
+
+        seen: set[str] = set()
+        queue = deque([rel_path])
+        while queue:
+            for dependent in self._reverse.get(queue.popleft(), ()):
+                if dependent not in seen and dependent != rel_path:
+                    seen.add(dependent)
+                    queue.append(dependent)
+        return seen
+
+    def tests_for(self, rel_path: str) -> list[str]:
+        """Test files affected by a change to the file (the file itself if it is a test)."""
+        tests = {path for path in self.dependents(rel_path) if is_test_file(path)}
+        if is_test_file(rel_path):
+            tests.add(rel_path)
+        return sorted(tests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show the files and tests that depend on a Python file")
+    parser.add_argument("file", help="Python file (relative to the project root)")
+    parser.add_argument("--root", default=".", help="Project root")
+    args = parser.parse_args()
+
+    graph = ImportGraph(args.root).build()
+    rel_path = os.path.relpath(args.file, args.root).replace(os.sep, "/")
+    print("Dependents:")
+    for path in sorted(graph.dependents(rel_path)):
+        print(f"  {path}")
+    print("Tests:")
+    for path in graph.tests_for(rel_path):
+        print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
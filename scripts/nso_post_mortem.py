@@ -8,8 +8,10 @@ def run_audit():
     print("🧠 Starting NSO Post-Mortem Audit...")
     
     # 1. Locate the latest log files
-    log_pattern = os.path.expanduser("/Users/Shared/dev/dream-news/.opencode/logs/session*.json")
-    logs = sorted(glob.glob(log_pattern), key=os.path.getmtime, reverse=True)
+    # copy_session.py writes session.jsonl (one message per line); older logs are session*.json
+    log_dir = os.path.expanduser("/Users/Shared/dev/dream-news/.opencode/logs")
+    log_files = glob.glob(os.path.join(log_dir, "session*.jsonl")) + glob.glob(os.path.join(log_dir, "session*.json"))
+    logs = sorted(log_files, key=os.path.getmtime, reverse=True)
     
     if not logs:
         print("❌ No session logs found to audit.")
@@ -22,7 +24,10 @@ def run_audit():
     # For now, we identify key areas based on Janitor results in the logs
     try:
         with open(latest_log, 'r') as f:
-            data = json.load(f)
+            if latest_log.endswith('.jsonl'):
+                data = [json.loads(line) for line in f if line.strip()]
+            else:
+                data = json.load(f)
             
         # We look for "validation_result" in the tool outputs within the log
         # This allows us to extract Janitor feedback automatically
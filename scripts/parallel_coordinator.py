@@ -18,11 +18,12 @@ import threading
 import queue
 import subprocess
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Callable
 from enum import Enum
 import signal
+from concurrent.futures import ThreadPoolExecutor
 
 # Import existing components with dynamic loading to handle import errors
 import importlib.util
@@ -51,6 +52,10 @@ def import_module(module_name, class_name):
 TaskIDGeneratorClass = import_module("task_id_generator", "TaskIDGenerator")
 TaskScopedContextManagerClass = import_module("task_context_manager", "TaskScopedContextManager")
 ContextContaminationDetectorClass = import_module("context_contamination_detector", "ContextContaminationDetector")
+open_state_store = import_module("state_store", "open_state_store")
+atomic_write_json = import_module("file_lock", "atomic_write_json")
+update_json = import_module("file_lock", "update_json")
+select_candidates = import_module("task_gc", "select_candidates")
 
 # Create mock classes if imports failed
 if TaskIDGeneratorClass is None:
@@ -98,6 +103,17 @@ if ContextContaminationDetectorClass is None:
             return {'scan_timestamp': 'mock', 'total_contamination_events': 0}
     ContextContaminationDetectorClass = ContextContaminationDetector
 
+if atomic_write_json is None:
+    def atomic_write_json(path, data, indent=2):
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=indent)
+
+if update_json is None:
+    def update_json(path, update, default=dict):
+        data = update(default())
+        atomic_write_json(path, data)
+        return data
+
 
 class TaskStatus(Enum):
     """Status of a parallel task."""
@@ -138,6 +154,9 @@ class ParallelCoordinator:
         self.task_id_gen = TaskIDGeneratorClass()
         self.context_manager = TaskScopedContextManagerClass()
         self.contamination_detector = ContextContaminationDetectorClass()
+
+        # Optional SQLite state store (NSO_STATE_BACKEND=sqlite); None = files
+        self.state_store = open_state_store() if open_state_store else None
         
         # Task tracking
         self.active_tasks: Dict[str, Dict] = {}  # task_id -> task_info
@@ -148,6 +167,11 @@ class ParallelCoordinator:
         self.monitor_thread = None
         self.shutdown_flag = threading.Event()
         
+        # Background archiving of old task contexts (see _cleanup_old_tasks)
+        self._archive_executor = None
+        self._archiving = set()
+        self._archive_lock = threading.Lock()
+        
         # Statistics
         self.stats = {
             'tasks_started': 0,
@@ -313,9 +337,13 @@ class ParallelCoordinator:
         task_info['agent_instructions'] = agent_instructions
         
         # Save task configuration
-        task_config_path = Path(context_info['context_path']) / f"{task_id}_task_config.json"
-        with open(task_config_path, 'w') as f:
-            json.dump(task_info, f, indent=2)
+        if self.state_store:
+            self.state_store.put('task_config', task_id, task_info,
+                                 status=TaskStatus.PENDING.value,
+                                 created_at=task_info['created_at'])
+        else:
+            task_config_path = Path(context_info['context_path']) / f"{task_id}_task_config.json"
+            atomic_write_json(task_config_path, task_info)
         
         # Add to queue
         self.task_queue.put((priority, datetime.now().timestamp(), task_id, task_info))
@@ -423,6 +451,10 @@ class ParallelCoordinator:
         with open(instructions_file, 'w') as f:
             f.write(task_info['agent_instructions'])
         
+        # Memory files are created on first use; the agent starts from its active context
+        if hasattr(self.context_manager, 'get_memory_file'):
+            self.context_manager.get_memory_file(task_id, 'active_context')
+        
         print(f"Started task execution: {task_id}")
         return True
     
@@ -506,6 +538,7 @@ class ParallelCoordinator:
                 task_info['status'] = TaskStatus.COMPLETED
                 task_info['completed_at'] = datetime.now().isoformat()
                 task_info['completion_data'] = completion_data
+                self._record_task_status(task_id, TaskStatus.COMPLETED)
                 
                 # Move to completed tasks
                 self.completed_tasks[task_id] = task_info
@@ -548,6 +581,7 @@ class ParallelCoordinator:
             # Mark as failed
             task_info['status'] = TaskStatus.FAILED
             task_info['failed_at'] = datetime.now().isoformat()
+            self._record_task_status(task_id, TaskStatus.FAILED)
             self.stats['tasks_failed'] += 1
             
             # Check if we should fall back to sequential
@@ -564,6 +598,7 @@ class ParallelCoordinator:
             task_info['status'] = TaskStatus.CONTAMINATED
             task_info['contamination_events'] = contamination_events
             task_info['contaminated_at'] = datetime.now().isoformat()
+        self._record_task_status(task_id, TaskStatus.CONTAMINATED)
         
         self.stats['contamination_events'] += 1
         
@@ -618,6 +653,7 @@ class ParallelCoordinator:
                 # Try to gracefully complete
                 task_info['status'] = TaskStatus.FAILED
                 task_info['fallback_reason'] = reason
+                self._record_task_status(t_id, TaskStatus.FAILED)
         
         # Save fallback event
         fallback_record = {
@@ -681,39 +717,87 @@ class ParallelCoordinator:
         
         print(f"Processed results for task {task_id}")
     
+    def _record_task_status(self, task_id: str, status: TaskStatus):
+        """Record a task's status in the task index (drives cleanup)."""
+        if hasattr(self.context_manager, 'set_task_status'):
+            self.context_manager.set_task_status(task_id, status.value)
+    
     def _cleanup_old_tasks(self):
-        """Clean up old completed/failed tasks."""
+        """
+        Hand old completed/failed task contexts to the garbage collector.
+        
+        Candidates are selected from the task index; deleting a context only
+        renames it into the GC trash, so this never stalls the monitor loop.
+        With cleanup.mode 'archive', completed tasks are packed into a
+        compressed archive instead of being deleted; packing runs on a
+        background archive worker (see _archive_in_background).
+        """
         cleanup_config = self.config.get('task_isolation', {}).get('cleanup', {})
         keep_completed = cleanup_config.get('keep_completed_tasks', 7)
         keep_failed = cleanup_config.get('keep_failed_tasks', 1)
+        archive_mode = (cleanup_config.get('mode', 'delete') == 'archive'
+                        and hasattr(self.context_manager, 'archive_task_context'))
         
-        cutoff_completed = datetime.now() - timedelta(days=keep_completed)
-        cutoff_failed = datetime.now() - timedelta(days=keep_failed)
+        retention_days = {
+            TaskStatus.COMPLETED.value: keep_completed,
+            TaskStatus.FAILED.value: keep_failed,
+            TaskStatus.CONTAMINATED.value: keep_failed,
+        }
         
-        tasks_to_remove = []
+        if hasattr(self.context_manager, 'list_tasks'):
+            records = [t for t in self.context_manager.list_tasks() if not t.get('archive_path')]
+        else:
+            records = [
+                {'task_id': task_id, 'status': task_info['status'].value,
+                 'updated_at': task_info.get('completed_at')}
+                for task_id, task_info in self.completed_tasks.items()
+            ]
         
-        for task_id, task_info in self.completed_tasks.items():
-            completed_str = task_info.get('completed_at')
-            if completed_str:
-                try:
-                    completed = datetime.fromisoformat(completed_str)
-                    
-                    if task_info.get('status') == TaskStatus.COMPLETED:
-                        if completed < cutoff_completed:
-                            tasks_to_remove.append(task_id)
-                    elif task_info.get('status') in [TaskStatus.FAILED, TaskStatus.CONTAMINATED]:
-                        if completed < cutoff_failed:
-                            tasks_to_remove.append(task_id)
-                except ValueError:
-                    pass
+        tasks_to_remove = select_candidates(records, retention_days) if select_candidates else []
+        statuses = {record['task_id']: record.get('status') for record in records}
         
         # Remove old tasks
         for task_id in tasks_to_remove:
             if task_id in self.completed_tasks:
                 del self.completed_tasks[task_id]
             
-            # Clean up task directory
-            self.context_manager.delete_task_context(task_id)
+            # Archive or clean up task directory
+            if archive_mode and statuses.get(task_id) == TaskStatus.COMPLETED.value:
+                self._archive_in_background(task_id)
+            else:
+                self.context_manager.delete_task_context(task_id)
+    
+    def _archive_in_background(self, task_id: str):
+        """
+        Queue a task context for archiving on the archive worker.
+        
+        Packing reads and compresses the whole context, so it runs on one
+        background thread; a task already queued is not queued again.
+        """
+        with self._archive_lock:
+            if task_id in self._archiving:
+                return
+            if self._archive_executor is None:
+                self._archive_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="nso-task-archive")
+            self._archiving.add(task_id)
+            future = self._archive_executor.submit(
+                self.context_manager.archive_task_context, task_id)
+        future.add_done_callback(lambda f: self._archive_done(task_id, f))
+    
+    def _archive_done(self, task_id: str, future):
+        """Forget a finished archive job, reporting its error if it failed."""
+        with self._archive_lock:
+            self._archiving.discard(task_id)
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Warning: could not archive task {task_id}: {future.exception()}")
+    
+    def wait_for_archiving(self):
+        """Block until every queued archive job has finished."""
+        with self._archive_lock:
+            executor, self._archive_executor = self._archive_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
     
     def _save_monitoring_state(self):
         """Save current monitoring state to file."""
@@ -725,9 +809,13 @@ class ParallelCoordinator:
             'config_enabled': self.config.get('enabled', False)
         }
         
+        if self.state_store:
+            self.state_store.put('coordinator', 'monitoring', state)
+            return
+        
+        # Locked like the other state writers: several coordinators may share the state file
         state_file = Path(".opencode/context") / "parallel_coordinator_state.json"
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        update_json(state_file, lambda _current: state)
     
     def start_monitoring(self):
         """Start the task monitoring thread."""
@@ -739,6 +827,10 @@ class ParallelCoordinator:
                 name="ParallelCoordinatorMonitor"
             )
             self.monitor_thread.start()
+            
+            # Background deletion of trashed task contexts (see task_gc.py)
+            if hasattr(self.context_manager, 'gc'):
+                self.context_manager.gc.start()
             print("Task monitoring started")
     
     def stop_monitoring(self):
@@ -747,6 +839,9 @@ class ParallelCoordinator:
         if self.monitor_thread:
             self.monitor_thread.join(timeout=30)
             print("Task monitoring stopped")
+        self.wait_for_archiving()
+        if hasattr(self.context_manager, 'gc'):
+            self.context_manager.gc.stop()
     
     def get_status(self) -> Dict:
         """Get current coordinator status."""
@@ -831,6 +926,7 @@ def main():
     
     elif args.cleanup:
         coordinator._cleanup_old_tasks()
+        coordinator.wait_for_archiving()
         print("Cleanup completed")
     
     else:
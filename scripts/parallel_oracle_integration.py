@@ -22,6 +22,10 @@ from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Any
 import hashlib
 
+sys.path.insert(0, str(Path(__file__).parent))
+from id_allocator import get_allocator
+from task_id_codec import format_oracle_id
+
 
 # ============================================================================
 # CONFIGURATION
@@ -99,22 +103,13 @@ class TaskIDGenerator:
         hash_suffix = hashlib.md5(hash_input.encode()).hexdigest()[:6]
         counter = TaskIDGenerator._get_counter()
         
-        return f"{project}_{workflow}_{timestamp}_{hash_suffix}_{counter:03d}"
+        return format_oracle_id(project, workflow, timestamp, hash_suffix, counter)
     
     @staticmethod
     def _get_counter() -> int:
-        """Get a simple counter from session state."""
+        """Get the next task counter (shared .opencode/.task_counter, unique across processes)."""
         try:
-            state_path = Path(".opencode/.task_counter")
-            if state_path.exists():
-                counter = int(state_path.read_text().strip())
-            else:
-                counter = 0
-            
-            # Increment and save
-            counter += 1
-            state_path.write_text(str(counter))
-            return counter
+            return get_allocator().next()
         except:
             return 1
 
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+NSO Pytest Events — Structured Per-Test Results as JSON Lines
+
+A tiny pytest plugin. When NSO_PYTEST_EVENTS names a file, pytest appends
+one JSON object per line to it as the run progresses:
+
+    {"event": "collected", "count": 42}
+    {"event": "test", "nodeid": "tests/test_x.py::test_a", "outcome": "passed",
+     "duration": 0.012, "when": "call", "message": ""}
+    {"event": "finish", "exitstatus": 1, "duration": 3.4}
+
+Outcomes: passed, failed, error (setup/teardown/collection), skipped,
+xfailed, xpassed. Node IDs are relative to the directory pytest was
+started in, whatever its rootdir. Runners read the file instead of
+scraping pytest's terminal output: reading is exact and O(tests), and the
+terminal output never needs to be held in memory.
+
+Usage:
+    from pytest_events import plugin_args, read_events, summarize
+
+    args, env = plugin_args(Path("events.jsonl"))
+    subprocess.run([sys.executable, "-m", "pytest", *args, "tests"], env=env)
+    summarize(read_events(Path("events.jsonl")))   # {'passed': 40, 'failed': 2, ...}
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+EVENTS_ENV = "NSO_PYTEST_EVENTS"
+MESSAGE_CHARS = 2000
+OUTCOMES = ("passed", "failed", "error", "skipped", "xfailed", "xpassed")
+
+
+# ─── Runner Side ────────────────────────────────────────────────────
+
+def plugin_args(events_path: Path | str, env: Optional[dict] = None) -> tuple[list[str], dict]:
+    """
+    pytest arguments and environment that enable the plugin.
+
+    The plugin is loaded by module name, so this directory is put on
+    PYTHONPATH for the pytest process.
+    """
+    env = dict(os.environ if env is None else env)
+    here = str(Path(__file__).resolve().parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [here, env.get("PYTHONPATH")]))
+    env[EVENTS_ENV] = str(events_path)
+    return ["-p", "pytest_events"], env
+
+
+def read_events(path: Path | str) -> Iterator[dict]:
+    """Yield events from a file written by the plugin (a missing file yields nothing)."""
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a killed process
+    except FileNotFoundError:
+        return
+
+
+def summarize(events: Iterable[dict]) -> dict:
+    """Outcome counts plus 'collected' and 'exitstatus' (None if the run did not finish)."""
+    summary: dict = {outcome: 0 for outcome in OUTCOMES}
+    summary.update(collected=0, exitstatus=None)
+    for event in events:
+        kind = event.get("event")
+        if kind == "test":
+            summary[event["outcome"]] = summary.get(event["outcome"], 0) + 1
+        elif kind == "collected":
+            summary["collected"] += event.get("count", 0)
+        elif kind == "finish":
+            summary["exitstatus"] = event.get("exitstatus")
+    return summary
+
+
+# ─── Plugin Side ────────────────────────────────────────────────────
+
+def _message(report) -> str:
+    longrepr = report.longrepr
+    if longrepr is None:
+        return ""
+    if isinstance(longrepr, tuple) and len(longrepr) == 3:  # skip: (file, line, reason)
+        return str(longrepr[2])
+    crash = getattr(longrepr, "reprcrash", None)
+    if crash is not None and getattr(crash, "message", None):
+        return crash.message[:MESSAGE_CHARS]
+    return str(longrepr)[-MESSAGE_CHARS:]
+
+
+class EventWriter:
+    """Writes one JSON line per collected count, test result and session end."""
+
+    def __init__(self, path: str, config):
+        self.file = open(path, "a", buffering=1)
+        self.started = time.monotonic()
+        rootpath = Path(str(getattr(config, "rootpath", config.rootdir)))
+        invocation = Path(str(config.invocation_params.dir))
+        try:
+            self.prefix = rootpath.relative_to(invocation).as_posix()
+        except ValueError:
+            self.prefix = os.path.relpath(rootpath, invocation).replace(os.sep, "/")
+        self.setup_time: dict[str, float] = {}
+
+    def _nodeid(self, nodeid: str) -> str:
+        if self.prefix in ("", "."):
+            return nodeid
+        return f"{self.prefix}/{nodeid}"
+
+    def _write(self, event: dict) -> None:
+        self.file.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    def _test(self, report, outcome: str, duration: float) -> None:
+        self._write({
+            "event": "test",
+            "nodeid": self._nodeid(report.nodeid),
+            "outcome": outcome,
+            "duration": round(duration, 6),
+            "when": report.when,
+            "message": _message(report) if outcome != "passed" else "",
+        })
+
+    def pytest_collectreport(self, report) -> None:
+        if report.failed:
+            self._test(report, "error", 0.0)
+
+    def pytest_collection_finish(self, session) -> None:
+        self._write({"event": "collected", "count": len(session.items)})
+
+    def pytest_runtest_logreport(self, report) -> None:
+        xfail = hasattr(report, "wasxfail")
+        if report.when == "setup":
+            if report.passed:
+                self.setup_time[report.nodeid] = report.duration
+            elif report.skipped:
+                self._test(report, "xfailed" if xfail else "skipped", report.duration)
+            else:
+                self._test(report, "error", report.duration)
+        elif report.when == "call":
+            duration = self.setup_time.pop(report.nodeid, 0.0) + report.duration
+            if xfail:
+                outcome = "xfailed" if report.skipped else "xpassed"
+            else:
+                outcome = "passed" if report.passed else "skipped" if report.skipped else "failed"
+            self._test(report, outcome, duration)
+        elif report.failed:  # teardown error
+            self._test(report, "error", report.duration)
+
+    def pytest_sessionfinish(self, session, exitstatus) -> None:
+        self._write({
+            "event": "finish",
+            "exitstatus": int(exitstatus),
+            "duration": round(time.monotonic() - self.started, 3),
+        })
+
+    def pytest_unconfigure(self, config) -> None:
+        self.file.close()
+
+
+def pytest_configure(config) -> None:
+    path = os.environ.get(EVENTS_ENV)
+    # Only in the main process (not in xdist workers, which have workerinput)
+    if path and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(EventWriter(path, config), "nso-pytest-events")
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+NSO Pytest Sharding — Parallel Test Runs Without pytest-xdist
+
+Splits a test run across N pytest worker processes and merges the
+results into one report.
+
+- The unit of work is a test file, so module/class fixtures keep working
+  exactly as in a serial run.
+- Test files are found the way pytest finds them, using the project's
+  `testpaths`, `python_files` and `norecursedirs` settings.
+- Files are assigned greedily by longest processing time: the slowest
+  file goes to the least loaded shard, and so on. File cost is the sum
+  of its tests' durations from earlier runs, kept in
+  .opencode/cache/test_durations.json (per test node ID). Files that
+  have never been timed count as the median known file cost.
+- Each shard streams per-test events through the pytest_events plugin,
+  which provide the outcomes for the merged report and fresh durations
+  for the next split.
+
+Usage:
+    from pytest_shard import run_sharded
+
+    report = run_sharded(configured_test_paths(), workers=4)
+    print(report.summary())
+
+    python3 pytest_shard.py -n 4 tests/ -- -x
+"""
+
+from __future__ import annotations
+
+import argparse
+import configparser
+import fnmatch
+import heapq
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).parent))
+from file_lock import read_json, update_json
+from pytest_events import plugin_args, read_events
+
+
+DURATIONS_PATH = Path(".opencode/cache/test_durations.json")
+DEFAULT_FILE_COST = 1.0  # seconds, when nothing has been timed yet
+DEFAULT_TIMEOUT = 300.0  # seconds per shard
+# pytest's defaults when the project does not configure python_files / norecursedirs
+DEFAULT_PYTHON_FILES = ["test_*.py", "*_test.py"]
+DEFAULT_NORECURSEDIRS = ["*.egg", ".*", "_darcs", "build", "CVS", "dist", "node_modules", "venv", "{arch}"]
+
+
+# ─── Splitting ──────────────────────────────────────────────────────
+
+def pytest_options(root: str | Path = ".") -> dict[str, list[str]]:
+    """
+    ini options from the project's pytest configuration, each as a list.
+
+    Uses the file pytest itself would: pytest.ini, then the first of
+    pyproject.toml, tox.ini and setup.cfg that has a pytest section.
+    """
+    root = Path(root)
+    for name, section in (("pytest.ini", "pytest"), ("pyproject.toml", None),
+                          ("tox.ini", "pytest"), ("setup.cfg", "tool:pytest")):
+        path = root / name
+        if not path.is_file():
+            continue
+        if section is None:
+            try:
+                import tomllib
+                with open(path, "rb") as f:
+                    options = tomllib.load(f).get("tool", {}).get("pytest", {}).get("ini_options")
+            except (ImportError, OSError, ValueError):
+                continue
+            if options is None:
+                continue
+            return {key: [value] if isinstance(value, str) else list(value)
+                    for key, value in options.items() if isinstance(value, (str, list))}
+
+        parser = configparser.ConfigParser(interpolation=None)
+        try:
+            parser.read(path)
+        except configparser.Error:
+            continue
+        if parser.has_section(section):
+            return {key: value.split() for key, value in parser.items(section)}
+        if name == "pytest.ini":
+            return {}  # pytest.ini wins even without a [pytest] section
+    return {}
+
+
+def configured_test_paths(root: str | Path = ".") -> list[str]:
+    """pytest's `testpaths` setting for a project, or ['.'] if none is configured."""
+    return pytest_options(root).get("testpaths") or ["."]
+
+
+def discover_test_files(paths: Iterable[str | Path], root: str | Path = ".") -> list[str]:
+    """
+    Test files under the given paths, as pytest would collect them: names
+    matching `python_files`, skipping `norecursedirs` and virtualenvs
+    (both read from the pytest configuration in `root`). Files are taken
+    as given.
+    """
+    options = pytest_options(root)
+    patterns = options.get("python_files") or DEFAULT_PYTHON_FILES
+    skipped = options.get("norecursedirs") or DEFAULT_NORECURSEDIRS
+
+    def collect_dir(dirpath: str, name: str) -> bool:
+        if any(fnmatch.fnmatch(name, pattern) for pattern in skipped):
+            return False
+        return not os.path.exists(os.path.join(dirpath, name, "pyvenv.cfg"))
+
+    found: list[str] = []
+    for path in map(Path, paths):
+        if path.is_file():
+            found.append(path.as_posix())
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(d for d in dirnames if collect_dir(dirpath, d))
+            found.extend(Path(dirpath, name).as_posix() for name in sorted(filenames)
+                         if name.endswith(".py") and any(fnmatch.fnmatch(name, p) for p in patterns))
+    return sorted(set(found))
+
+
+def file_costs(files: Sequence[str], durations: dict[str, float]) -> dict[str, float]:
+    """Estimated run time per file from per-test durations."""
+    totals: dict[str, float] = {}
+    for node_id, seconds in durations.items():
+        path = node_id.split("::", 1)[0]
+        totals[path] = totals.get(path, 0.0) + seconds
+
+    known = [totals[f] for f in files if f in totals]
+    default = statistics.median(known) if known else DEFAULT_FILE_COST
+    return {f: totals.get(f, default) for f in files}
+
+
+def split_lpt(costs: dict[str, float], shards: int) -> list[list[str]]:
+    """
+    Longest-processing-time split: files in descending cost, each to the
+    currently lightest shard. Empty shards are dropped.
+    """
+    heap = [(0.0, i) for i in range(max(1, shards))]
+    buckets: list[list[str]] = [[] for _ in heap]
+    for path in sorted(costs, key=lambda f: (-costs[f], f)):
+        load, index = heapq.heappop(heap)
+        buckets[index].append(path)
+        heapq.heappush(heap, (load + costs[path], index))
+    return [sorted(bucket) for bucket in buckets if bucket]
+
+
+# ─── Results ────────────────────────────────────────────────────────
+
+@dataclass
+class TestOutcome:
+    """One test result from a shard's event stream."""
+    __test__ = False  # not a pytest test class
+
+    node_id: str
+    outcome: str  # passed, failed, error, skipped, xfailed, xpassed
+    duration: float
+    message: str = ""
+
+
+@dataclass
+class ShardReport:
+    """Merged results of all shards."""
+    outcomes: list[TestOutcome] = field(default_factory=list)
+    collected: int = 0
+    shards: int = 0
+    duration: float = 0.0
+    returncodes: list[int] = field(default_factory=list)
+    output: str = ""
+    timed_out: bool = False
+    cancelled: bool = False
+
+    def count(self, outcome: str) -> int:
+        return sum(1 for o in self.outcomes if o.outcome == outcome)
+
+    @property
+    def passed(self) -> int:
+        return self.count("passed")
+
+    @property
+    def failed(self) -> int:
+        return self.count("failed")
+
+    @property
+    def errors(self) -> int:
+        return self.count("error")
+
+    @property
+    def skipped(self) -> int:
+        return self.count("skipped")
+
+    @property
+    def success(self) -> bool:
+        # 5 = no tests collected, which is not a failure for a shard
+        return (not self.timed_out and not self.cancelled and not self.failed and not self.errors
+                and all(code in (0, 5) for code in self.returncodes))
+
+    def failures(self) -> list[TestOutcome]:
+        return [o for o in self.outcomes if o.outcome in ("failed", "error")]
+
+    def summary(self) -> str:
+        """pytest-style summary line, e.g. '3 passed, 1 failed in 2.10s'."""
+        parts = [f"{n} {label}" for n, label in (
+            (self.failed, "failed"), (self.passed, "passed"),
+            (self.skipped, "skipped"), (self.errors, "error" if self.errors == 1 else "errors"),
+        ) if n]
+        return f"{', '.join(parts) or 'no tests ran'} in {self.duration:.2f}s"
+
+
+def parse_events(events_path: str | Path) -> tuple[list[TestOutcome], int]:
+    """Test outcomes and collected count from a shard's event file."""
+    outcomes, collected = [], 0
+    for event in read_events(events_path):
+        if event.get("event") == "test":
+            outcomes.append(TestOutcome(event["nodeid"], event["outcome"],
+                                        event.get("duration", 0.0), event.get("message", "")))
+        elif event.get("event") == "collected":
+            collected += event.get("count", 0)
+    return outcomes, collected
+
+
+# ─── Running ────────────────────────────────────────────────────────
+
+def pytest_command() -> list[str]:
+    return [sys.executable, "-m", "pytest"]
+
+
+def default_workers() -> int:
+    return min(4, os.cpu_count() or 1)
+
+
+def run_sharded(
+    paths: Sequence[str | Path] = (".",),
+    workers: Optional[int] = None,
+    pytest_args: Sequence[str] = (),
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    cwd: Optional[str | Path] = None,
+    cancel: Optional[threading.Event] = None,
+    durations_path: Optional[Path] = DURATIONS_PATH,
+    pytest_cmd: Optional[Sequence[str]] = None,
+) -> ShardReport:
+    """
+    Run the tests under `paths` in up to `workers` pytest processes.
+
+    Args:
+        paths: Test files or directories (relative to cwd).
+        workers: Shard count (default: CPU count, at most 4).
+        pytest_args: Extra arguments for every shard.
+        timeout: Seconds each shard may run before it is killed.
+        cwd: Directory pytest runs in (default: current).
+        cancel: Event that kills all shards when set.
+        durations_path: Per-test duration store, relative to cwd
+            (None to neither read nor update it).
+        pytest_cmd: Command that runs pytest (default: this Python's -m pytest).
+    """
+    root = Path(cwd or ".")
+    started = time.monotonic()
+    workers = workers or default_workers()
+
+    files = discover_test_files((root / p for p in paths), root)
+    files = [os.path.relpath(f, root).replace(os.sep, "/") for f in files]
+    store = root / durations_path if durations_path else None
+    durations = read_json(store, {}) if store else {}
+    shards = split_lpt(file_costs(files, durations), workers) if files else []
+
+    report = ShardReport(shards=len(shards))
+    with tempfile.TemporaryDirectory(prefix="nso-shards-") as tmp:
+        processes = []
+        for index, shard in enumerate(shards):
+            events_path = os.path.join(tmp, f"shard_{index}.jsonl")
+            events_args, env = plugin_args(events_path)
+            cmd = list(pytest_cmd or pytest_command()) + [
+                "-q", "-p", "no:cacheprovider", *events_args, *pytest_args, *shard,
+            ]
+            log = tempfile.TemporaryFile(mode="w+", dir=tmp)
+            process = subprocess.Popen(cmd, cwd=root, stdout=log, stderr=subprocess.STDOUT,
+                                       text=True, env=env)
+            processes.append((process, log, events_path))
+
+        deadline = started + timeout if timeout else None
+        for process, _, _ in processes:
+            while process.poll() is None:
+                if cancel is not None and cancel.is_set():
+                    report.cancelled = True
+                elif deadline is not None and time.monotonic() > deadline:
+                    report.timed_out = True
+                if report.cancelled or report.timed_out:
+                    for other, _, _ in processes:
+                        if other.poll() is None:
+                            other.kill()
+                    break
+                time.sleep(0.05)
+
+        outputs = []
+        for index, (process, log, events_path) in enumerate(processes):
+            report.returncodes.append(process.wait())
+            log.seek(0)
+            outputs.append(f"── shard {index + 1}/{len(processes)} ──\n{log.read()}")
+            log.close()
+            outcomes, collected = parse_events(events_path)
+            report.outcomes.extend(outcomes)
+            report.collected += collected
+        report.output = "\n".join(outputs)
+
+    report.duration = time.monotonic() - started
+    if store and report.outcomes and not report.cancelled:
+        _record_durations(store, report.outcomes, root)
+    return report
+
+
+def _record_durations(store: Path, outcomes: list[TestOutcome], root: Path) -> None:
+    measured = {o.node_id: round(o.duration, 4) for o in outcomes
+                if o.outcome not in ("skipped", "xfailed") and "::" in o.node_id}
+
+    def merge(current: dict) -> dict:
+        current.update(measured)
+        # Forget tests whose file is gone
+        return {node: seconds for node, seconds in current.items()
+                if (root / node.split("::", 1)[0]).exists()}
+    update_json(store, merge)
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    extra: list[str] = []
+    if "--" in argv:
+        extra = argv[argv.index("--") + 1:]
+        argv = argv[:argv.index("--")]
+
+    parser = argparse.ArgumentParser(description="Run pytest split across worker processes")
+    parser.add_argument("paths", nargs="*", help="Test files or directories (default: pytest testpaths)")
+    parser.add_argument("-n", "--workers", type=int, help="Number of shards (default: CPU count, at most 4)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds per shard")
+    parser.add_argument("--plan", action="store_true", help="Show the split without running it")
+    args = parser.parse_args(argv)
+    args.paths = args.paths or configured_test_paths()
+
+    if args.plan:
+        files = discover_test_files(args.paths)
+        costs = file_costs(files, read_json(DURATIONS_PATH, {}))
+        for index, shard in enumerate(split_lpt(costs, args.workers or default_workers())):
+            print(f"shard {index + 1}: ~{sum(costs[f] for f in shard):.2f}s")
+            for path in shard:
+                print(f"    {path} (~{costs[path]:.2f}s)")
+        return 0
+
+    report = run_sharded(args.paths, args.workers, extra, args.timeout)
+    for failure in report.failures():
+        print(f"FAILED {failure.node_id} - {failure.message.splitlines()[0] if failure.message else ''}")
+    if report.timed_out:
+        print(f"Timed out after {args.timeout:.0f}s")
+    print(f"{report.shards} shard(s): {report.summary()}")
+    return 0 if report.success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,23 +3,50 @@ Session State Manager for NSO Workflow Recovery.
 
 Tracks active delegations and enables recovery after interruptions.
 
+Every delegation change is appended as one event to an append-only
+journal (session_journal.jsonl). session_state.json is a compacted
+snapshot of the journal: the folded state, the last HISTORY_WINDOW
+history entries and the journal offset it covers. Loading replays the
+journal tail after that offset, so writes never rewrite the full
+history. Writers serialize on an advisory lock (see file_lock.py) so a
+snapshot always covers every event before its journal offset. With
+NSO_STATE_BACKEND=sqlite both the snapshot and the journal events are
+kept in the SQLite state store (see state_store.py) instead, and neither
+file is written.
+
 @implements: NSO-Recovery-1
 """
 
 from __future__ import annotations
 
 import json
+import os
+import sys
+from collections.abc import MutableSequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Union, overload
+
+sys.path.insert(0, str(Path(__file__).parent))
+from file_lock import atomic_write_json, file_lock
+from state_store import open_state_store
 
 
-# Session state file
+# Session state snapshot and delegation event journal
 SESSION_STATE_FILE = Path(".opencode/logs/session_state.json")
+SESSION_JOURNAL_FILE = Path(".opencode/logs/session_journal.jsonl")
+# State store namespace holding the journal events with NSO_STATE_BACKEND=sqlite
+SESSION_EVENTS = "session_event"
+
+# Completed delegations kept in the snapshot (older ones stay in the journal)
+HISTORY_WINDOW = 50
+
+# __slots__ dataclasses need Python 3.10+; older interpreters get plain ones
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DelegationState:
     """State of an active delegation."""
     delegator: str  # "Oracle", "Janitor", etc.
@@ -34,102 +61,285 @@ class DelegationState:
     interrupted: bool = False
 
 
-@dataclass
+class LazyHistory(MutableSequence):
+    """
+    Delegation history that keeps entries as raw JSON dicts until they are
+    accessed, so loading state for the active delegation never pays for
+    building a DelegationState per history entry.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Iterable[Union[dict, DelegationState]] = ()):
+        self._items: list[Union[dict, DelegationState]] = list(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> DelegationState: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[DelegationState]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+
+        item = self._items[index]
+        if isinstance(item, dict):
+            item = _delegation_from_dict(item)
+            self._items[index] = item
+        return item
+
+    def __setitem__(self, index, value) -> None:
+        self._items[index] = value
+
+    def __delitem__(self, index) -> None:
+        del self._items[index]
+
+    def insert(self, index: int, value: DelegationState) -> None:
+        self._items.insert(index, value)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (LazyHistory, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyHistory({len(self._items)} entries)"
+
+    def to_dicts(self, limit: Optional[int] = None) -> list[dict]:
+        """Serialize the last `limit` entries without materializing untouched ones."""
+        items = self._items if limit is None else self._items[-limit:] if limit else []
+        return [item if isinstance(item, dict) else _delegation_to_dict(item) for item in items]
+
+
+@dataclass(**_SLOTS)
 class SessionState:
     """Complete session state for recovery."""
     active_delegation: Optional[DelegationState] = None
-    history: list[DelegationState] = field(default_factory=list)
+    history: LazyHistory = field(default_factory=LazyHistory)
     current_agent: str = "Oracle"
     current_workflow: Optional[str] = None
     current_phase: Optional[str] = None
 
+    def __post_init__(self) -> None:
+        if not isinstance(self.history, LazyHistory):
+            self.history = LazyHistory(self.history)
+
+
+def _delegation_from_dict(data: dict) -> DelegationState:
+    return DelegationState(
+        delegator=data["delegator"],
+        delegate=data["delegate"],
+        workflow=data["workflow"],
+        phase=data["phase"],
+        task_description=data["task_description"],
+        started_at=data["started_at"],
+        last_activity=data["last_activity"],
+        artifacts=data.get("artifacts", []),
+        checkpoint=data.get("checkpoint"),
+        interrupted=data.get("interrupted", False),
+    )
+
+
+def _delegation_to_dict(delegation: DelegationState) -> dict:
+    return {
+        "delegator": delegation.delegator,
+        "delegate": delegation.delegate,
+        "workflow": delegation.workflow,
+        "phase": delegation.phase,
+        "task_description": delegation.task_description,
+        "started_at": delegation.started_at,
+        "last_activity": delegation.last_activity,
+        "artifacts": delegation.artifacts,
+        "checkpoint": delegation.checkpoint,
+        "interrupted": delegation.interrupted,
+    }
+
+
+def _state_from_dict(data: dict) -> SessionState:
+    state = SessionState(
+        current_agent=data.get("current_agent", "Oracle"),
+        current_workflow=data.get("current_workflow"),
+        current_phase=data.get("current_phase"),
+        history=LazyHistory(data.get("history", [])),
+    )
+
+    if data.get("active_delegation"):
+        state.active_delegation = _delegation_from_dict(data["active_delegation"])
+
+    return state
+
+
+def _state_to_dict(state: SessionState, history_limit: Optional[int] = None) -> dict:
+    data = {
+        "current_agent": state.current_agent,
+        "current_workflow": state.current_workflow,
+        "current_phase": state.current_phase,
+        "history": state.history.to_dicts(history_limit),
+    }
+
+    if state.active_delegation:
+        data["active_delegation"] = _delegation_to_dict(state.active_delegation)
+
+    return data
+
+
+def _apply_event(state: SessionState, event: dict) -> None:
+    """Fold one journal event into the session state."""
+    kind = event.get("event")
+
+    if kind == "start":
+        # Mark any previous delegation as interrupted and move to history
+        if state.active_delegation:
+            state.active_delegation.interrupted = True
+            state.history.append(state.active_delegation)
+
+        delegation = _delegation_from_dict(event["delegation"])
+        state.active_delegation = delegation
+        state.current_agent = delegation.delegate
+        state.current_workflow = delegation.workflow
+        state.current_phase = delegation.phase
+
+    elif kind == "complete":
+        delegation = state.active_delegation
+        if delegation is None:
+            return
+
+        # Move to history
+        delegation.checkpoint = event.get("checkpoint")
+        delegation.artifacts.extend(event.get("artifacts") or [])
+        delegation.last_activity = event["at"]
+
+        state.history.append(delegation)
+        state.active_delegation = None
+        state.current_agent = delegation.delegator
+        state.current_phase = None
+
+
+def _journal_size() -> int:
+    try:
+        return SESSION_JOURNAL_FILE.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _decode_event(line: bytes) -> Optional[dict]:
+    """Decode one journal line; a torn write left behind by a crash decodes to None."""
+    try:
+        return json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+def _read_journal(offset: int) -> tuple[list[dict], int]:
+    """Return the complete events after `offset` and the offset just past them."""
+    try:
+        with open(SESSION_JOURNAL_FILE, "rb") as f:
+            f.seek(offset)
+            tail = f.read()
+    except FileNotFoundError:
+        return [], offset
+
+    # Ignore a partially written last line; it is picked up once complete
+    end = tail.rfind(b"\n") + 1
+    events = [_decode_event(line) for line in tail[:end].splitlines() if line.strip()]
+    return [event for event in events if event is not None], offset + end
 
-def load_session_state() -> SessionState:
-    """Load session state from file."""
-    if not SESSION_STATE_FILE.exists():
-        return SessionState()
 
+def _append_event(event: dict) -> None:
+    """
+    Append one event to the journal with a single O_APPEND write.
+
+    If a previous writer died mid-line, the torn line is terminated first so
+    the new event starts on a line of its own instead of being glued onto it.
+    """
+    SESSION_JOURNAL_FILE.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(SESSION_JOURNAL_FILE, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
     try:
+        record = json.dumps(event) + "\n"
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b"\n":
+            record = "\n" + record
+        os.write(fd, record.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def _write_snapshot(state: SessionState, journal_offset: int) -> None:
+    """Write the compacted snapshot: folded state, bounded history, journal position."""
+    data = _state_to_dict(state, history_limit=HISTORY_WINDOW)
+    data["journal_offset"] = journal_offset
+    atomic_write_json(SESSION_STATE_FILE, data)
+
+
+def _replay() -> tuple[SessionState, int]:
+    """Rebuild state from the snapshot plus the journal tail written after it."""
+    state, offset = SessionState(), 0
+    if SESSION_STATE_FILE.exists():
         data = json.loads(SESSION_STATE_FILE.read_text())
-        state = SessionState(
-            current_agent=data.get("current_agent", "Oracle"),
-            current_workflow=data.get("current_workflow"),
-            current_phase=data.get("current_phase"),
-            history=[
-                DelegationState(
-                    delegator=h["delegator"],
-                    delegate=h["delegate"],
-                    workflow=h["workflow"],
-                    phase=h["phase"],
-                    task_description=h["task_description"],
-                    started_at=h["started_at"],
-                    last_activity=h["last_activity"],
-                    artifacts=h.get("artifacts", []),
-                    checkpoint=h.get("checkpoint"),
-                    interrupted=h.get("interrupted", False),
-                )
-                for h in data.get("history", [])
-            ],
-        )
-
-        if data.get("active_delegation"):
-            state.active_delegation = DelegationState(
-                delegator=data["active_delegation"]["delegator"],
-                delegate=data["active_delegation"]["delegate"],
-                workflow=data["active_delegation"]["workflow"],
-                phase=data["active_delegation"]["phase"],
-                task_description=data["active_delegation"]["task_description"],
-                started_at=data["active_delegation"]["started_at"],
-                last_activity=data["active_delegation"]["last_activity"],
-                artifacts=data["active_delegation"].get("artifacts", []),
-                checkpoint=data["active_delegation"].get("checkpoint"),
-            )
+        state, offset = _state_from_dict(data), data.get("journal_offset", 0)
+
+    events, offset = _read_journal(offset)
+    for event in events:
+        _apply_event(state, event)
+    return state, offset
 
+
+def _commit_event(event: dict) -> SessionState:
+    """
+    Record a delegation event and return the resulting state.
+
+    File backend: under the session lock the event is appended to the
+    journal, then state is replayed from the snapshot and re-snapshotted.
+    Both writes are bounded by HISTORY_WINDOW, not by the length of the
+    session. State store: the event and the new snapshot are written in
+    one transaction.
+    """
+    store = open_state_store()
+    if store:
+        with store.transaction():
+            state = load_session_state()
+            _apply_event(state, event)
+            seq = store.increment(SESSION_EVENTS)
+            store.put(SESSION_EVENTS, f"{seq:012d}", {**event, "seq": seq})
+            save_session_state(state)
         return state
 
+    with file_lock(SESSION_STATE_FILE):
+        _append_event(event)
+        state, offset = _replay()
+        _write_snapshot(state, offset)
+    return state
+
+
+def load_session_state() -> SessionState:
+    """Load session state (snapshot plus journal tail)."""
+    store = open_state_store()
+    if store:
+        data = store.get("session", "current")
+        return _state_from_dict(data) if data else SessionState()
+
+    try:
+        return _replay()[0]
+
     except (json.JSONDecodeError, KeyError) as e:
         print(f"⚠️ Warning: Failed to load session state: {e}")
         return SessionState()
 
 
 def save_session_state(state: SessionState) -> None:
-    """Save session state to file."""
-    data = {
-        "current_agent": state.current_agent,
-        "current_workflow": state.current_workflow,
-        "current_phase": state.current_phase,
-        "history": [
-            {
-                "delegator": d.delegator,
-                "delegate": d.delegate,
-                "workflow": d.workflow,
-                "phase": d.phase,
-                "task_description": d.task_description,
-                "started_at": d.started_at,
-                "last_activity": d.last_activity,
-                "artifacts": d.artifacts,
-                "checkpoint": d.checkpoint,
-                "interrupted": d.interrupted,
-            }
-            for d in state.history
-        ],
-    }
+    """Save session state as the new snapshot (covering the whole journal so far)."""
+    store = open_state_store()
+    if store:
+        data = _state_to_dict(state, history_limit=HISTORY_WINDOW)
+        store.put("session", "current", data, status=state.current_phase)
+        return
 
-    if state.active_delegation:
-        data["active_delegation"] = {
-            "delegator": state.active_delegation.delegator,
-            "delegate": state.active_delegation.delegate,
-            "workflow": state.active_delegation.workflow,
-            "phase": state.active_delegation.phase,
-            "task_description": state.active_delegation.task_description,
-            "started_at": state.active_delegation.started_at,
-            "last_activity": state.active_delegation.last_activity,
-            "artifacts": state.active_delegation.artifacts,
-            "checkpoint": state.active_delegation.checkpoint,
-        }
-
-    SESSION_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    SESSION_STATE_FILE.write_text(json.dumps(data, indent=2))
+    with file_lock(SESSION_STATE_FILE):
+        _write_snapshot(state, _journal_size())
 
 
 def start_delegation(
@@ -144,30 +354,18 @@ def start_delegation(
 
     Returns the delegation state for the delegate to use.
     """
-    state = load_session_state()
-
-    # Mark any previous delegation as interrupted and move to history
-    if state.active_delegation:
-        state.active_delegation.interrupted = True
-        state.history.append(state.active_delegation)
-        state.active_delegation = None
-
+    now = datetime.utcnow().isoformat()
     delegation = DelegationState(
         delegator=delegator,
         delegate=delegate,
         workflow=workflow,
         phase=phase,
         task_description=task_description,
-        started_at=datetime.utcnow().isoformat(),
-        last_activity=datetime.utcnow().isoformat(),
+        started_at=now,
+        last_activity=now,
     )
 
-    state.active_delegation = delegation
-    state.current_agent = delegate
-    state.current_workflow = workflow
-    state.current_phase = phase
-
-    save_session_state(state)
+    _commit_event({"event": "start", "at": now, "delegation": _delegation_to_dict(delegation)})
     print(f"📝 Delegation started: {delegator} → {delegate} ({phase})")
 
     return delegation
@@ -183,28 +381,23 @@ def complete_delegation(
 
     Returns the completed delegation for logging.
     """
-    state = load_session_state()
+    active = get_active_delegation()
 
-    if not state.active_delegation:
+    if not active:
         print("⚠️ Warning: No active delegation to complete")
         return None
 
-    if state.active_delegation.delegate != delegate:
-        print(f"⚠️ Warning: Delegate mismatch ({delegate} != {state.active_delegation.delegate})")
-
-    # Move to history
-    delegation = state.active_delegation
-    delegation.checkpoint = checkpoint
-    if artifacts:
-        delegation.artifacts.extend(artifacts)
-    delegation.last_activity = datetime.utcnow().isoformat()
-
-    state.history.append(delegation)
-    state.active_delegation = None
-    state.current_agent = delegation.delegator
-    state.current_phase = None
-
-    save_session_state(state)
+    if active.delegate != delegate:
+        print(f"⚠️ Warning: Delegate mismatch ({delegate} != {active.delegate})")
+
+    state = _commit_event({
+        "event": "complete",
+        "at": datetime.utcnow().isoformat(),
+        "delegate": delegate,
+        "checkpoint": checkpoint,
+        "artifacts": artifacts or [],
+    })
+    delegation = state.history[-1]
     print(f"✅ Delegation completed: {delegation.delegator} ← {delegate}")
 
     return delegation
@@ -230,10 +423,52 @@ def get_active_delegation() -> Optional[DelegationState]:
     return state.active_delegation
 
 
+def _fold_history(events: Iterable[dict]) -> Iterator[DelegationState]:
+    state = SessionState()
+    for event in events:
+        before = len(state.history)
+        _apply_event(state, event)
+        if len(state.history) > before:
+            yield state.history.pop()
+
+
+def _journal_events() -> Iterator[dict]:
+    try:
+        journal = open(SESSION_JOURNAL_FILE, "rb")
+    except FileNotFoundError:
+        return
+
+    with journal:
+        for line in journal:
+            if not line.endswith(b"\n"):
+                break  # partially written last line
+            event = _decode_event(line)
+            if event is not None:  # else a torn write, terminated by a later append
+                yield event
+
+
+def iter_history() -> Iterator[DelegationState]:
+    """
+    Stream every completed or interrupted delegation recorded in the
+    journal, oldest first, including entries that have aged out of the
+    snapshot's history window. Reads the journal one line at a time.
+    """
+    store = open_state_store()
+    events = store.query(SESSION_EVENTS) if store else _journal_events()
+    yield from _fold_history(events)
+
+
 def clear_session() -> None:
     """Clear all session state (for new workflows)."""
-    if SESSION_STATE_FILE.exists():
-        SESSION_STATE_FILE.unlink()
+    store = open_state_store()
+    if store:
+        with store.transaction():
+            store.delete("session", "current")
+            for event in store.query(SESSION_EVENTS):
+                store.delete(SESSION_EVENTS, f"{event['seq']:012d}")
+    for path in (SESSION_STATE_FILE, SESSION_JOURNAL_FILE):
+        if path.exists():
+            path.unlink()
     print("🗑️ Session state cleared")
 
 
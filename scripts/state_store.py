@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+NSO State Store — Optional SQLite Backend for Task, Session and Workflow State
+
+By default NSO keeps its state in plain files (session_state.json,
+workflow_state.md, *_metadata.json, ...). Setting NSO_STATE_BACKEND=sqlite
+switches session_state, workflow_orchestrator, task_context_manager,
+parallel_coordinator and the task ID counter (id_allocator) to a single
+embedded SQLite database in WAL mode:
+writes become transactional, concurrent writers are serialized by SQLite
+instead of overwriting each other, and listings use indexed queries.
+
+Records are JSON documents addressed by (namespace, key), with status,
+created_at and updated_at promoted to indexed columns. Since the database
+is not human-readable, `export` regenerates the markdown views on demand.
+
+Usage:
+    NSO_STATE_BACKEND=sqlite python3 workflow_orchestrator.py start ...
+    python3 state_store.py export              # Regenerate workflow_state.md + STATE_SUMMARY.md
+    python3 state_store.py dump --namespace workflow
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, contextmanager
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+
+STATE_BACKEND_ENV = "NSO_STATE_BACKEND"
+STATE_DB_ENV = "NSO_STATE_DB"
+DEFAULT_DB_PATH = Path(".opencode/context/nso_state.db")
+
+# Record fields that map onto indexed columns (see SQLiteStateStore.query)
+ORDER_COLUMNS = {"key", "status", "created_at", "updated_at"}
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize the non-JSON types that appear in NSO state (enums, paths, datetimes)."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+# ─── Interface ──────────────────────────────────────────────────────
+
+class StateStore(ABC):
+    """Common interface for NSO state backends."""
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[dict]:
+        """Return the record stored under (namespace, key), or None."""
+
+    @abstractmethod
+    def put(
+        self,
+        namespace: str,
+        key: str,
+        value: dict,
+        status: Optional[str] = None,
+        created_at: Optional[str] = None,
+        updated_at: Optional[str] = None,
+    ) -> None:
+        """Create or replace a record. status/created_at/updated_at are indexed."""
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> bool:
+        """Delete a record. Returns True if it existed."""
+
+    @abstractmethod
+    def query(
+        self,
+        namespace: str,
+        status: Optional[str] = None,
+        order_by: str = "key",
+        descending: bool = False,
+    ) -> list[dict]:
+        """Return all records in a namespace, optionally filtered by status."""
+
+    @abstractmethod
+    def increment(self, counter: str, step: int = 1, start: int = 0) -> int:
+        """
+        Atomically add `step` to a named counter and return the new value.
+        A counter that does not exist yet starts at `start`.
+        """
+
+    @abstractmethod
+    def transaction(self) -> AbstractContextManager[StateStore]:
+        """Group several operations into one atomic, isolated unit."""
+
+    def close(self) -> None:
+        pass
+
+
+# ─── SQLite Backend ─────────────────────────────────────────────────
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    namespace  TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    status     TEXT COLLATE NOCASE,
+    created_at TEXT,
+    updated_at TEXT,
+    data       TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS records_status ON records (namespace, status);
+CREATE INDEX IF NOT EXISTS records_created ON records (namespace, created_at);
+CREATE INDEX IF NOT EXISTS records_updated ON records (namespace, updated_at);
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class SQLiteStateStore(StateStore):
+    """State store backed by one SQLite database in WAL mode."""
+
+    def __init__(self, path: Path | str = DEFAULT_DB_PATH, timeout: float = 30.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        with conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not thread-safe)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator["SQLiteStateStore"]:
+        """
+        BEGIN IMMEDIATE takes the write lock up front, so a read-modify-write
+        inside the block cannot interleave with another process. Nested
+        calls join the outer transaction.
+        """
+        conn = self._conn()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield self
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield self
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+        finally:
+            self._local.depth = 0
+
+    def get(self, namespace: str, key: str) -> Optional[dict]:
+        row = self._conn().execute(
+            "SELECT data FROM records WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(
+        self,
+        namespace: str,
+        key: str,
+        value: dict,
+        status: Optional[str] = None,
+        created_at: Optional[str] = None,
+        updated_at: Optional[str] = None,
+    ) -> None:
+        now = datetime.now().isoformat()
+        self._conn().execute(
+            """
+            INSERT INTO records (namespace, key, status, created_at, updated_at, data)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (namespace, key) DO UPDATE SET
+                status = excluded.status,
+                created_at = COALESCE(records.created_at, excluded.created_at),
+                updated_at = excluded.updated_at,
+                data = excluded.data
+            """,
+            (
+                namespace,
+                key,
+                status,
+                created_at or now,
+                updated_at or now,
+                json.dumps(value, default=_json_default),
+            ),
+        )
+
+    def delete(self, namespace: str, key: str) -> bool:
+        cursor = self._conn().execute(
+            "DELETE FROM records WHERE namespace = ? AND key = ?", (namespace, key)
+        )
+        return cursor.rowcount > 0
+
+    def query(
+        self,
+        namespace: str,
+        status: Optional[str] = None,
+        order_by: str = "key",
+        descending: bool = False,
+    ) -> list[dict]:
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"Cannot order by '{order_by}'. Valid: {sorted(ORDER_COLUMNS)}")
+
+        sql = "SELECT data FROM records WHERE namespace = ?"
+        params: list[Any] = [namespace]
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, key"
+
+        return [json.loads(row[0]) for row in self._conn().execute(sql, params)]
+
+    def increment(self, counter: str, step: int = 1, start: int = 0) -> int:
+        with self.transaction():
+            conn = self._conn()
+            conn.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = value + ?",
+                (counter, start + step, step),
+            )
+            row = conn.execute("SELECT value FROM counters WHERE name = ?", (counter,)).fetchone()
+        return int(row[0])
+
+    def namespaces(self) -> list[str]:
+        rows = self._conn().execute("SELECT DISTINCT namespace FROM records ORDER BY namespace")
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class StoreTaskIndex:
+    """
+    TaskIndex-compatible view over one state store namespace, so code written
+    against task_index.TaskIndex can use the state store unchanged.
+    """
+
+    # TaskIndex sort field → state store column
+    SORT_COLUMNS = {"task_id": "key", "created_at": "created_at", "updated_at": "updated_at", "status": "status"}
+
+    def __init__(self, store: StateStore, namespace: str):
+        self.store = store
+        self.namespace = namespace
+
+    def rebuild(self) -> dict[str, dict]:
+        """The store is authoritative, so there is nothing to rebuild."""
+        return {r["task_id"]: r for r in self.store.query(self.namespace)}
+
+    def upsert(self, task_id: str, **fields) -> dict:
+        with self.store.transaction():
+            record = self.store.get(self.namespace, task_id) or {"task_id": task_id}
+            record.update(fields)
+            record["task_id"] = task_id
+            self.store.put(
+                self.namespace,
+                task_id,
+                record,
+                status=record.get("status"),
+                created_at=record.get("created_at"),
+                updated_at=record.get("updated_at"),
+            )
+        return record
+
+    def remove(self, task_id: str) -> bool:
+        return self.store.delete(self.namespace, task_id)
+
+    def get(self, task_id: str) -> Optional[dict]:
+        return self.store.get(self.namespace, task_id)
+
+    def query(self, status: Optional[str] = None, sort_by: str = "task_id", reverse: bool = False) -> list[dict]:
+        if sort_by not in self.SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by '{sort_by}'. Valid: {sorted(self.SORT_COLUMNS)}")
+        return self.store.query(
+            self.namespace,
+            status=status,
+            order_by=self.SORT_COLUMNS[sort_by],
+            descending=reverse,
+        )
+
+
+# ─── Backend Selection ──────────────────────────────────────────────
+
+_open_stores: dict[str, StateStore] = {}
+
+
+def open_state_store(backend: Optional[str] = None, path: Optional[Path] = None) -> Optional[StateStore]:
+    """
+    Return the configured state store, or None for the default file backend.
+
+    Args:
+        backend: "file" or "sqlite" (defaults to $NSO_STATE_BACKEND, then "file")
+        path: Database path (defaults to $NSO_STATE_DB, then DEFAULT_DB_PATH)
+    """
+    backend = (backend or os.environ.get(STATE_BACKEND_ENV) or "file").lower()
+    if backend == "file":
+        return None
+    if backend != "sqlite":
+        raise ValueError(f"Unknown state backend '{backend}'. Valid: file, sqlite")
+
+    db_path = Path(path or os.environ.get(STATE_DB_ENV) or DEFAULT_DB_PATH).resolve()
+    store = _open_stores.get(str(db_path))
+    if store is None:
+        store = SQLiteStateStore(db_path)
+        _open_stores[str(db_path)] = store
+    return store
+
+
+# ─── Markdown Export ────────────────────────────────────────────────
+
+def export_markdown(store: StateStore, output_root: Path = Path(".opencode")) -> list[Path]:
+    """
+    Regenerate the human-readable views of the state held in `store`:
+    one workflow_state.md per workflow task, plus context/STATE_SUMMARY.md.
+
+    Returns the list of files written.
+    """
+    sys.path.insert(0, str(Path(__file__).parent))
+    from workflow_orchestrator import WorkflowState
+
+    written: list[Path] = []
+    workflows = store.query("workflow")
+    for data in workflows:
+        state = WorkflowState(**data)
+        state_path = output_root / "context" / "active_tasks" / state.task_id / "workflow_state.md"
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        state_path.write_text(state.to_markdown())
+        written.append(state_path)
+
+    lines = [
+        "# NSO State Summary",
+        "",
+        f"_Exported {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} from {getattr(store, 'path', 'state store')}_",
+        "",
+        "## Workflows",
+        "",
+        "| Task ID | Workflow | Phase | Status | Updated |",
+        "|---------|----------|-------|--------|---------|",
+    ]
+    for data in workflows:
+        lines.append(
+            f"| {data['task_id']} | {data['workflow']} | {data['current_phase']} "
+            f"| {data['status']} | {data['updated_at']} |"
+        )
+
+    lines += [
+        "",
+        "## Task Contexts",
+        "",
+        "| Task ID | Workflow | Status | Created |",
+        "|---------|----------|--------|---------|",
+    ]
+    for data in store.query("task_context", order_by="created_at"):
+        lines.append(
+            f"| {data['task_id']} | {data.get('workflow_type') or 'Unknown'} "
+            f"| {data.get('status', 'unknown')} | {data.get('created_at', '')} |"
+        )
+
+    session = store.get("session", "current")
+    lines += ["", "## Session", ""]
+    if session:
+        active = session.get("active_delegation")
+        lines.append(f"- **Current Agent:** {session.get('current_agent')}")
+        lines.append(f"- **Workflow:** {session.get('current_workflow') or '-'}")
+        lines.append(f"- **Phase:** {session.get('current_phase') or '-'}")
+        if active:
+            lines.append(f"- **Active Delegation:** {active['delegator']} → {active['delegate']} ({active['phase']})")
+        lines.append(f"- **History Entries:** {len(session.get('history', []))}")
+    else:
+        lines.append("_No session state._")
+
+    coordinator = store.get("coordinator", "monitoring")
+    lines += ["", "## Parallel Coordinator", ""]
+    if coordinator:
+        lines.append(f"- **Updated:** {coordinator.get('timestamp')}")
+        lines.append(f"- **Active Tasks:** {coordinator.get('active_tasks')}")
+        lines.append(f"- **Completed Tasks:** {coordinator.get('completed_tasks')}")
+    else:
+        lines.append("_No coordinator state._")
+
+    summary_path = output_root / "context" / "STATE_SUMMARY.md"
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    summary_path.write_text("\n".join(lines) + "\n")
+    written.append(summary_path)
+
+    return written
+
+
+# ─── CLI ────────────────────────────────────────────────────────────
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NSO State Store (SQLite backend)")
+    parser.add_argument("--db", help=f"Database path (default: ${STATE_DB_ENV} or {DEFAULT_DB_PATH})")
+    sub = parser.add_subparsers(dest="command")
+
+    export_p = sub.add_parser("export", help="Regenerate human-readable markdown from the database")
+    export_p.add_argument("--output-root", default=".opencode", help="Root to write markdown under")
+
+    dump_p = sub.add_parser("dump", help="Print records as JSON")
+    dump_p.add_argument("--namespace", help="Only this namespace")
+    dump_p.add_argument("--status", help="Only records with this status")
+
+    args = parser.parse_args()
+    if args.command is None:
+        parser.print_help()
+        sys.exit(0)
+
+    store = open_state_store("sqlite", Path(args.db) if args.db else None)
+    assert store is not None
+
+    if args.command == "export":
+        for path in export_markdown(store, Path(args.output_root)):
+            print(f"Wrote {path}")
+    elif args.command == "dump":
+        namespaces = [args.namespace] if args.namespace else store.namespaces()  # type: ignore[attr-defined]
+        print(json.dumps({ns: store.query(ns, status=args.status) for ns in namespaces}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
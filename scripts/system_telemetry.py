@@ -13,6 +13,9 @@ import time
 import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from file_lock import atomic_write_json, file_lock
+
 
 def main():
     parser = argparse.ArgumentParser(description="NSO System Telemetry")
@@ -47,56 +50,58 @@ def main():
         log_file = project_root / ".opencode" / "logs" / "system_telemetry.json"
         log_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # Load existing telemetry
-        telemetry = {}
-        if log_file.exists():
-            try:
-                telemetry = json.loads(log_file.read_text())
-            except (json.JSONDecodeError, IOError):
-                telemetry = {}
-
-        if "scripts" not in telemetry:
-            telemetry["scripts"] = {}
-
-        if script_name not in telemetry["scripts"]:
-            telemetry["scripts"][script_name] = {
-                "count": 0,
-                "total_duration": 0,
-                "max_duration": 0,
-                "min_duration": float('inf'),
-                "last_duration": 0,
-                "failures": 0
-            }
-
-        stats = telemetry["scripts"][script_name]
-        stats["count"] += 1
-        stats["total_duration"] += duration
-        stats["max_duration"] = max(stats["max_duration"], duration)
-        stats["min_duration"] = min(stats["min_duration"], duration)
-        stats["last_duration"] = duration
-        stats["avg_duration"] = stats["total_duration"] / stats["count"]
-
-        if status != "success":
-            stats["failures"] += 1
-
-        # Global stats
-        telemetry["total_calls"] = telemetry.get("total_calls", 0) + 1
-        telemetry["last_update"] = time.time()
-
-        # Loop Detection (Rate Limiting)
-        current_time = time.time()
-        if "recent_calls" not in stats:
-            stats["recent_calls"] = []
-
-        # Keep only calls from last 2 seconds
-        stats["recent_calls"] = [t for t in stats["recent_calls"] if current_time - t < 2.0]
-        stats["recent_calls"].append(current_time)
-
-        # Write telemetry (strip recent_calls from persisted data to keep file clean)
-        persist = json.loads(json.dumps(telemetry))
-        for s in persist.get("scripts", {}).values():
-            s.pop("recent_calls", None)
-        log_file.write_text(json.dumps(persist, indent=2))
+        # Read-modify-write under the telemetry lock so concurrent hooks don't drop counts
+        with file_lock(log_file):
+            # Load existing telemetry
+            telemetry = {}
+            if log_file.exists():
+                try:
+                    telemetry = json.loads(log_file.read_text())
+                except (json.JSONDecodeError, IOError):
+                    telemetry = {}
+
+            if "scripts" not in telemetry:
+                telemetry["scripts"] = {}
+
+            if script_name not in telemetry["scripts"]:
+                telemetry["scripts"][script_name] = {
+                    "count": 0,
+                    "total_duration": 0,
+                    "max_duration": 0,
+                    "min_duration": float('inf'),
+                    "last_duration": 0,
+                    "failures": 0
+                }
+
+            stats = telemetry["scripts"][script_name]
+            stats["count"] += 1
+            stats["total_duration"] += duration
+            stats["max_duration"] = max(stats["max_duration"], duration)
+            stats["min_duration"] = min(stats["min_duration"], duration)
+            stats["last_duration"] = duration
+            stats["avg_duration"] = stats["total_duration"] / stats["count"]
+
+            if status != "success":
+                stats["failures"] += 1
+
+            # Global stats
+            telemetry["total_calls"] = telemetry.get("total_calls", 0) + 1
+            telemetry["last_update"] = time.time()
+
+            # Loop Detection (Rate Limiting)
+            current_time = time.time()
+            if "recent_calls" not in stats:
+                stats["recent_calls"] = []
+
+            # Keep only calls from last 2 seconds
+            stats["recent_calls"] = [t for t in stats["recent_calls"] if current_time - t < 2.0]
+            stats["recent_calls"].append(current_time)
+
+            # Write telemetry (strip recent_calls from persisted data to keep file clean)
+            persist = json.loads(json.dumps(telemetry))
+            for s in persist.get("scripts", {}).values():
+                s.pop("recent_calls", None)
+            atomic_write_json(log_file, persist)
 
         if len(stats["recent_calls"]) > 10:
             sys.stderr.write(f"🚨 [LOOP DETECTED] {script_name} called {len(stats['recent_calls'])} times in 2s!\n")
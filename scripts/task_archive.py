@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+NSO Task Archive — Compressed, Randomly Readable Task Context Archives
+
+A finished task context is dozens of small markdown/JSON files, each an
+inode that every directory scan walks past. In archive mode a completed
+task is packed into a single compressed tar next to a small JSON index:
+
+    archive/<task_id>.tar.zst        (zstd when `zstandard` is installed)
+    archive/<task_id>.tar.gz         (gzip otherwise)
+    archive/<task_id>.tar.*.idx.json member name -> frame offset/length
+
+Every tar member is compressed as its own frame. Concatenated gzip
+members and concatenated zstd frames are both valid streams, so the
+archive is an ordinary .tar.gz / .tar.zst for `tar` — but with the index
+a single file can be read by decompressing only its own frame.
+
+Usage:
+    from task_archive import pack, TaskArchive
+
+    path = pack(".opencode/context/tasks/task_x", ".opencode/context/archive", "task_x")
+    TaskArchive(path).read_text("01_memory/progress_task_x.md")
+
+    python3 task_archive.py --list .opencode/context/archive/task_x.tar.gz
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is always available
+    zstandard = None
+
+
+INDEX_SUFFIX = ".idx.json"
+INDEX_VERSION = 1
+BLOCK_SIZE = tarfile.BLOCKSIZE
+
+
+# ─── Codecs ─────────────────────────────────────────────────────────
+
+def _gzip_compress(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+CODECS: dict[str, tuple[str, Any, Any]] = {
+    "gzip": (".tar.gz", _gzip_compress, gzip.decompress),
+}
+if zstandard is not None:
+    CODECS["zstd"] = (
+        ".tar.zst",
+        lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+        lambda frame: zstandard.ZstdDecompressor().decompress(frame),
+    )
+
+DEFAULT_CODEC = "zstd" if "zstd" in CODECS else "gzip"
+
+
+def index_path(archive_path: str | Path) -> str:
+    """Path of the JSON index that belongs to an archive."""
+    return f"{archive_path}{INDEX_SUFFIX}"
+
+
+# ─── Packing ────────────────────────────────────────────────────────
+
+def _member_frame(info: tarfile.TarInfo, data: bytes = b"") -> tuple[bytes, int]:
+    """Tar header + data + padding for one member; returns (block, header length)."""
+    header = info.tobuf(format=tarfile.PAX_FORMAT)
+    padding = -len(data) % BLOCK_SIZE
+    return header + data + b"\0" * padding, len(header)
+
+
+def pack(src_dir: str | Path, dest_dir: str | Path, name: str,
+         codec: Optional[str] = None, metadata: Optional[dict] = None) -> str:
+    """
+    Pack a directory into `<dest_dir>/<name>.tar.<ext>` plus its index.
+
+    Args:
+        src_dir: Directory to archive (member names are relative to it).
+        dest_dir: Directory the archive is written to.
+        name: Archive base name (normally the task ID).
+        codec: 'zstd' or 'gzip' (default: zstd if available).
+        metadata: Stored in the index, so listing archives never opens them.
+
+    Returns:
+        Path of the archive. Both files are written under temporary names
+        and renamed into place, the index last: an archive without an
+        index is incomplete.
+    """
+    codec = codec or DEFAULT_CODEC
+    if codec not in CODECS:
+        raise ValueError(f"Unknown archive codec: {codec} (available: {', '.join(CODECS)})")
+    ext, compress, _ = CODECS[codec]
+
+    src_dir = Path(src_dir)
+    os.makedirs(dest_dir, exist_ok=True)
+    archive_path = os.path.join(dest_dir, f"{name}{ext}")
+
+    members: dict[str, dict[str, Any]] = {}
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            offset = 0
+            for root, dirs, files in os.walk(src_dir):
+                dirs.sort()
+                rel_root = os.path.relpath(root, src_dir)
+                for entry in [None] + sorted(files):
+                    if entry is None:
+                        if rel_root == ".":
+                            continue
+                        path, rel = root, rel_root
+                    else:
+                        path = os.path.join(root, entry)
+                        rel = entry if rel_root == "." else os.path.join(rel_root, entry)
+                    rel = rel.replace(os.sep, "/")
+
+                    st = os.stat(path)
+                    info = tarfile.TarInfo(rel)
+                    info.mtime = int(st.st_mtime)
+                    if entry is None:
+                        info.type, info.mode = tarfile.DIRTYPE, 0o755
+                        data = b""
+                    else:
+                        with open(path, "rb") as f:
+                            data = f.read()
+                        info.size, info.mode = len(data), st.st_mode & 0o777 | 0o200
+
+                    block, header_len = _member_frame(info, data)
+                    frame = compress(block)
+                    out.write(frame)
+                    members[rel] = {
+                        "offset": offset,
+                        "length": len(frame),
+                        "header": header_len,
+                        "size": info.size,
+                        "mtime": info.mtime,
+                        "dir": entry is None,
+                    }
+                    offset += len(frame)
+
+            # End-of-archive marker: two zero blocks
+            out.write(compress(b"\0" * BLOCK_SIZE * 2))
+        os.replace(tmp_path, archive_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    index = {
+        "version": INDEX_VERSION,
+        "codec": codec,
+        "name": name,
+        "metadata": metadata or {},
+        "members": members,
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp_path, index_path(archive_path))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return archive_path
+
+
+# ─── Reading ────────────────────────────────────────────────────────
+
+class TaskArchive:
+    """Random access to the members of a packed task context."""
+
+    def __init__(self, archive_path: str | Path):
+        self.path = str(archive_path)
+        with open(index_path(self.path), "r") as f:
+            self.index = json.load(f)
+        codec = self.index.get("codec")
+        if codec not in CODECS:
+            raise ValueError(f"Archive {self.path} uses codec '{codec}', which is not available")
+        self._decompress = CODECS[codec][2]
+
+    @property
+    def metadata(self) -> dict:
+        return self.index.get("metadata", {})
+
+    def names(self) -> list[str]:
+        """File members, in archive order."""
+        return [name for name, m in self.index["members"].items() if not m["dir"]]
+
+    def __contains__(self, name: str) -> bool:
+        member = self.index["members"].get(name)
+        return bool(member) and not member["dir"]
+
+    def read(self, name: str) -> bytes:
+        """Read one member, decompressing only its frame. Raises KeyError if missing."""
+        member = self.index["members"].get(name)
+        if member is None or member["dir"]:
+            raise KeyError(name)
+        with open(self.path, "rb") as f:
+            f.seek(member["offset"])
+            block = self._decompress(f.read(member["length"]))
+        start = member["header"]
+        return block[start:start + member["size"]]
+
+    def read_text(self, name: str, encoding: str = "utf-8") -> str:
+        return self.read(name).decode(encoding)
+
+    def extract(self, dest: str | Path) -> None:
+        """Unpack every member below `dest`."""
+        dest = Path(dest)
+        for name, member in self.index["members"].items():
+            target = dest / name
+            if os.path.isabs(name) or ".." in Path(name).parts:
+                raise ValueError(f"Refusing to extract unsafe member: {name}")
+            if member["dir"]:
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(self.read(name))
+            os.utime(target, (member["mtime"], member["mtime"]))
+
+
+def iter_archives(archive_dir: str | Path) -> Iterator[dict]:
+    """Yield the index of every complete archive in a directory (members omitted)."""
+    try:
+        entries = sorted(os.listdir(archive_dir))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if not entry.endswith(INDEX_SUFFIX) or entry.startswith("."):
+            continue
+        try:
+            with open(os.path.join(archive_dir, entry), "r") as f:
+                index = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            continue
+        index.pop("members", None)
+        index["archive_path"] = os.path.join(archive_dir, entry[:-len(INDEX_SUFFIX)])
+        yield index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NSO task context archives")
+    parser.add_argument("--pack", metavar="DIR", help="Directory to archive")
+    parser.add_argument("--out", default=".opencode/context/archive", help="Archive directory for --pack")
+    parser.add_argument("--codec", choices=sorted(CODECS), help=f"Compression (default: {DEFAULT_CODEC})")
+    parser.add_argument("--list", metavar="ARCHIVE", help="List archive members")
+    parser.add_argument("--cat", nargs=2, metavar=("ARCHIVE", "MEMBER"), help="Print one member")
+    parser.add_argument("--extract", nargs=2, metavar=("ARCHIVE", "DEST"), help="Unpack an archive")
+    args = parser.parse_args()
+
+    if args.pack:
+        path = pack(args.pack, args.out, Path(args.pack).name, args.codec)
+        print(f"Archived {args.pack} -> {path}")
+    elif args.list:
+        archive = TaskArchive(args.list)
+        for name in archive.names():
+            print(f"{archive.index['members'][name]['size']:>10}  {name}")
+    elif args.cat:
+        sys.stdout.buffer.write(TaskArchive(args.cat[0]).read(args.cat[1]))
+    elif args.extract:
+        TaskArchive(args.extract[0]).extract(args.extract[1])
+        print(f"Extracted {args.extract[0]} -> {args.extract[1]}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,70 @@ Creates isolated context folders for parallel task execution
 import os
 import shutil
 import json
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import yaml
 
+sys.path.insert(0, str(Path(__file__).parent))
+from file_lock import atomic_write_json, file_lock
+from task_archive import TaskArchive, index_path, iter_archives, pack as pack_archive
+from task_gc import TRASH_DIR, DEFAULT_OPS_PER_SECOND, get_collector, select_candidates
+from task_index import TaskIndex
+import task_id_codec
+from state_store import open_state_store, StoreTaskIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# Prebuilt tree every task context is materialized from (under the global dir)
+TEMPLATE_DIR = '.task_template'
+TEMPLATE_STAMP = '.stamp'
+TEMPLATE_VERSION = 1
+BASE_TEMPLATES = ('tech-stack.md', 'patterns.md', 'glossary.md')
+
+# Memory files created on first use, named {kind}_{task_id}.md
+MEMORY_FILES = ('active_context', 'progress', 'patterns')
+
+FICLONE = 0x40049409  # Linux ioctl: reflink a whole file (btrfs, xfs, ...)
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except IOError:
+        return None
+
+
+def _reflink_or_copy(src: str, dst: str):
+    """
+    Reflink src to dst, else copy it, keeping its mode; an existing dst is kept
+    
+    Never a hardlink: a read-only mode does not stop an agent from chmod-ing
+    and editing its copy, which would change the file in every other task.
+    A reflink shares blocks only until one side is written.
+    """
+    if os.path.lexists(dst):
+        return
+    
+    cloned = False
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as s, open(dst, 'wb') as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            cloned = True
+        except OSError:
+            pass
+    
+    if not cloned:
+        shutil.copyfile(src, dst)
+    shutil.copymode(src, dst)
+
 
 class TaskScopedContextManager:
     """Manages isolated context folders for parallel tasks"""
@@ -30,6 +89,24 @@ class TaskScopedContextManager:
         
         # Initialize directories
         self._ensure_directories()
+
+        # Task index: one file listing every task context (see task_index.py),
+        # or the 'task_context' namespace when the SQLite state store is enabled
+        tasks_dir = self.config.get('directories', {}).get('tasks', 'tasks')
+        self.index_path = os.path.join(self.base_path, f"{tasks_dir}_index.json")
+        store = open_state_store()
+        if store:
+            self.index = StoreTaskIndex(store, 'task_context')
+        else:
+            self.index = TaskIndex(self.index_path, rebuild=self._scan_task_metadata)
+        
+        # Deleted contexts are renamed into the trash and removed in the background
+        gc_rate = self.config.get('cleanup', {}).get('gc_max_ops_per_second', DEFAULT_OPS_PER_SECOND)
+        self.gc = get_collector(os.path.join(self.base_path, TRASH_DIR), gc_rate)
+        
+        # Archived (packed) task contexts, see task_archive.py
+        self.archive_path = os.path.join(
+            self.base_path, self.config.get('directories', {}).get('archive', 'archive'))
         
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file"""
@@ -67,6 +144,11 @@ class TaskScopedContextManager:
         """
         Create isolated context folder for task
         
+        Directories, READMEs and read-only copies of the global templates are
+        reflinked (or copied) from a prebuilt template tree, so this costs one
+        mkdir per directory and one small copy per file; each task owns its
+        files. Memory files are written on first use (see get_memory_file).
+        
         Args:
             task_id: Unique task ID
             workflow_type: Type of workflow (optional)
@@ -81,108 +163,187 @@ class TaskScopedContextManager:
         # Create task context path
         task_context_path = os.path.join(self.base_path, tasks_dir, task_id)
         
-        # Create directory structure
-        self._create_task_directory_structure(task_context_path, task_id, workflow_type)
-        
-        # Copy base templates (READ-ONLY)
-        self._copy_base_templates(task_context_path, task_id)
-        
-        # Create task-specific memory files
-        self._create_task_memory_files(task_context_path, task_id, workflow_type)
+        # Materialize directory structure and base templates (READ-ONLY)
+        try:
+            self._materialize_template(self._ensure_template(), task_context_path)
+        except FileNotFoundError:
+            # Template tree was swapped out by a concurrent rebuild; links already made are kept
+            self._materialize_template(self._ensure_template(), task_context_path)
         
         # Create task metadata
         self._create_task_metadata(task_context_path, task_id, workflow_type)
         
         return task_context_path
     
-    def _create_task_directory_structure(self, task_path: str, task_id: str, 
-                                        workflow_type: str = None):
-        """Create directory structure for task"""
+    def _template_dirs(self) -> List[str]:
+        """Subdirectories every task context gets"""
         directories = self.config.get('directories', {})
-        
-        # List of directories to create
-        dirs_to_create = [
-            task_path,
-            os.path.join(task_path, directories.get('memory', '01_memory')),
-            os.path.join(task_path, directories.get('requirements', 'requirements')),
-            os.path.join(task_path, directories.get('workspace', 'workspace')),
-            os.path.join(task_path, directories.get('artifacts', 'artifacts')),
-            os.path.join(task_path, 'status'),
-            os.path.join(task_path, 'checkpoints'),
-            os.path.join(task_path, 'logs')
+        return [
+            directories.get('memory', '01_memory'),
+            directories.get('requirements', 'requirements'),
+            directories.get('workspace', 'workspace'),
+            directories.get('artifacts', 'artifacts'),
+            'status',
+            'checkpoints',
+            'logs'
         ]
+    
+    def _template_signature(self, global_path: str) -> str:
+        """Changes whenever the template tree has to be rebuilt"""
+        parts = [str(TEMPLATE_VERSION)] + self._template_dirs()
+        for name in BASE_TEMPLATES:
+            try:
+                stat = os.stat(os.path.join(global_path, name))
+                parts.append(f"{name}:{stat.st_mtime_ns}:{stat.st_size}")
+            except FileNotFoundError:
+                parts.append(f"{name}:-")
+        return '|'.join(parts)
+    
+    def _ensure_template(self) -> str:
+        """Return the prebuilt template tree, (re)building it if it is missing or stale"""
+        directories = self.config.get('directories', {})
+        global_path = os.path.join(self.base_path, directories.get('global', '00_meta'))
+        template_path = os.path.join(global_path, TEMPLATE_DIR)
+        stamp_path = os.path.join(template_path, TEMPLATE_STAMP)
+        signature = self._template_signature(global_path)
         
-        for directory in dirs_to_create:
-            os.makedirs(directory, exist_ok=True)
+        if _read_text(stamp_path) == signature:
+            return template_path
+        
+        with file_lock(template_path):
+            if _read_text(stamp_path) == signature:
+                return template_path
             
-        # Create README in each directory
-        for directory in dirs_to_create[1:]:  # Skip base task_path
-            readme_path = os.path.join(directory, 'README.md')
-            if not os.path.exists(readme_path):
-                with open(readme_path, 'w') as f:
-                    f.write(f"""# Directory: {os.path.basename(directory)}
-
-## Task: {task_id}
-## Created: {datetime.now().isoformat()}
+            # Build next to the live tree, then swap it in
+            build_path = f"{template_path}.{os.getpid()}.build"
+            shutil.rmtree(build_path, ignore_errors=True)
+            self._build_template(build_path, global_path)
+            with open(os.path.join(build_path, TEMPLATE_STAMP), 'w') as f:
+                f.write(signature)
+            
+            if os.path.exists(template_path):
+                old_path = f"{template_path}.{os.getpid()}.old"
+                os.rename(template_path, old_path)
+                os.rename(build_path, template_path)
+                shutil.rmtree(old_path, ignore_errors=True)
+            else:
+                os.rename(build_path, template_path)
+        
+        return template_path
+    
+    def _build_template(self, template_path: str, global_path: str):
+        """Write the template tree: directory READMEs and read-only global template copies"""
+        for directory in self._template_dirs():
+            directory_path = os.path.join(template_path, directory)
+            os.makedirs(directory_path, exist_ok=True)
+            
+            # Create README in each directory
+            readme_path = os.path.join(directory_path, 'README.md')
+            with open(readme_path, 'w') as f:
+                f.write(f"""# Directory: {directory}
 
 ## Purpose
-This directory is part of the isolated context for task {task_id}.
+This directory is part of the isolated context of one task. The task ID
+is the name of the task context directory (see `<task_id>_metadata.json`).
 
 ## Isolation Rules
-- Only files related to task {task_id} should be here
-- All files should be prefixed with `{task_id}_`
+- Only files related to this task should be here
+- All files should be prefixed with `<task_id>_`
 - Do not modify files from other tasks
 """)
-    
-    def _copy_base_templates(self, task_path: str, task_id: str):
-        """Copy read-only base templates to task context"""
-        directories = self.config.get('directories', {})
-        global_dir = directories.get('global', '00_meta')
-        global_path = os.path.join(self.base_path, global_dir)
+            os.chmod(readme_path, 0o444)
         
-        if not os.path.exists(global_path):
-            return
-            
         # Files to copy as read-only templates
-        templates_to_copy = [
-            ('tech-stack.md', 'tech-stack.md'),
-            ('patterns.md', 'patterns.md'),
-            ('glossary.md', 'glossary.md')
-        ]
-        
-        for source_file, dest_file in templates_to_copy:
-            source_path = os.path.join(global_path, source_file)
-            dest_path = os.path.join(task_path, dest_file)
+        for name in BASE_TEMPLATES:
+            source_path = os.path.join(global_path, name)
+            if not os.path.exists(source_path):
+                continue
             
-            if os.path.exists(source_path):
-                with open(source_path, 'r') as src:
-                    content = src.read()
-                    
-                # Add isolation header
-                isolated_content = f"""<!-- COPIED FROM GLOBAL CONTEXT - READ ONLY -->
-<!-- Task: {task_id} | Copied: {datetime.now().isoformat()} -->
+            with open(source_path, 'r') as src:
+                content = src.read()
+            
+            # Add isolation header
+            dest_path = os.path.join(template_path, name)
+            with open(dest_path, 'w') as dst:
+                dst.write(f"""<!-- COPIED FROM GLOBAL CONTEXT - READ ONLY -->
+<!-- Source: {name} | Copied: {datetime.now().isoformat()} -->
 <!-- DO NOT MODIFY - This is a read-only copy from global context -->
 
 {content}
-"""
-                
-                with open(dest_path, 'w') as dst:
-                    dst.write(isolated_content)
+""")
+            os.chmod(dest_path, 0o444)
     
-    def _create_task_memory_files(self, task_path: str, task_id: str, 
-                                 workflow_type: str = None):
-        """Create task-specific memory files"""
-        directories = self.config.get('directories', {})
-        memory_dir = directories.get('memory', '01_memory')
-        memory_path = os.path.join(task_path, memory_dir)
+    def _materialize_template(self, template_path: str, task_path: str):
+        """Recreate the template tree under task_path, reflinking or copying every file"""
+        for root, dirs, files in os.walk(template_path):
+            rel_root = os.path.relpath(root, template_path)
+            dest_root = task_path if rel_root == '.' else os.path.join(task_path, rel_root)
+            os.makedirs(dest_root, exist_ok=True)
+            
+            for name in files:
+                if name != TEMPLATE_STAMP:
+                    _reflink_or_copy(os.path.join(root, name), os.path.join(dest_root, name))
+    
+    def get_memory_file(self, task_id: str, kind: str) -> Optional[str]:
+        """
+        Get path to a task memory file, writing its initial content on first use
+        
+        Args:
+            task_id: Task ID
+            kind: One of 'active_context', 'progress', 'patterns'
+            
+        Returns:
+            Path to the memory file, or None if the task does not exist
+        """
+        if kind not in MEMORY_FILES:
+            raise ValueError(f"Unknown memory file: {kind}")
+        
+        task_path = self.get_task_context(task_id)
+        if not task_path:
+            return None
+        
+        memory_dir = self.config.get('directories', {}).get('memory', '01_memory')
+        memory_path = os.path.join(task_path, memory_dir, f"{kind}_{task_id}.md")
+        if os.path.exists(memory_path):
+            return memory_path
+        
+        metadata = {}
+        try:
+            with open(os.path.join(task_path, f"{task_id}_metadata.json"), 'r') as f:
+                metadata = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            pass
+        content = self._render_memory_file(kind, task_path, task_id,
+                                           metadata.get('workflow_type'),
+                                           metadata.get('created_at'))
+        
+        # Write aside and link into place: concurrent first uses never clobber each other
+        os.makedirs(os.path.dirname(memory_path), exist_ok=True)
+        tmp_path = f"{memory_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        try:
+            os.link(tmp_path, memory_path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp_path)
+        
+        return memory_path
+    
+    def _render_memory_file(self, kind: str, task_path: str, task_id: str,
+                            workflow_type: str = None, created: str = None) -> str:
+        """Initial content of a task memory file"""
+        created = created or datetime.now().isoformat()
         
         # Active Context
-        active_context = f"""# Active Context - Task {task_id}
+        if kind == 'active_context':
+            return f"""# Active Context - Task {task_id}
 
 ## Task Identification
 - **Task ID:** {task_id}
 - **Workflow:** {workflow_type or 'Unknown'}
-- **Created:** {datetime.now().isoformat()}
+- **Created:** {created}
 - **Status:** INITIALIZED
 
 ## Task Scope
@@ -213,23 +374,24 @@ All files must follow this pattern:
 - Results: `{task_path}/artifacts/{task_id}_results.json`
 - Logs: `{task_path}/logs/{task_id}_log.txt`
 """
-
-        active_context_path = os.path.join(memory_path, f"active_context_{task_id}.md")
-        with open(active_context_path, 'w') as f:
-            f.write(active_context)
         
         # Progress File
-        progress_content = f"""# Progress - Task {task_id}
+        if kind == 'progress':
+            return f"""# Progress - Task {task_id}
 
 ## Task Information
 - **Task ID:** {task_id}
 - **Workflow:** {workflow_type or 'Unknown'}
-- **Created:** {datetime.now().isoformat()}
+- **Created:** {created}
 
 ## Status Timeline
+The task's status is what `set_task_status` recorded
+(`task_context_manager.py --set-status {task_id} <status>`); this timeline
+is a log for readers and is not parsed.
+
 | Timestamp | Status | Details |
 |-----------|--------|---------|
-| {datetime.now().isoformat()} | INITIALIZED | Task context created |
+| {created} | INITIALIZED | Task context created |
 
 ## Current Milestones
 - [ ] Task context initialized
@@ -247,13 +409,9 @@ All files must follow this pattern:
 ## Notes
 This file tracks progress for task {task_id} only.
 """
-
-        progress_path = os.path.join(memory_path, f"progress_{task_id}.md")
-        with open(progress_path, 'w') as f:
-            f.write(progress_content)
         
         # Patterns File
-        patterns_content = f"""# Patterns - Task {task_id}
+        return f"""# Patterns - Task {task_id}
 
 ## Task-Specific Patterns
 
@@ -278,10 +436,6 @@ This file tracks progress for task {task_id} only.
 3. **Contamination Check**: Regular scanning for non-prefixed files
 4. **Error Handling**: Stop immediately on contamination detection
 """
-
-        patterns_path = os.path.join(memory_path, f"patterns_{task_id}.md")
-        with open(patterns_path, 'w') as f:
-            f.write(patterns_content)
     
     def _create_task_metadata(self, task_path: str, task_id: str, 
                              workflow_type: str = None):
@@ -306,6 +460,8 @@ This file tracks progress for task {task_id} only.
         metadata_path = os.path.join(task_path, f"{task_id}_metadata.json")
         with open(metadata_path, 'w') as f:
             json.dump(metadata, f, indent=2)
+
+        self.index.upsert(status='initialized', **metadata)
     
     def get_task_context(self, task_id: str) -> Optional[str]:
         """
@@ -323,16 +479,60 @@ This file tracks progress for task {task_id} only.
         
         return task_path if os.path.exists(task_path) else None
     
-    def list_tasks(self, status_filter: str = None) -> List[Dict[str, Any]]:
+    def list_tasks(self, status_filter: str = None,
+                   sort_by: str = 'created_at') -> List[Dict[str, Any]]:
         """
-        List all tasks
+        List all tasks from the task index
+        
+        A task's status is the one last recorded by set_task_status; edits
+        to its progress file do not change it.
         
         Args:
             status_filter: Filter by status (initialized, running, completed, failed)
+            sort_by: Metadata field to sort on (default: creation date)
             
         Returns:
             List of task metadata
         """
+        return self.index.query(status=status_filter, sort_by=sort_by)
+
+    def set_task_status(self, task_id: str, status: str) -> bool:
+        """
+        Record a task's status: the single source of truth for listing,
+        filtering and cleanup
+        
+        The status is also written to the task's metadata file, so an index
+        rebuild keeps it.
+        
+        Args:
+            task_id: Task ID
+            status: New status (initialized, running, completed, failed)
+            
+        Returns:
+            True if the task is known, False otherwise
+        """
+        if self.index.get(task_id) is None:
+            return False
+        updated_at = datetime.now().isoformat()
+        
+        # The index lock also serializes the metadata write (no lock file inside the task)
+        with file_lock(self.index_path):
+            self.index.upsert(task_id, status=status, updated_at=updated_at)
+            
+            task_path = self.get_task_context(task_id)
+            metadata_path = os.path.join(task_path, f"{task_id}_metadata.json") if task_path else None
+            if metadata_path and os.path.exists(metadata_path):
+                try:
+                    with open(metadata_path, 'r') as f:
+                        metadata = json.load(f)
+                except (json.JSONDecodeError, IOError):
+                    return True
+                metadata.update(status=status, updated_at=updated_at)
+                atomic_write_json(metadata_path, metadata)
+        return True
+
+    def _scan_task_metadata(self) -> List[Dict[str, Any]]:
+        """Read metadata from every task directory (used to rebuild the index)"""
         directories = self.config.get('directories', {})
         tasks_dir = directories.get('tasks', 'tasks')
         tasks_path = os.path.join(self.base_path, tasks_dir)
@@ -340,31 +540,46 @@ This file tracks progress for task {task_id} only.
         if not os.path.exists(tasks_path):
             return []
         
+        task_ids = [name for name in os.listdir(tasks_path)
+                    if os.path.isdir(os.path.join(tasks_path, name))]
+        # Directories without metadata are still listed if their name is a task ID
+        parsed_ids = task_id_codec.parse_many(task_ids)
+        
         tasks = []
-        for task_id in os.listdir(tasks_path):
+        for task_id in task_ids:
             task_path = os.path.join(tasks_path, task_id)
             
-            # Check if it's a directory (not a file)
-            if not os.path.isdir(task_path):
-                continue
-            
             # Try to load metadata
             metadata_path = os.path.join(task_path, f"{task_id}_metadata.json")
             if os.path.exists(metadata_path):
                 try:
                     with open(metadata_path, 'r') as f:
                         metadata = json.load(f)
-                        
-                    # Apply filter if specified
-                    if status_filter:
-                        task_status = self._get_task_status(task_path, task_id)
-                        if task_status != status_filter:
-                            continue
-                    
-                    tasks.append(metadata)
                 except (json.JSONDecodeError, IOError):
                     # Skip if metadata can't be read
                     continue
+            elif task_id in parsed_ids:
+                parsed = parsed_ids[task_id]
+                metadata = {
+                    'task_id': task_id,
+                    'workflow_type': parsed['workflow_type'].upper(),
+                    'created_at': datetime.strptime(
+                        parsed['timestamp'], task_id_codec.TIMESTAMP_FORMAT).isoformat(),
+                    'context_path': task_path,
+                }
+            else:
+                continue
+            if 'status' not in metadata:
+                # Recorded by set_task_status; tasks that never had one fall back to the progress file
+                metadata['status'] = self._get_task_status(task_path, task_id)
+            tasks.append(metadata)
+        
+        # Archived tasks keep their metadata in the archive index
+        listed = set(task_ids)
+        for archive in iter_archives(self.archive_path):
+            if archive['name'] not in listed:
+                tasks.append({**archive['metadata'], 'task_id': archive['name'],
+                              'archive_path': archive['archive_path']})
         
         return tasks
     
@@ -372,8 +587,9 @@ This file tracks progress for task {task_id} only.
         """Get task status from progress file"""
         progress_path = os.path.join(task_path, '01_memory', f'progress_{task_id}.md')
         
+        # Memory files are written on first use; no progress file yet means just created
         if not os.path.exists(progress_path):
-            return 'unknown'
+            return 'initialized'
         
         try:
             with open(progress_path, 'r') as f:
@@ -407,46 +623,27 @@ This file tracks progress for task {task_id} only.
         cleanup_config = self.config.get('cleanup', {})
         max_age = max_age_days or cleanup_config.get('keep_completed_tasks', 7)
         keep_min = keep_min_tasks or 10
-        
-        # Get all tasks
-        all_tasks = self.list_tasks()
-        
-        # Sort by creation date
-        all_tasks.sort(key=lambda x: x.get('created_at', ''))
-        
-        # Identify tasks to cleanup
-        tasks_to_cleanup = []
-        current_time = datetime.now()
-        
-        for task in all_tasks:
-            task_id = task.get('task_id')
-            created_at_str = task.get('created_at')
-            
-            if not task_id or not created_at_str:
-                continue
-            
-            try:
-                created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                age_days = (current_time - created_at).days
-                
-                # Check if should be cleaned up
-                if age_days > max_age:
-                    tasks_to_cleanup.append(task_id)
-            except ValueError:
-                # Skip if date can't be parsed
-                continue
-        
-        # Ensure we keep minimum number of tasks
-        if len(all_tasks) - len(tasks_to_cleanup) < keep_min:
-            # Keep more recent tasks
-            tasks_to_keep = all_tasks[-keep_min:]
-            tasks_to_cleanup = [t.get('task_id') for t in all_tasks 
-                              if t not in tasks_to_keep]
-        
-        # Perform cleanup
+        archive_mode = cleanup_config.get('mode', 'delete') == 'archive'
+        
+        # Candidates come from the task index (sorted by creation date);
+        # tasks that are already archived are left alone
+        tasks = [t for t in self.list_tasks() if not t.get('archive_path')]
+        tasks_to_cleanup = select_candidates(
+            tasks,
+            retention_days={'*': max_age},
+            keep_min=keep_min,
+            time_field='created_at'
+        )
+        
+        # Perform cleanup: in archive mode completed tasks are packed, not deleted
+        statuses = {t['task_id']: t.get('status') for t in tasks}
         cleaned_up = []
         for task_id in tasks_to_cleanup:
-            if self.delete_task_context(task_id):
+            if archive_mode and statuses.get(task_id) == 'completed':
+                done = self.archive_task_context(task_id) is not None
+            else:
+                done = self.delete_task_context(task_id)
+            if done:
                 cleaned_up.append(task_id)
         
         return cleaned_up
@@ -462,15 +659,72 @@ This file tracks progress for task {task_id} only.
             True if deleted, False otherwise
         """
         task_path = self.get_task_context(task_id)
+        archive_path = (self.index.get(task_id) or {}).get('archive_path')
+        
+        if task_path:
+            # Rename into the trash (instant); the GC worker deletes it in the background
+            if not self.gc.trash(task_path):
+                return False
+        elif archive_path and os.path.exists(archive_path):
+            self.gc.trash(index_path(archive_path))
+            self.gc.trash(archive_path)
+        else:
+            return False
+
+        self.index.remove(task_id)
+        self.gc.start()
+        return True
+    
+    def archive_task_context(self, task_id: str, codec: str = None) -> Optional[str]:
+        """
+        Pack a task context into a compressed archive and remove the directory
+        
+        Args:
+            task_id: Task ID to archive
+            codec: 'zstd' or 'gzip' (from config, else zstd if available)
+            
+        Returns:
+            Path to the archive, or None if the task has no context directory
+        """
+        task_path = self.get_task_context(task_id)
         
         if not task_path:
-            return False
+            return None
+        
+        codec = codec or self.config.get('cleanup', {}).get('archive_codec')
+        metadata = {k: v for k, v in (self.index.get(task_id) or {}).items()
+                    if k != 'archive_path'}
+        metadata['archived_at'] = datetime.now().isoformat()
+        archive_path = pack_archive(task_path, self.archive_path, task_id, codec, metadata)
+        
+        self.gc.trash(task_path)
+        self.index.upsert(task_id, archive_path=archive_path,
+                          archived_at=metadata['archived_at'])
+        self.gc.start()
+        return archive_path
+    
+    def read_task_file(self, task_id: str, relative_path: str) -> Optional[str]:
+        """
+        Read a file from a task context, whether it is on disk or archived
         
+        Args:
+            task_id: Task ID
+            relative_path: Path inside the task context (e.g. '01_memory/progress_<id>.md')
+            
+        Returns:
+            File content, or None if the task or file does not exist
+        """
+        task_path = self.get_task_context(task_id)
+        if task_path:
+            return _read_text(os.path.join(task_path, relative_path))
+        
+        archive_path = (self.index.get(task_id) or {}).get('archive_path')
+        if not archive_path or not os.path.exists(archive_path):
+            return None
         try:
-            shutil.rmtree(task_path)
-            return True
-        except (OSError, IOError):
-            return False
+            return TaskArchive(archive_path).read_text(relative_path.replace(os.sep, '/'))
+        except KeyError:
+            return None
 
 
 # Command-line interface
@@ -482,10 +736,15 @@ if __name__ == "__main__":
     parser.add_argument('--workflow', help='Workflow type for new task')
     parser.add_argument('--list', action='store_true', help='List all tasks')
     parser.add_argument('--status', help='Filter tasks by status')
+    parser.add_argument('--set-status', nargs=2, metavar=('TASK_ID', 'STATUS'),
+                        help='Record a task status (initialized, running, completed, failed)')
+    parser.add_argument('--rebuild-index', action='store_true',
+                        help='Rescan task directories and rebuild the task index')
     parser.add_argument('--cleanup', action='store_true', help='Clean up old tasks')
     parser.add_argument('--max-age', type=int, help='Maximum age in days for cleanup')
     parser.add_argument('--keep-min', type=int, help='Minimum tasks to keep')
     parser.add_argument('--delete', help='Delete task context')
+    parser.add_argument('--archive', help='Pack task context into a compressed archive')
     parser.add_argument('--config', help='Path to configuration file')
     parser.add_argument('--base-path', help='Base path for context directories')
     
@@ -500,25 +759,45 @@ if __name__ == "__main__":
         context_path = manager.create_task_context(args.create, args.workflow)
         print(f"Created task context: {context_path}")
         
+    elif args.set_status:
+        task_id, status = args.set_status
+        if not manager.set_task_status(task_id, status.lower()):
+            print(f"Unknown task: {task_id}")
+            exit(1)
+        print(f"Task {task_id}: {status.lower()}")
+        
     elif args.list:
+        if args.rebuild_index:
+            manager.index.rebuild()
         tasks = manager.list_tasks(args.status)
         print(f"Found {len(tasks)} tasks:")
         for task in tasks:
             print(f"  - {task['task_id']} ({task.get('workflow_type', 'unknown')})")
             print(f"    Created: {task.get('created_at')}")
-            print(f"    Path: {task.get('context_path')}")
+            print(f"    Path: {task.get('archive_path') or task.get('context_path')}")
             
     elif args.cleanup:
         cleaned = manager.cleanup_old_tasks(args.max_age, args.keep_min)
+        manager.gc.drain()  # no background worker outlives the CLI
         print(f"Cleaned up {len(cleaned)} tasks: {', '.join(cleaned)}")
         
     elif args.delete:
         success = manager.delete_task_context(args.delete)
+        manager.gc.drain()
         if success:
             print(f"Deleted task context: {args.delete}")
         else:
             print(f"Failed to delete task context: {args.delete}")
             exit(1)
             
+    elif args.archive:
+        archive_path = manager.archive_task_context(args.archive)
+        manager.gc.drain()
+        if archive_path:
+            print(f"Archived task context: {archive_path}")
+        else:
+            print(f"Failed to archive task context: {args.archive}")
+            exit(1)
+            
     else:
         parser.print_help()
\ No newline at end of file
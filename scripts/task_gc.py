@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+NSO Task GC — Background, Rate-Limited Deletion of Task Contexts
+
+Deleting a task context used to be an inline shutil.rmtree(): thousands
+of unlink() calls run by the coordinator's monitor loop or the CLI, and
+an I/O burst for everything else on the disk. Deletion is now split in
+two:
+
+1. trash(): the task directory is renamed into a trash directory next to
+   the task tree. One rename() — the task disappears from every listing
+   and scan immediately.
+2. A daemon worker empties the trash in the background, limited to
+   max_ops_per_second unlink/rmdir calls. Entries left over by a process
+   that exited mid-delete are picked up by the next worker.
+
+Which tasks to collect is decided from task index records
+(select_candidates), so choosing candidates never reads per-task files.
+
+Usage:
+    from task_gc import get_collector, select_candidates
+
+    gc = get_collector(Path(".opencode/context/.trash"))
+    gc.trash(Path(".opencode/context/tasks/task_x"))
+    gc.start()
+
+    python3 task_gc.py --trash .opencode/context/.trash --drain
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+
+TRASH_DIR = ".trash"
+DEFAULT_OPS_PER_SECOND = 200
+POLL_INTERVAL = 30.0  # seconds between trash checks when idle
+
+
+# ─── Candidate Selection ────────────────────────────────────────────
+
+def select_candidates(
+    records: Iterable[dict],
+    retention_days: Mapping[str, float],
+    keep_min: int = 0,
+    now: Optional[datetime] = None,
+    time_field: str = "updated_at",
+) -> list[str]:
+    """
+    Pick the task IDs whose retention has expired.
+
+    Args:
+        records: Task index records, oldest first (each with 'task_id',
+            'status' and a timestamp).
+        retention_days: Days to keep a task, by status (case-insensitive).
+            '*' covers statuses not listed; tasks whose status is not
+            covered are never collected.
+        keep_min: Never collect the newest keep_min tasks.
+        now: Reference time (defaults to now).
+        time_field: Record field the age is measured from; falls back to
+            'created_at'.
+    """
+    now = now or datetime.now()
+    records = list(records)
+    protected = {r.get("task_id") for r in records[len(records) - keep_min:]} if keep_min else set()
+    retention = {status.lower(): days for status, days in retention_days.items()}
+
+    candidates = []
+    for record in records:
+        task_id = record.get("task_id")
+        if not task_id or task_id in protected:
+            continue
+
+        status = str(record.get("status") or "").lower()
+        days = retention.get(status, retention.get("*"))
+        stamp = record.get(time_field) or record.get("created_at")
+        if days is None or not stamp:
+            continue
+
+        try:
+            when = datetime.fromisoformat(str(stamp).replace("Z", "+00:00")).replace(tzinfo=None)
+        except ValueError:
+            continue
+        if (now - when).total_seconds() > days * 86400:
+            candidates.append(task_id)
+
+    return candidates
+
+
+# ─── Collector ──────────────────────────────────────────────────────
+
+class _RateLimiter:
+    """Token bucket: at most `rate` operations per second (bursts up to one second's worth)."""
+
+    def __init__(self, rate: float, stop: threading.Event):
+        self.rate = rate
+        self.tokens = rate
+        self.stop = stop
+        self.last = time.monotonic()
+
+    def acquire(self) -> bool:
+        """Wait for one token. Returns False if the collector is stopping."""
+        if self.rate <= 0:
+            return not self.stop.is_set()
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            if self.stop.wait((1 - self.tokens) / self.rate):
+                return False
+
+
+class TaskGC:
+    """Moves task directories into a trash directory and empties it in the background."""
+
+    def __init__(self, trash_root: Path | str, max_ops_per_second: float = DEFAULT_OPS_PER_SECOND):
+        """
+        Args:
+            trash_root: Trash directory; must be on the same filesystem as
+                the task directories so trash() is a rename.
+            max_ops_per_second: unlink/rmdir calls per second for the
+                background worker (0 = unlimited).
+        """
+        self.trash_root = Path(trash_root)
+        self.max_ops_per_second = max_ops_per_second
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._failed: set[str] = set()
+
+    def trash(self, path: Path | str) -> bool:
+        """Atomically move `path` into the trash. Returns False if it could not be moved."""
+        path = Path(path)
+        self.trash_root.mkdir(parents=True, exist_ok=True)
+        target = self.trash_root / f"{path.name}.{time.time_ns()}"
+        try:
+            os.rename(path, target)
+        except OSError:
+            return False
+        self._wake.set()
+        return True
+
+    def pending(self) -> list[Path]:
+        """Entries still waiting to be deleted."""
+        try:
+            return sorted(p for p in self.trash_root.iterdir() if p.name not in self._failed)
+        except FileNotFoundError:
+            return []
+
+    # ─── Worker ─────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the background worker (no-op if it is already running)."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                self._wake.set()
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="nso-task-gc", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the worker; remaining entries stay in the trash for the next run."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def drain(self, rate_limited: bool = False) -> int:
+        """Delete everything in the trash now, in the calling thread. Returns entries deleted."""
+        limiter = _RateLimiter(self.max_ops_per_second if rate_limited else 0, threading.Event())
+        return sum(self._delete(entry, limiter) for entry in self.pending())
+
+    def _run(self) -> None:
+        limiter = _RateLimiter(self.max_ops_per_second, self._stop)
+        while not self._stop.is_set():
+            self._wake.clear()
+            for entry in self.pending():
+                if not self._delete(entry, limiter) and self._stop.is_set():
+                    return
+            self._wake.wait(POLL_INTERVAL)
+
+    def _delete(self, entry: Path, limiter: _RateLimiter) -> bool:
+        """Delete one trash entry bottom-up, one rate-limited syscall at a time."""
+        try:
+            if entry.is_symlink() or not entry.is_dir():
+                if not limiter.acquire():
+                    return False
+                entry.unlink()
+                return True
+
+            for root, dirs, files in os.walk(entry, topdown=False):
+                for name in files:
+                    if not limiter.acquire():
+                        return False
+                    os.unlink(os.path.join(root, name))
+                for name in dirs:
+                    if not limiter.acquire():
+                        return False
+                    path = os.path.join(root, name)
+                    if os.path.islink(path):
+                        os.unlink(path)
+                    else:
+                        os.rmdir(path)
+            if not limiter.acquire():
+                return False
+            os.rmdir(entry)
+            return True
+        except FileNotFoundError:
+            return True  # another collector got there first
+        except OSError as e:
+            print(f"Warning: could not delete {entry}: {e}")
+            self._failed.add(entry.name)
+            return False
+
+
+_collectors: dict[str, TaskGC] = {}
+_collectors_lock = threading.Lock()
+
+
+def get_collector(trash_root: Path | str, max_ops_per_second: float = DEFAULT_OPS_PER_SECOND) -> TaskGC:
+    """Return the process-wide collector for a trash directory (one worker per trash)."""
+    key = os.path.abspath(trash_root)
+    with _collectors_lock:
+        if key not in _collectors:
+            _collectors[key] = TaskGC(key, max_ops_per_second)
+        return _collectors[key]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NSO task garbage collector")
+    parser.add_argument("--trash", default=f".opencode/context/{TRASH_DIR}", help="Trash directory")
+    parser.add_argument("--drain", action="store_true", help="Delete everything in the trash now")
+    parser.add_argument("--rate", type=float, default=DEFAULT_OPS_PER_SECOND,
+                        help="Max unlink/rmdir calls per second (0 = unlimited)")
+    args = parser.parse_args()
+
+    gc = TaskGC(args.trash, args.rate)
+    if args.drain:
+        print(f"Deleted {gc.drain(rate_limited=args.rate > 0)} trash entries")
+    else:
+        print(f"{len(gc.pending())} trash entries pending")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+NSO Task ID Codec — One Definition of the Task ID Formats
+
+Two task ID formats are in use:
+
+    task_{YYYYMMDD}_{HHMMSS}_{workflow}_{hash}_{counter}[_{suffix}...]
+        task_id_generator.py (suffixes are subtask IDs)
+    {project}_{workflow}_{YYYYMMDD}_{HHMMSS}_{hash6}_{counter:03d}
+        parallel_oracle_integration.py
+
+This module owns both: the format strings, the precompiled patterns and
+the parse/validate/format functions. Scanners and listings that handle
+many names at once use parse_many/search_many, which run ONE regex pass
+over the newline-joined names instead of one match call per name.
+
+Usage:
+    from task_id_codec import parse, validate, format_task_id
+
+    task_id = format_task_id("20260212_101500", "build", "ab12cd34", 1)
+    parse(task_id)["workflow_type"]      # 'build'
+    validate("not_a_task")               # False
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Optional
+
+
+TASK_ID_FORMAT = "task_{timestamp}_{workflow}_{hash}_{counter}"
+ORACLE_ID_FORMAT = "{project}_{workflow}_{timestamp}_{hash}_{counter:03d}"
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+WORKFLOWS = ("build", "debug", "review", "plan")
+GENERATED_HASH_LENGTH = 8  # task_id_generator default
+
+# Ungrouped body, for embedding into larger patterns (e.g. contamination rules)
+TASK_ID_PATTERN = r"task_\d{8}_\d{6}_[a-z]+_[a-f0-9]+_\d+"
+
+_TASK_ID_GROUPS = (
+    r"task_(?P<timestamp>\d{8}_\d{6})_(?P<workflow_type>[a-z]+)"
+    r"_(?P<hash>[a-f0-9]+)_(?P<counter>\d+)"
+)
+
+# Full canonical ID, optionally followed by subtask suffixes
+TASK_ID_RE = re.compile(rf"{_TASK_ID_GROUPS}(?P<suffix>(?:_[^_\s]+)*)")
+# A canonical ID anywhere inside a longer string (file names, paths)
+TASK_ID_SEARCH_RE = re.compile(_TASK_ID_GROUPS)
+ORACLE_ID_RE = re.compile(
+    r"(?P<project>[^\s]+?)_(?P<workflow_type>[a-z]+)_(?P<timestamp>\d{8}_\d{6})"
+    r"_(?P<hash>[a-f0-9]{6})_(?P<counter>\d{3,})"
+)
+
+_TASK_ID_LINES_RE = re.compile(rf"^{TASK_ID_RE.pattern}$", re.MULTILINE)
+_ORACLE_ID_LINES_RE = re.compile(rf"^{ORACLE_ID_RE.pattern}$", re.MULTILINE)
+
+
+# ─── Formatting ─────────────────────────────────────────────────────
+
+def format_task_id(timestamp: str, workflow: str, hash: str, counter: int) -> str:
+    """Build a canonical task ID (task_id_generator format)."""
+    return TASK_ID_FORMAT.format(timestamp=timestamp, workflow=workflow.lower(), hash=hash, counter=counter)
+
+
+def format_oracle_id(project: str, workflow: str, timestamp: str, hash: str, counter: int) -> str:
+    """Build an Oracle task ID (parallel_oracle_integration format)."""
+    return ORACLE_ID_FORMAT.format(
+        project=project, workflow=workflow.lower(), timestamp=timestamp, hash=hash, counter=counter
+    )
+
+
+# ─── Parsing ────────────────────────────────────────────────────────
+
+def _from_match(match: re.Match) -> dict:
+    groups = match.groupdict()
+    parsed = {
+        "task_id": match.group(0),
+        "timestamp": groups["timestamp"],
+        "workflow_type": groups["workflow_type"],
+        "hash": groups["hash"],
+        "counter": int(groups["counter"]),
+        "additional_parts": groups["suffix"][1:].split("_") if groups.get("suffix") else [],
+    }
+    if "project" in groups:
+        parsed["project"] = groups["project"]
+    return parsed
+
+
+def parse(task_id: str, oracle: bool = True) -> Optional[dict]:
+    """
+    Split a task ID into its components.
+
+    Returns a dict with task_id, timestamp, workflow_type, hash, counter and
+    additional_parts (plus project for Oracle IDs), or None if `task_id` is
+    not a valid ID. With oracle=False only the canonical format is accepted.
+    """
+    match = TASK_ID_RE.fullmatch(task_id) or (oracle and ORACLE_ID_RE.fullmatch(task_id))
+    return _from_match(match) if match else None
+
+
+def validate(task_id: str, workflows: Optional[Iterable[str]] = None, oracle: bool = True,
+             strict: bool = False) -> bool:
+    """
+    True if `task_id` is a well-formed task ID.
+
+    Args:
+        workflows: If given, the workflow part must be one of these (lowercase).
+        oracle: Also accept the Oracle format.
+        strict: Only accept exactly what task_id_generator produces: a
+            GENERATED_HASH_LENGTH-digit hash and no subtask suffix.
+    """
+    parsed = parse(task_id, oracle) if task_id else None
+    if parsed is None:
+        return False
+    if strict and (len(parsed["hash"]) != GENERATED_HASH_LENGTH or parsed["additional_parts"]):
+        return False
+    return workflows is None or parsed["workflow_type"] in workflows
+
+
+def parse_many(task_ids: Iterable[str]) -> dict[str, dict]:
+    """
+    Parse many IDs at once. Returns {task_id: parsed} for the valid ones;
+    invalid names are left out.
+    """
+    text = "\n".join(task_ids)
+    parsed = {m.group(0): _from_match(m) for m in _ORACLE_ID_LINES_RE.finditer(text)}
+    # Canonical wins where a name happens to match both formats
+    parsed.update((m.group(0), _from_match(m)) for m in _TASK_ID_LINES_RE.finditer(text))
+    return parsed
+
+
+# ─── Searching ──────────────────────────────────────────────────────
+
+def search(text: str) -> Optional[str]:
+    """Return the first canonical task ID embedded in `text`, or None."""
+    match = TASK_ID_SEARCH_RE.search(text)
+    return match.group(0) if match else None
+
+
+def search_many(names: Iterable[str]) -> dict[str, str]:
+    """
+    Find embedded canonical task IDs in many names with one regex pass.
+    Returns {name: first task ID in it} for names that contain one.
+    """
+    names = [name for name in names if "\n" not in name]
+    if not names:
+        return {}
+
+    # Line start offsets, to map each match back to its name
+    starts, offset = [], 0
+    for name in names:
+        starts.append(offset)
+        offset += len(name) + 1
+
+    found: dict[str, str] = {}
+    line = 0
+    for match in TASK_ID_SEARCH_RE.finditer("\n".join(names)):
+        while line + 1 < len(starts) and starts[line + 1] <= match.start():
+            line += 1
+        found.setdefault(names[line], match.group(0))
+    return found
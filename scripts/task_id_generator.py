@@ -9,8 +9,14 @@ import uuid
 from datetime import datetime
 import json
 import os
+import sys
+from pathlib import Path
 from typing import Dict, Any, Optional, Optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+from id_allocator import DEFAULT_COUNTER_PATH, get_allocator
+import task_id_codec
+
 
 class TaskIDGenerator:
     """Generates unique task IDs with metadata"""
@@ -22,6 +28,9 @@ class TaskIDGenerator:
         self.config = self._load_config()
         self.task_counter = self.config.get('task_id', {}).get('counter', {}).get('start', 1)
         self.max_counter = self.config.get('task_id', {}).get('counter', {}).get('max', 9999)
+        # Shared with every other generator/process so counters never restart at 1
+        counter_path = self.config.get('task_id', {}).get('counter', {}).get('path', DEFAULT_COUNTER_PATH)
+        self.allocator = get_allocator(counter_path, start=self.task_counter)
         
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file"""
@@ -33,8 +42,8 @@ class TaskIDGenerator:
             # Return defaults if config not available
             return {
                 'task_id': {
-                    'format': 'task_{timestamp}_{workflow}_{hash}_{counter}',
-                    'timestamp_format': '%Y%m%d_%H%M%S',
+                    'format': task_id_codec.TASK_ID_FORMAT,
+                    'timestamp_format': task_id_codec.TIMESTAMP_FORMAT,
                     'hash': {
                         'algorithm': 'sha256',
                         'length': 8
@@ -59,9 +68,9 @@ class TaskIDGenerator:
         """
         # Get configuration
         task_id_format = self.config.get('task_id', {}).get('format', 
-                    'task_{timestamp}_{workflow}_{hash}_{counter}')
+                    task_id_codec.TASK_ID_FORMAT)
         timestamp_format = self.config.get('task_id', {}).get('timestamp_format', 
-                    '%Y%m%d_%H%M%S')
+                    task_id_codec.TIMESTAMP_FORMAT)
         hash_config = self.config.get('task_id', {}).get('hash', {})
         hash_algorithm = hash_config.get('algorithm', 'sha256')
         hash_length = hash_config.get('length', 8)
@@ -128,15 +137,11 @@ class TaskIDGenerator:
         return metadata
     
     def _get_next_counter(self) -> int:
-        """Get next counter value with wrap-around"""
-        current = self.task_counter
-        self.task_counter += 1
+        """Get next counter value (unique across processes) with wrap-around"""
+        value = self.allocator.next()
         
         # Wrap around if exceeds max
-        if self.task_counter > self.max_counter:
-            self.task_counter = 1
-            
-        return current
+        return (value - 1) % self.max_counter + 1
     
     def _generate_hash(self, data: str, algorithm: str = 'sha256', 
                       length: int = 8) -> str:
@@ -164,44 +169,7 @@ class TaskIDGenerator:
         Returns:
             True if valid, False otherwise
         """
-        if not task_id:
-            return False
-            
-        # Check prefix
-        if not task_id.startswith('task_'):
-            return False
-            
-        # Check parts
-        parts = task_id.split('_')
-        if len(parts) < 5:  # task + timestamp + workflow + hash + counter
-            return False
-            
-        # Check timestamp format (YYYYMMDD_HHMMSS)
-        timestamp_part = parts[1]
-        if len(timestamp_part) != 15 or '_' not in timestamp_part:
-            # Try without underscore
-            if len(timestamp_part) != 14:
-                return False
-                
-        # Check workflow type
-        workflow_part = parts[2]
-        valid_workflows = ['build', 'debug', 'review', 'plan']
-        if workflow_part not in valid_workflows:
-            return False
-            
-        # Check hash (hexadecimal)
-        hash_part = parts[3]
-        try:
-            int(hash_part, 16)
-        except ValueError:
-            return False
-            
-        # Check counter (numeric)
-        counter_part = parts[4]
-        if not counter_part.isdigit():
-            return False
-            
-        return True
+        return task_id_codec.validate(task_id, workflows=task_id_codec.WORKFLOWS, oracle=False)
     
     def parse_task_id(self, task_id: str) -> Dict[str, Any]:
         """
@@ -213,28 +181,11 @@ class TaskIDGenerator:
         Returns:
             Dictionary with parsed components
         """
-        if not self.validate_task_id(task_id):
+        parsed = task_id_codec.parse(task_id, oracle=False)
+        if parsed is None or parsed['workflow_type'] not in task_id_codec.WORKFLOWS:
             raise ValueError(f"Invalid task ID format: {task_id}")
             
-        parts = task_id.split('_')
-        
-        # Handle timestamp with or without underscore
-        timestamp_part = parts[1]
-        if '_' in timestamp_part:
-            date_part, time_part = timestamp_part.split('_')
-            timestamp = f"{date_part}_{time_part}"
-        else:
-            # Assume YYYYMMDDHHMMSS format
-            timestamp = timestamp_part
-            
-        return {
-            'task_id': task_id,
-            'timestamp': timestamp,
-            'workflow_type': parts[2],
-            'hash': parts[3],
-            'counter': int(parts[4]),
-            'additional_parts': parts[5:] if len(parts) > 5 else []
-        }
+        return parsed
 
 
 # Command-line interface
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+NSO Task Index — Single-File Listing for Task Directories
+
+Every task lives in its own directory, so listing tasks used to mean
+one iterdir() plus one state/metadata read per task. The index keeps a
+compact summary record per task in ONE JSON file, updated by the writers
+(start, transition, cancel, create, delete). Listing, filtering by status
+and sorting by date then cost a single file read regardless of how many
+tasks exist.
+
+The task directories remain the source of truth: if the index file is
+missing or unreadable it is rebuilt from a directory scan once. Writers
+update the index under an advisory lock (see file_lock.py), so parallel
+agents never drop each other's records.
+
+Usage:
+    from task_index import TaskIndex
+
+    index = TaskIndex(Path(".opencode/context/task_index.json"))
+    index.upsert("rss_collector", status="ACTIVE", updated_at="2026-02-12 10:00:00")
+    index.query(status="ACTIVE", sort_by="updated_at", reverse=True)
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from file_lock import atomic_write_json, file_lock
+
+
+INDEX_VERSION = 1
+
+
+class TaskIndex:
+    """Summary records for a set of task directories, stored in one JSON file."""
+
+    def __init__(
+        self,
+        path: Path | str,
+        rebuild: Optional[Callable[[], Iterable[dict]]] = None,
+    ):
+        """
+        Args:
+            path: Location of the index file.
+            rebuild: Optional callable yielding one record per task (each with a
+                'task_id' key). Used to (re)build the index from the task
+                directories when the index file does not exist yet.
+        """
+        self.path = Path(path)
+        self._rebuild = rebuild
+
+    # ─── Persistence ────────────────────────────────────────────────
+
+    def _read(self) -> Optional[dict[str, dict]]:
+        """Return the task records, or None if the index is missing or corrupt."""
+        try:
+            data = json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return None
+        tasks = data.get("tasks")
+        return tasks if isinstance(tasks, dict) else None
+
+    def _write(self, tasks: dict[str, dict]) -> None:
+        """Atomically replace the index file."""
+        atomic_write_json(self.path, {"version": INDEX_VERSION, "tasks": tasks}, indent=1)
+
+    def _load(self) -> dict[str, dict]:
+        tasks = self._read()
+        if tasks is None:
+            tasks = self.rebuild() if self._rebuild else {}
+        return tasks
+
+    def rebuild(self) -> dict[str, dict]:
+        """Rebuild the index from the task directories and persist it."""
+        tasks: dict[str, dict] = {}
+        with file_lock(self.path):
+            if self._rebuild:
+                for record in self._rebuild():
+                    tasks[record["task_id"]] = record
+            self._write(tasks)
+        return tasks
+
+    # ─── Writers ────────────────────────────────────────────────────
+
+    def upsert(self, task_id: str, **fields) -> dict:
+        """Create or update the record for a task. Returns the stored record."""
+        with file_lock(self.path):
+            tasks = self._load()
+            record = tasks.get(task_id, {"task_id": task_id})
+            record.update(fields)
+            record["task_id"] = task_id
+            tasks[task_id] = record
+            self._write(tasks)
+        return record
+
+    def remove(self, task_id: str) -> bool:
+        """Drop a task from the index. Returns True if it was present."""
+        with file_lock(self.path):
+            tasks = self._load()
+            if task_id not in tasks:
+                return False
+            del tasks[task_id]
+            self._write(tasks)
+        return True
+
+    # ─── Readers ────────────────────────────────────────────────────
+
+    def get(self, task_id: str) -> Optional[dict]:
+        return self._load().get(task_id)
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        sort_by: str = "task_id",
+        reverse: bool = False,
+    ) -> list[dict]:
+        """
+        List task records from the index.
+
+        Args:
+            status: Only return records whose 'status' matches (case-insensitive).
+            sort_by: Record field to sort on (e.g. 'task_id', 'created_at', 'updated_at').
+            reverse: Sort descending.
+        """
+        records = list(self._load().values())
+        if status:
+            wanted = status.lower()
+            records = [r for r in records if str(r.get("status", "")).lower() == wanted]
+        records.sort(key=lambda r: (str(r.get(sort_by) or ""), r["task_id"]), reverse=reverse)
+        return records
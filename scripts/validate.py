@@ -5,16 +5,47 @@ NSO Universal Validator
 Validates Python, TypeScript, documentation naming, and memory architecture.
 Supports fast mode (single file) and full project harness.
 
+The full harness stages are independent, so they run concurrently. Output
+is still printed in stage order, and the first failure cancels the stages
+that are still running. The unit tests themselves are sharded by file
+across several pytest processes (see pytest_shard.py).
+
+Fast mode checks one changed file: ruff and mypy on that file, and pytest
+on only the tests that import it (directly or through other modules, see
+import_graph.py). A pass is cached under a hash of the file, its direct
+imports and its dependents, so re-validating unchanged code is
+near-instant.
+
+A full harness pass is cached too, keyed by the git tree of HEAD plus a
+hash of uncommitted and untracked changes: re-running --full on a tree
+that already passed returns immediately. Failures are never cached.
+
 Usage:
     python validate.py --full          # Full project validation
-    python validate.py <file>           # Fast mode (single file, not yet implemented)
+    python validate.py --full --jobs 1 # ... one stage at a time
+    python validate.py --full --test-workers 1  # ... tests in one pytest process
+    python validate.py <file>           # Fast mode (single file)
+    python validate.py --full --no-cache
 """
 
 import sys
 import subprocess
 import os
+import re
+import hashlib
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from file_lock import read_json, update_json
+from import_graph import ImportGraph
+from pytest_events import plugin_args, read_events, summarize
+from pytest_shard import configured_test_paths, default_workers, run_sharded
 
 
 # Exit codes for validation results
@@ -23,6 +54,28 @@ EXIT_GENERAL_ERROR = 1
 EXIT_VALIDATION_FAILED = 2
 EXIT_TOOL_NOT_FOUND = 3
 
+# Result of a harness stage: (passed, output lines); passed is None when skipped
+StageResult = Tuple[Optional[bool], List[str]]
+Stage = Tuple[str, Callable[[threading.Event], StageResult]]
+
+# Content hashes of files that passed fast mode
+FAST_CACHE = Path(".opencode/cache/validate_fast.json")
+FAST_CACHE_VERSION = 1
+
+# Full harness verdicts by git tree state
+FULL_CACHE = Path(".opencode/cache/validate_full.json")
+FULL_CACHE_ENTRIES = 20
+
+# Runtime output that must not change the tree state key
+TREE_STATE_EXCLUDES = [
+    ":(exclude).opencode/cache",
+    ":(exclude).opencode/logs",
+    ":(exclude,glob)**/__pycache__/**",
+    ":(exclude,glob)**/.pytest_cache/**",
+    ":(exclude,glob)**/.mypy_cache/**",
+    ":(exclude,glob)**/.ruff_cache/**",
+]
+
 
 def find_executable(name: str) -> Optional[str]:
     """Find an executable in PATH or common locations."""
@@ -46,26 +99,46 @@ def find_executable(name: str) -> Optional[str]:
     return None
 
 
-def run_command(cmd: List[str], cwd: Optional[Path] = None) -> Tuple[bool, str]:
+def run_command(cmd: List[str], cwd: Optional[Path] = None,
+                cancel: Optional[threading.Event] = None,
+                env: Optional[dict] = None) -> Tuple[bool, str]:
     """
     Run a shell command and return (success, output).
     
+    Args:
+        cancel: If set while the command runs, it is killed and the
+            result is (False, "Cancelled")
+        env: Environment for the command (default: inherited)
+    
     Returns:
         Tuple of (success: bool, output: str)
     """
     try:
-        result = subprocess.run(
-            cmd, 
+        process = subprocess.Popen(
+            cmd,
             cwd=cwd,
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=env
         )
-        output = result.stdout + result.stderr
-        if result.returncode != 0:
-            return False, output
-        return True, output
     except FileNotFoundError:
         return False, f"Tool not found: {cmd[0]}"
+    
+    while True:
+        try:
+            stdout, stderr = process.communicate(timeout=0.1 if cancel else None)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel.is_set():
+                process.kill()
+                process.communicate()
+                return False, "Cancelled"
+    
+    output = stdout + stderr
+    if process.returncode != 0:
+        return False, output
+    return True, output
 
 
 def has_python_module(module: str) -> bool:
@@ -86,20 +159,27 @@ def resolve_pytest_cmd() -> Optional[List[str]]:
     return None
 
 
-def collect_pytest_count(pytest_cmd: List[str]) -> Optional[int]:
-    """Return number of collected tests, or None if collection fails."""
-    try:
-        result = subprocess.run(
-            pytest_cmd + ["--collect-only", "-q"],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            return None
-        lines = [line for line in result.stdout.splitlines() if line.strip()]
-        return len(lines)
-    except FileNotFoundError:
+PYTEST_COLLECTED_RE = re.compile(r"^collected (\d+) items?", re.MULTILINE)
+PYTEST_SUMMARY_RE = re.compile(
+    r"(\d+) (passed|failed|skipped|xfailed|xpassed|errors?|deselected)\b")
+
+
+def parse_pytest_count(output: str) -> Optional[int]:
+    """
+    Return the number of collected tests from a pytest run's output.
+    
+    Uses the "collected N items" header, falling back to the summary line
+    ("3 passed, 1 failed in 0.5s") when the header is absent (-q).
+    """
+    match = PYTEST_COLLECTED_RE.search(output)
+    if match:
+        return int(match.group(1))
+    
+    lines = [line for line in output.splitlines() if " in " in line and PYTEST_SUMMARY_RE.search(line)]
+    if not lines:
         return None
+    return sum(int(count) for count, kind in PYTEST_SUMMARY_RE.findall(lines[-1])
+               if kind != "deselected")
 
 
 def validate_doc_naming() -> Tuple[bool, List[str]]:
@@ -134,7 +214,7 @@ def validate_doc_naming() -> Tuple[bool, List[str]]:
     return True, []
 
 
-def validate_memory_architecture() -> Tuple[bool, str]:
+def validate_memory_architecture(cancel: Optional[threading.Event] = None) -> Tuple[bool, str]:
     """
     Validate NSO memory files and anchors.
     
@@ -145,7 +225,7 @@ def validate_memory_architecture() -> Tuple[bool, str]:
     if not script_path.exists():
         return False, "memory_validator.py not found. Skipping memory validation."
     
-    success, output = run_command([sys.executable, str(script_path)])
+    success, output = run_command([sys.executable, str(script_path)], cancel=cancel)
     return success, output
 
 
@@ -205,75 +285,349 @@ def validate_typescript_file(file_path: Path) -> Tuple[bool, List[str]]:
     return len(errors) == 0, errors
 
 
-def run_full_harness() -> Tuple[bool, int]:
-    """
-    Run the full project validation harness.
-    
-    Returns:
-        Tuple of (success: bool, exit_code: int)
-    """
-    print("🚀 Running FULL Project Harness...")
-    
+def _stage_lint(cancel: threading.Event) -> StageResult:
     ruff_path = find_executable("ruff")
+    if not ruff_path:
+        return None, ["⚠️  ruff not found. Skipping lint."]
+    success, output = run_command([ruff_path, "check", ".", "--exclude", "_ARCHIVE_LEGACY"], cancel=cancel)
+    if not success:
+        return False, [f"❌ Linting failed:\n{output}"]
+    return True, []
+
+
+def _stage_type_check(cancel: threading.Event) -> StageResult:
     mypy_path = find_executable("mypy")
-    
-    # 1. Lint Project
-    print("1️⃣  Linting...")
-    if ruff_path:
-        success, output = run_command([ruff_path, "check", ".", "--exclude", "_ARCHIVE_LEGACY"])
-        if not success:
-            print(f"❌ Linting failed:\n{output}")
-            return False, EXIT_VALIDATION_FAILED
-    else:
-        print("⚠️  ruff not found. Skipping lint.")
+    if not mypy_path:
+        return None, ["⚠️  mypy not found. Skipping type check."]
+    success, output = run_command([mypy_path, "--config-file", ".opencode/mypy.ini"], cancel=cancel)
+    if not success:
+        return False, [f"❌ Type checking failed:\n{output}"]
+    return True, []
 
-    # 2. Type Check Project
-    print("2️⃣  Type Checking...")
-    if mypy_path:
-        success, output = run_command([mypy_path, "--config-file", ".opencode/mypy.ini"])
-        if not success:
-            print(f"❌ Type checking failed:\n{output}")
-            return False, EXIT_VALIDATION_FAILED
-    else:
-        print("⚠️  mypy not found. Skipping type check.")
 
-    # 3. Documentation Naming Conventions
-    print("2.5️⃣  Documentation Naming...")
+def _stage_doc_naming(cancel: threading.Event) -> StageResult:
     success, errors = validate_doc_naming()
     if not success:
-        print("❌ Documentation naming validation failed:")
-        for error in errors:
-            print(f"- {error}")
-        return False, EXIT_VALIDATION_FAILED
-    print("✅ Documentation naming passed")
+        return False, ["❌ Documentation naming validation failed:"] + [f"- {error}" for error in errors]
+    return True, ["✅ Documentation naming passed"]
 
-    # 4. Memory Architecture Validation
-    print("2.6️⃣  Memory Architecture...")
-    success, output = validate_memory_architecture()
+
+def _stage_memory(cancel: threading.Event) -> StageResult:
+    success, output = validate_memory_architecture(cancel)
     if not success:
-        print(f"❌ Memory validation failed: {output}")
-        return False, EXIT_VALIDATION_FAILED
-    print("✅ Memory validation passed")
+        return False, [f"❌ Memory validation failed: {output}"]
+    return True, ["✅ Memory validation passed"]
 
-    # 5. Unit Tests
-    print("3️⃣  Unit Tests...")
+
+def _stage_unit_tests(cancel: threading.Event, test_workers: Optional[int] = None) -> StageResult:
     pytest_cmd = resolve_pytest_cmd()
-    if pytest_cmd:
-        collected = collect_pytest_count(pytest_cmd)
+    if not pytest_cmd:
+        return None, ["⚠️  pytest not found. Skipping tests."]
+    
+    workers = test_workers or default_workers()
+    if workers <= 1:
+        # One run: the collected count comes from its event stream
+        with tempfile.TemporaryDirectory(prefix="nso-pytest-") as tmp:
+            events_args, env = plugin_args(Path(tmp) / "events.jsonl")
+            success, output = run_command(pytest_cmd + events_args, cancel=cancel, env=env)
+            summary = summarize(read_events(Path(tmp) / "events.jsonl"))
+        lines = []
+        # Output parsing only covers a pytest that could not load the plugin
+        collected = summary["collected"] if summary["exitstatus"] is not None else parse_pytest_count(output)
         if collected is not None:
-            print(f"🧪 Collected tests: {collected}")
-        success, output = run_command(pytest_cmd)
+            lines.append(f"🧪 Collected tests: {collected}")
         if not success:
-            print(f"❌ Unit tests failed:\n{output}")
-            return False, EXIT_VALIDATION_FAILED
-    else:
-        print("⚠️  pytest not found. Skipping tests.")
+            return False, lines + [f"❌ Unit tests failed:\n{output}"]
+        return True, lines
+    
+    # Test files split across worker processes (see pytest_shard.py)
+    report = run_sharded(configured_test_paths(), workers, timeout=None,
+                         cancel=cancel, pytest_cmd=pytest_cmd)
+    lines = [f"🧪 Collected tests: {report.collected}",
+             f"🔀 {report.shards} shard(s): {report.summary()}"]
+    if report.cancelled:
+        return False, ["⏹  Cancelled"]
+    if not report.success:
+        failures = [f"- {o.node_id}" for o in report.failures()]
+        return False, lines + ["❌ Unit tests failed:"] + failures + [report.output]
+    return True, lines
+
+
+def harness_stages(test_workers: Optional[int] = None) -> List[Stage]:
+    """Stages of the full harness (test_workers: pytest shards; 1 = one process)."""
+    return [
+        ("1️⃣  Linting...", _stage_lint),
+        ("2️⃣  Type Checking...", _stage_type_check),
+        ("2.5️⃣  Documentation Naming...", _stage_doc_naming),
+        ("2.6️⃣  Memory Architecture...", _stage_memory),
+        ("3️⃣  Unit Tests...", lambda cancel: _stage_unit_tests(cancel, test_workers)),
+    ]
+
+
+def run_stages(stages: List[Stage], jobs: Optional[int] = None,
+               fail_fast: bool = True) -> bool:
+    """
+    Run independent validation stages concurrently.
+    
+    Each stage's output is printed as a block, in stage order, as soon as
+    the stage and all stages before it have finished. On the first failure
+    (with fail_fast) the stages still running are cancelled and reported
+    as such.
+    
+    Args:
+        stages: (title, function) pairs; functions take a cancel event
+        jobs: Maximum stages running at once (default: all)
+        fail_fast: Cancel remaining stages after the first failure
+        
+    Returns:
+        True if no stage failed
+    """
+    cancel = threading.Event()
+    results: List[Optional[StageResult]] = [None] * len(stages)
+    durations: List[float] = [0.0] * len(stages)
+    printed = 0
+    failed = False
+    
+    def run(index: int) -> StageResult:
+        started = time.monotonic()
+        try:
+            if cancel.is_set():
+                return False, ["⏹  Cancelled"]
+            return stages[index][1](cancel)
+        except Exception as e:
+            return False, [f"❌ Stage crashed: {e}"]
+        finally:
+            durations[index] = time.monotonic() - started
+    
+    def flush():
+        nonlocal printed
+        while printed < len(stages) and results[printed] is not None:
+            print(f"{stages[printed][0]} ({durations[printed]:.1f}s)")
+            for line in results[printed][1]:
+                print(line)
+            printed += 1
+    
+    with ThreadPoolExecutor(max_workers=jobs or len(stages)) as executor:
+        futures = {executor.submit(run, i): i for i in range(len(stages))}
+        for future in as_completed(futures):
+            index = futures[future]
+            passed, lines = future.result()
+            if passed is False and cancel.is_set():
+                lines = ["⏹  Cancelled"]  # killed because another stage failed
+            elif passed is False:
+                failed = True
+                if fail_fast:
+                    cancel.set()
+            results[index] = (passed, lines)
+            flush()
+    
+    return not failed
+
+
+def _git(args: List[str]) -> Optional[bytes]:
+    try:
+        result = subprocess.run(["git"] + args, capture_output=True)
+    except FileNotFoundError:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
 
-    # 6. E2E Tests (Simulated)
+def git_tree_state() -> Optional[str]:
+    """
+    Identify the working tree contents: the tree of HEAD plus a hash of
+    uncommitted (staged and unstaged) and untracked changes.
+    
+    Returns:
+        Hex digest, or None outside a git repository (or before the first commit)
+    """
+    tree = _git(["rev-parse", "HEAD^{tree}"])
+    diff = _git(["diff", "HEAD", "--binary", "--", "."] + TREE_STATE_EXCLUDES)
+    untracked = _git(["ls-files", "--others", "--exclude-standard", "-z", "--", "."] + TREE_STATE_EXCLUDES)
+    if tree is None or diff is None or untracked is None:
+        return None
+    
+    digest = hashlib.sha256(tree.strip() + b"\0" + diff)
+    for name in sorted(filter(None, untracked.split(b"\0"))):
+        digest.update(b"\0" + name + b"\0")
+        try:
+            digest.update(Path(os.fsdecode(name)).read_bytes())
+        except OSError:
+            digest.update(b"<unreadable>")
+    return digest.hexdigest()
+
+
+def _run_harness(jobs: Optional[int], test_workers: Optional[int] = None) -> Tuple[bool, int]:
+    print("🚀 Running FULL Project Harness...")
+    started = time.monotonic()
+    
+    if not run_stages(harness_stages(test_workers), jobs):
+        return False, EXIT_VALIDATION_FAILED
+
+    # E2E Tests (Simulated)
     print("4️⃣  E2E Tests...")
     print("⚠️  E2E tests not yet implemented (placeholder)")
 
-    print("✅ FULL HARNESS PASSED")
+    print(f"✅ FULL HARNESS PASSED in {time.monotonic() - started:.1f}s")
+    return True, EXIT_SUCCESS
+
+
+def run_full_harness(jobs: Optional[int] = None, use_cache: bool = True,
+                     test_workers: Optional[int] = None) -> Tuple[bool, int]:
+    """
+    Run the full project validation harness.
+    
+    Args:
+        jobs: Maximum stages running at once (default: all; 1 = sequential)
+        use_cache: Return success at once if this tree state already
+            passed (failures are always re-run)
+        test_workers: pytest processes the tests are sharded over
+            (default: CPU count, at most 4; 1 = a single pytest run)
+    
+    Returns:
+        Tuple of (success: bool, exit_code: int)
+    """
+    tools = ",".join(name for name in ("ruff", "mypy", "pytest") if find_executable(name))
+    state = git_tree_state()
+    key = f"{state}|{tools}" if state else None
+    
+    if use_cache and key:
+        cached = read_json(FULL_CACHE, {}).get(key)
+        if cached and cached.get("success"):
+            when = cached.get("timestamp", "an earlier run")
+            print(f"✅ FULL HARNESS PASSED (cached: tree unchanged since {when})")
+            return True, EXIT_SUCCESS
+    
+    success, exit_code = _run_harness(jobs, test_workers)
+    
+    if key:
+        # Only passes are recorded: a failure may be a timeout or a crashed
+        # stage, so it is always re-run (and drops an earlier pass)
+        def record(cache: dict) -> dict:
+            cache.pop(key, None)
+            if success:
+                cache[key] = {
+                    "success": True,
+                    "exit_code": exit_code,
+                    "timestamp": datetime.now().isoformat(timespec="seconds"),
+                }
+            newest = sorted(cache.items(), key=lambda item: item[1].get("timestamp", ""))
+            return dict(newest[-FULL_CACHE_ENTRIES:])
+        update_json(FULL_CACHE, record)
+    
+    return success, exit_code
+
+
+def _stage_command(cmd: List[str], failure: str) -> Callable[[threading.Event], StageResult]:
+    def stage(cancel: threading.Event) -> StageResult:
+        success, output = run_command(cmd, cancel=cancel)
+        if not success:
+            return False, [f"❌ {failure}:\n{output}"]
+        return True, []
+    return stage
+
+
+def _skip(message: str) -> Callable[[threading.Event], StageResult]:
+    return lambda cancel: (None, [message])
+
+
+def _fast_python_stages(file_path: str, tests: List[str]) -> List[Stage]:
+    """Lint and type check one file, and run the tests that depend on it."""
+    ruff_path = find_executable("ruff")
+    mypy_path = find_executable("mypy")
+    pytest_cmd = resolve_pytest_cmd()
+    
+    stages: List[Stage] = [
+        ("1️⃣  Linting...",
+         _stage_command([ruff_path, "check", file_path], "Ruff lint failed") if ruff_path
+         else _skip("⚠️  ruff not found. Skipping lint.")),
+        ("2️⃣  Type Checking...",
+         _stage_command([mypy_path, file_path], "MyPy type check failed") if mypy_path
+         else _skip("⚠️  mypy not found. Skipping type check.")),
+    ]
+    
+    if not pytest_cmd:
+        tests_stage = _skip("⚠️  pytest not found. Skipping tests.")
+    elif not tests:
+        tests_stage = _skip("ℹ️  No tests import this file.")
+    else:
+        run_tests = _stage_command(pytest_cmd + ["-q"] + tests, "Unit tests failed")
+        
+        def tests_stage(cancel: threading.Event) -> StageResult:
+            passed, lines = run_tests(cancel)
+            return passed, [f"🧪 {len(tests)} dependent test file(s): {', '.join(tests)}"] + lines
+    stages.append(("3️⃣  Unit Tests...", tests_stage))
+    return stages
+
+
+def _hash_files(paths: List[str], extra: str = "") -> str:
+    digest = hashlib.sha256(extra.encode())
+    for path in sorted(set(paths)):
+        digest.update(path.encode() + b"\0")
+        try:
+            digest.update(Path(path).read_bytes())
+        except OSError:
+            digest.update(b"<missing>")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def run_fast_mode(file_path: str, use_cache: bool = True) -> Tuple[bool, int]:
+    """
+    Validate a single changed file and the tests that depend on it.
+    
+    Args:
+        file_path: File to validate (relative to the project root)
+        use_cache: Skip the checks if this exact content already passed
+    
+    Returns:
+        Tuple of (success: bool, exit_code: int)
+    """
+    path = Path(file_path)
+    if not path.exists():
+        print(f"❌ File not found: {file_path}")
+        return False, EXIT_GENERAL_ERROR
+    rel_path = os.path.relpath(path).replace(os.sep, "/")
+    
+    print(f"⚡ Fast validation: {rel_path}")
+    started = time.monotonic()
+    
+    if path.suffix == ".py":
+        graph = ImportGraph(".").build()
+        tests = graph.tests_for(rel_path)
+        stages = _fast_python_stages(rel_path, tests)
+        conftests = [p for p in graph.imports if os.path.basename(p) == "conftest.py"]
+        # Everything the checks can observe: the file, its dependents, and
+        # the transitive imports of the file, the tests and the conftests
+        inputs = ([rel_path] + sorted(graph.dependents(rel_path))
+                  + sorted(graph.closure([rel_path, *tests, *conftests])))
+    elif path.suffix in (".ts", ".tsx"):
+        def check(cancel: threading.Event) -> StageResult:
+            success, errors = validate_typescript_file(path)
+            return success, [f"❌ {error}" for error in errors]
+        stages = [("1️⃣  Biome + tsc...", check)]
+        inputs = [rel_path]
+    else:
+        print(f"⚠️  No fast checks for {path.suffix or 'extensionless'} files. Use --full.")
+        return False, EXIT_GENERAL_ERROR
+    
+    # The toolset is part of the key: installing ruff must invalidate a pass without it
+    tools = ",".join(name for name in ("ruff", "mypy", "pytest", "bun") if find_executable(name))
+    key = _hash_files(inputs, extra=f"{FAST_CACHE_VERSION}|{tools}")
+    if use_cache:
+        cached = read_json(FAST_CACHE, {}).get(rel_path)
+        if cached == key:
+            print(f"✅ Unchanged since last passing run (cached, {time.monotonic() - started:.2f}s)")
+            return True, EXIT_SUCCESS
+    
+    if not run_stages(stages):
+        return False, EXIT_VALIDATION_FAILED
+    
+    def record(cache: dict) -> dict:
+        cache[rel_path] = key
+        return cache
+    update_json(FAST_CACHE, record)
+    
+    print(f"✅ FAST VALIDATION PASSED in {time.monotonic() - started:.1f}s")
     return True, EXIT_SUCCESS
 
 
@@ -287,6 +641,7 @@ def main() -> int:
         epilog="""
 Examples:
     python validate.py --full         # Full project validation
+    python validate.py src/app.py     # Fast mode: one file and its tests
     python validate.py                 # Show usage
         """
     )
@@ -295,26 +650,41 @@ Examples:
         action="store_true",
         help="Run full project harness"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Maximum harness stages run concurrently (default: all; 1 = sequential)"
+    )
+    parser.add_argument(
+        "--test-workers",
+        type=int,
+        help="pytest processes for the full harness (default: CPU count, max 4; 1 = no sharding)"
+    )
     parser.add_argument(
         "file_path",
         nargs="?",
-        help="Specific file to check (Fast Mode - not yet implemented)"
+        help="Specific file to check (Fast Mode)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-run checks even if this file / tree state was already validated"
     )
     
     args = parser.parse_args()
     
     if args.full:
-        success, exit_code = run_full_harness()
+        success, exit_code = run_full_harness(args.jobs, use_cache=not args.no_cache,
+                                              test_workers=args.test_workers)
         return exit_code
     
-    # Fast mode (not yet implemented)
     if args.file_path:
-        print("⚠️  Fast mode not yet implemented. Use --full for full validation.")
-        return EXIT_GENERAL_ERROR
+        success, exit_code = run_fast_mode(args.file_path, use_cache=not args.no_cache)
+        return exit_code
     
     # No arguments - show usage
     print("Usage: python validate.py --full          # Full project validation")
-    print("       python validate.py <file>          # Fast mode (not yet implemented)")
+    print("       python validate.py <file>          # Fast mode (single file)")
     return EXIT_GENERAL_ERROR
 
 
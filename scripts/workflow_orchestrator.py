@@ -9,13 +9,20 @@ this script provides programmatic enforcement.
 Design: Filesystem is the database. Each task has its own directory
 under .opencode/context/active_tasks/{task_id}/. State is tracked
 via workflow_state.md. This script reads/writes that file — it does
-NOT maintain any in-memory or external state.
+NOT maintain any in-memory or external state. A summary of every task
+is mirrored into .opencode/context/active_tasks_index.json so that `list`
+reads one file instead of one state file per task.
+
+With NSO_STATE_BACKEND=sqlite the state lives in the SQLite state store
+instead (see state_store.py); `python3 state_store.py export` regenerates
+the workflow_state.md files on demand.
 
 Usage:
     python3 workflow_orchestrator.py start --workflow BUILD --task-id rss_collector --agent-id oracle_a3f2
     python3 workflow_orchestrator.py transition --task-id rss_collector --to ARCHITECTURE --agent-id oracle_a3f2
     python3 workflow_orchestrator.py status --task-id rss_collector
-    python3 workflow_orchestrator.py list
+    python3 workflow_orchestrator.py list [--status ACTIVE] [--sort updated_at] [--desc]
+    python3 workflow_orchestrator.py list --rebuild-index
 """
 
 from __future__ import annotations
@@ -32,6 +39,9 @@ from typing import Optional
 SCRIPT_DIR = Path(__file__).parent
 sys.path.insert(0, str(SCRIPT_DIR))
 from gate_check import check_gate
+from file_lock import atomic_write_text, file_lock
+from task_index import TaskIndex
+from state_store import open_state_store
 
 
 # ─── Phase Definitions ──────────────────────────────────────────────
@@ -166,6 +176,96 @@ def _get_state_path(task_id: str) -> Path:
     return _get_task_dir(task_id) / "workflow_state.md"
 
 
+def _get_index() -> TaskIndex:
+    """Get the task index (rebuilt from the task directories if missing)."""
+    return TaskIndex(_get_tasks_dir().with_name("active_tasks_index.json"), rebuild=_scan_tasks)
+
+
+def _index_record(state: WorkflowState) -> dict:
+    """Summary fields stored in the task index for a workflow."""
+    return {
+        "task_id": state.task_id,
+        "workflow": state.workflow,
+        "current_phase": state.current_phase,
+        "status": state.status,
+        "agent_id": state.agent_id,
+        "started_at": state.started_at,
+        "updated_at": state.updated_at,
+    }
+
+
+def _scan_tasks() -> list[dict]:
+    """Build index records by reading every task directory (index rebuild only)."""
+    tasks_dir = _get_tasks_dir()
+    if not tasks_dir.exists():
+        return []
+
+    records = []
+    for task_dir in sorted(tasks_dir.iterdir()):
+        if not task_dir.is_dir():
+            continue
+
+        state_path = task_dir / "workflow_state.md"
+        if state_path.exists():
+            state = WorkflowState.from_markdown(state_path.read_text(), task_dir.name)
+            records.append(_index_record(state))
+        else:
+            records.append({
+                "task_id": task_dir.name,
+                "workflow": "UNKNOWN",
+                "current_phase": "UNKNOWN",
+                "status": "NO_STATE",
+                "agent_id": "",
+                "started_at": "",
+                "updated_at": "",
+            })
+    return records
+
+
+# task list sort field → state store column
+_STORE_ORDER = {"task_id": "key", "started_at": "created_at", "updated_at": "updated_at"}
+
+
+def _state_transaction():
+    """
+    Make a load-modify-write of workflow state atomic: a store transaction,
+    or an advisory lock over the task directory tree for the file backend.
+    """
+    store = open_state_store()
+    return store.transaction() if store else file_lock(_get_tasks_dir())
+
+
+def _load_state(task_id: str) -> Optional[WorkflowState]:
+    """Load a task's workflow state, or None if the task does not exist."""
+    store = open_state_store()
+    if store:
+        data = store.get("workflow", task_id)
+        return WorkflowState(**data) if data else None
+
+    state_path = _get_state_path(task_id)
+    if not state_path.exists():
+        return None
+    return WorkflowState.from_markdown(state_path.read_text(), task_id)
+
+
+def _write_state(state: WorkflowState) -> None:
+    """Persist workflow_state.md and keep the task index in sync."""
+    store = open_state_store()
+    if store:
+        store.put(
+            "workflow",
+            state.task_id,
+            asdict(state),
+            status=state.status,
+            created_at=state.started_at,
+            updated_at=state.updated_at,
+        )
+        return
+
+    atomic_write_text(_get_state_path(state.task_id), state.to_markdown())
+    _get_index().upsert(**_index_record(state))
+
+
 def _now() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -189,12 +289,16 @@ def start_workflow(
             "error": f"Unknown workflow '{workflow}'. Valid: {list(WORKFLOW_PHASES.keys())}",
         }
 
+    with _state_transaction():
+        return _start_workflow(workflow, task_id, agent_id)
+
+
+def _start_workflow(workflow: str, task_id: str, agent_id: str) -> dict:
     task_dir = _get_task_dir(task_id)
-    state_path = _get_state_path(task_id)
 
     # Check if task already exists
-    if state_path.exists():
-        existing = WorkflowState.from_markdown(state_path.read_text(), task_id)
+    existing = _load_state(task_id)
+    if existing:
         if existing.status == "ACTIVE":
             return {
                 "success": False,
@@ -221,7 +325,7 @@ def start_workflow(
         status="ACTIVE",
     )
 
-    state_path.write_text(state.to_markdown())
+    _write_state(state)
 
     return {
         "success": True,
@@ -251,19 +355,21 @@ def transition_phase(
 
     Returns JSON-serializable result dict.
     """
-    to_phase = to_phase.upper()
-    state_path = _get_state_path(task_id)
+    with _state_transaction():
+        return _transition_phase(task_id, to_phase.upper(), agent_id, skip_gate)
+
+
+def _transition_phase(task_id: str, to_phase: str, agent_id: str, skip_gate: bool) -> dict:
     task_dir = _get_task_dir(task_id)
 
     # Load current state
-    if not state_path.exists():
+    state = _load_state(task_id)
+    if state is None:
         return {
             "success": False,
             "error": f"Task '{task_id}' not found. Use 'start' first.",
         }
 
-    state = WorkflowState.from_markdown(state_path.read_text(), task_id)
-
     if state.status != "ACTIVE":
         return {
             "success": False,
@@ -333,7 +439,7 @@ def transition_phase(
     if to_phase == "CLOSURE":
         state.status = "COMPLETE"
 
-    state_path.write_text(state.to_markdown())
+    _write_state(state)
 
     result = {
         "success": True,
@@ -361,15 +467,14 @@ def transition_phase(
 
 def get_status(task_id: str) -> dict:
     """Get current workflow status for a task by reading the filesystem."""
-    state_path = _get_state_path(task_id)
+    state = _load_state(task_id)
 
-    if not state_path.exists():
+    if state is None:
         return {
             "success": False,
             "error": f"Task '{task_id}' not found.",
         }
 
-    state = WorkflowState.from_markdown(state_path.read_text(), task_id)
     phases = WORKFLOW_PHASES.get(state.workflow, [])
 
     current_idx = phases.index(state.current_phase) if state.current_phase in phases else -1
@@ -391,53 +496,69 @@ def get_status(task_id: str) -> dict:
     }
 
 
-def list_tasks() -> dict:
-    """List all tasks and their current status by reading the filesystem."""
-    tasks_dir = _get_tasks_dir()
+def list_tasks(
+    status: Optional[str] = None,
+    sort_by: str = "task_id",
+    descending: bool = False,
+    rebuild_index: bool = False,
+) -> dict:
+    """
+    List tasks and their current status from the task index.
 
-    if not tasks_dir.exists():
+    Args:
+        status: Only include tasks with this status (ACTIVE, COMPLETE, CANCELLED, NO_STATE)
+        sort_by: Field to sort on (task_id, started_at, updated_at)
+        descending: Sort in descending order
+        rebuild_index: Rescan the task directories before listing
+    """
+    store = open_state_store()
+    if store:
+        if sort_by not in _STORE_ORDER:
+            raise ValueError(f"Cannot sort by '{sort_by}'. Valid: {sorted(_STORE_ORDER)}")
+        records = store.query(
+            "workflow",
+            status=status,
+            order_by=_STORE_ORDER[sort_by],
+            descending=descending,
+        )
+    elif not _get_tasks_dir().exists():
         return {"success": True, "tasks": [], "message": "No active_tasks directory"}
-
-    tasks = []
-    for task_dir in sorted(tasks_dir.iterdir()):
-        if not task_dir.is_dir():
-            continue
-
-        state_path = task_dir / "workflow_state.md"
-        if state_path.exists():
-            state = WorkflowState.from_markdown(state_path.read_text(), task_dir.name)
-            tasks.append({
-                "task_id": task_dir.name,
-                "workflow": state.workflow,
-                "current_phase": state.current_phase,
-                "status": state.status,
-                "agent_id": state.agent_id,
-                "updated_at": state.updated_at,
-            })
-        else:
-            tasks.append({
-                "task_id": task_dir.name,
-                "workflow": "UNKNOWN",
-                "current_phase": "UNKNOWN",
-                "status": "NO_STATE",
-                "agent_id": "",
-                "updated_at": "",
-            })
+    else:
+        index = _get_index()
+        if rebuild_index:
+            index.rebuild()
+        records = index.query(status=status, sort_by=sort_by, reverse=descending)
+
+    tasks = [
+        {
+            "task_id": record["task_id"],
+            "workflow": record.get("workflow", "UNKNOWN"),
+            "current_phase": record.get("current_phase", "UNKNOWN"),
+            "status": record.get("status", "NO_STATE"),
+            "agent_id": record.get("agent_id", ""),
+            "updated_at": record.get("updated_at", ""),
+        }
+        for record in records
+    ]
 
     return {"success": True, "tasks": tasks, "count": len(tasks)}
 
 
 def cancel_task(task_id: str, agent_id: str) -> dict:
     """Cancel an active workflow."""
-    state_path = _get_state_path(task_id)
+    with _state_transaction():
+        return _cancel_task(task_id, agent_id)
 
-    if not state_path.exists():
+
+def _cancel_task(task_id: str, agent_id: str) -> dict:
+    state = _load_state(task_id)
+
+    if state is None:
         return {
             "success": False,
             "error": f"Task '{task_id}' not found.",
         }
 
-    state = WorkflowState.from_markdown(state_path.read_text(), task_id)
 
     if state.status != "ACTIVE":
         return {
@@ -454,7 +575,7 @@ def cancel_task(task_id: str, agent_id: str) -> dict:
     })
     state.status = "CANCELLED"
     state.updated_at = now
-    state_path.write_text(state.to_markdown())
+    _write_state(state)
 
     return {
         "success": True,
@@ -489,7 +610,13 @@ def main():
     status_p.add_argument("--task-id", required=True, help="Task identifier")
 
     # list
-    sub.add_parser("list", help="List all tasks and their statuses")
+    list_p = sub.add_parser("list", help="List all tasks and their statuses")
+    list_p.add_argument("--status", help="Only list tasks with this status (e.g., ACTIVE)")
+    list_p.add_argument("--sort", default="task_id", dest="sort_by",
+                        choices=["task_id", "started_at", "updated_at"], help="Sort field")
+    list_p.add_argument("--desc", action="store_true", help="Sort descending")
+    list_p.add_argument("--rebuild-index", action="store_true",
+                        help="Rescan task directories and rebuild the task index")
 
     # cancel
     cancel_p = sub.add_parser("cancel", help="Cancel an active workflow")
@@ -514,7 +641,12 @@ def main():
     elif args.command == "status":
         result = get_status(task_id=args.task_id)
     elif args.command == "list":
-        result = list_tasks()
+        result = list_tasks(
+            status=args.status,
+            sort_by=args.sort_by,
+            descending=args.desc,
+            rebuild_index=args.rebuild_index,
+        )
     elif args.command == "cancel":
         result = cancel_task(
             task_id=args.task_id,
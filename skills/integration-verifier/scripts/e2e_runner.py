@@ -6,12 +6,48 @@ E2E Runner for Integration-Verifier Skill.
 
 from __future__ import annotations
 
+import argparse
+import json
+import os
 import subprocess
+import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+# Shared NSO scripts (<nso>/scripts): sharded runs and structured results when available
+_NSO_SCRIPTS = Path(__file__).resolve().parents[3] / "scripts"
+if _NSO_SCRIPTS.is_dir() and str(_NSO_SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(_NSO_SCRIPTS))
+try:
+    from pytest_shard import run_sharded
+except ImportError:
+    run_sharded = None
+try:
+    from pytest_events import plugin_args, read_events
+except ImportError:
+    plugin_args = read_events = None
+try:
+    from impact_map import select_tests
+except ImportError:
+    select_tests = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from failure_detector import PASSED_OUTCOMES, SKIPPED_OUTCOMES, Failure, FailureDetector, FailureSummary
+from failure_history import HISTORY_PATH, FailureHistory
+from http_pool import HTTPPool, LatencyRecorder, latency_regressions, percentile
+from mock_service import MockService
+
+INTEGRATION_TIMEOUT = 300  # seconds
+LATENCY_BASELINE = Path(".opencode/cache/e2e_latency.json")  # per-endpoint latency of the last passing run
+MOCK_TARGET = "mock:"  # latency key prefix of steps served by the MockService (its port changes per run)
+DEFAULT_BASE_URL = "http://localhost:8080"
+MOCK_FIXTURES = "mock_service.yaml"  # next to the scenario file: served for the run
+SCENARIO_WORKERS = 8  # scenarios run at once; steps are I/O-bound
+
 
 @dataclass
 class ScenarioResult:
@@ -34,6 +70,8 @@ class E2EResults:
     total_duration_ms: int
     results: list[ScenarioResult] = field(default_factory=list)
     artifacts: dict[str, str] = field(default_factory=dict)
+    latency: dict[str, dict[str, float]] = field(default_factory=dict)
+    passed_tests: list[str] = field(default_factory=list)  # node IDs, for FailureHistory
 
     @property
     def all_passed(self) -> bool:
@@ -43,23 +81,82 @@ class E2EResults:
 class E2ERunner:
     """Runner for E2E scenarios and integration tests."""
 
-    def __init__(self, working_dir: Optional[Path] = None):
+    def __init__(self, working_dir: Optional[Path] = None, base_url: str = DEFAULT_BASE_URL):
         self.working_dir = working_dir or Path.cwd()
-
-    def run_integration_tests(self) -> E2EResults:
-        """Run integration tests using pytest."""
+        self.base_url = base_url  # for api_call steps without their own base_url
+        self._latency_target: Optional[str] = None  # MOCK_TARGET while a mock serves base_url
+        self.http = HTTPPool()
+        self.latency = LatencyRecorder()
+
+    def run_integration_tests(self, workers: Optional[int] = None, all_tests: bool = False) -> E2EResults:
+        """
+        Run integration tests using pytest.
+
+        Only the test files affected by the current git diff run (see the
+        NSO impact_map module); all of them with `all_tests`, outside git,
+        on a clean tree, or when the diff has changes the map cannot
+        account for. A diff that affects no test runs nothing: the result
+        has artifacts["selection"] == "none" and is not `all_passed`.
+
+        Test files are sharded across `workers` pytest processes (default:
+        CPU count, at most 4) when the NSO pytest_shard module is available;
+        workers=1 runs a single pytest process, whose per-test results are
+        read from the NSO pytest_events plugin (terminal output is only
+        parsed when the plugin is unavailable).
+        """
         start_time = time.time()
 
-        try:
-            result = subprocess.run(
-                ["python3", "-m", "pytest", "tests/integration/", "-v", "--tb=short"],
-                cwd=self.working_dir,
-                capture_output=True,
-                text=True,
-                timeout=300,
+        paths = ["tests/integration/"]
+        selection = None
+        if select_tests is not None and not all_tests:
+            try:
+                selection = select_tests(["tests/integration"], root=self.working_dir)
+            except Exception:
+                selection = None  # could not tell: run everything
+        if selection == []:
+            return E2EResults(
+                scenarios_run=0,
+                passed=0,
+                failed=0,
+                skipped=0,
+                total_duration_ms=int((time.time() - start_time) * 1000),
+                artifacts={"selection": "none"},
             )
+        if selection is not None:
+            paths = selection
+
+        if run_sharded is not None and workers != 1:
+            results = self._run_integration_tests_sharded(workers, start_time, paths)
+        else:
+            results = self._run_integration_tests_serial(start_time, paths)
+        if selection is not None:
+            results.artifacts["selection"] = f"{len(selection)} affected test file(s)"
+        return results
+
+    def _run_integration_tests_serial(self, start_time: float, paths: list[str]) -> E2EResults:
+        """Run integration tests in one pytest process."""
+        try:
+            with tempfile.TemporaryDirectory(prefix="nso-e2e-") as tmp:
+                events_path = Path(tmp) / "events.jsonl"
+                cmd = ["python3", "-m", "pytest", *paths, "-v", "--tb=short"]
+                env = None
+                if plugin_args is not None:
+                    events_args, env = plugin_args(events_path)
+                    cmd += events_args
+                result = subprocess.run(
+                    cmd,
+                    cwd=self.working_dir,
+                    capture_output=True,
+                    text=True,
+                    timeout=INTEGRATION_TIMEOUT,
+                    env=env,
+                )
+                events = list(read_events(events_path)) if read_events is not None else []
 
             output = result.stdout + result.stderr
+            if any(event.get("event") == "finish" for event in events):
+                return self._results_from_events(events, output, start_time)
+
             passed, failed, skipped = self._parse_pytest_output(output)
 
             return E2EResults(
@@ -71,6 +168,8 @@ class E2ERunner:
                 artifacts={"pytest_output": output},
             )
         except subprocess.TimeoutExpired:
+            return self._integration_timeout(start_time)
+        except Exception as e:
             return E2EResults(
                 scenarios_run=0,
                 passed=0,
@@ -82,11 +181,52 @@ class E2ERunner:
                         name="integration_test_suite",
                         passed=False,
                         duration_ms=int((time.time() - start_time) * 1000),
-                        error_type="TIMEOUT",
-                        error_message="Integration tests timed out after 300 seconds",
+                        error_type="DEPENDENCY",
+                        error_message=f"Failed to run tests: {str(e)}",
                     )
                 ],
             )
+
+    def _results_from_events(self, events: list[dict], output: str, start_time: float) -> E2EResults:
+        """Build results from a pytest_events stream: exact counts, one result per failing test."""
+        tests = [event for event in events if event.get("event") == "test"]
+        results = [
+            ScenarioResult(
+                name=event["nodeid"],
+                passed=False,
+                duration_ms=int(event.get("duration", 0) * 1000),
+                error_message=event.get("message") or None,
+            )
+            for event in tests
+            if event["outcome"] in ("failed", "error")
+        ]
+        passed_tests = FailureDetector().passed_tests(tests)
+        passed = len(passed_tests)
+        skipped = sum(1 for event in tests if event["outcome"] in SKIPPED_OUTCOMES)
+        failed = len(results)
+        return E2EResults(
+            scenarios_run=passed + failed,
+            passed=passed,
+            failed=failed,
+            skipped=skipped,
+            total_duration_ms=int((time.time() - start_time) * 1000),
+            results=results,
+            artifacts={"pytest_output": output},
+            passed_tests=passed_tests,
+        )
+
+    def _run_integration_tests_sharded(
+        self, workers: Optional[int], start_time: float, paths: list[str]
+    ) -> E2EResults:
+        """Run integration tests split across pytest processes and merge the results."""
+        try:
+            report = run_sharded(
+                paths,
+                workers,
+                ["--tb=short"],
+                timeout=INTEGRATION_TIMEOUT,
+                cwd=self.working_dir,
+            )
         except Exception as e:
             return E2EResults(
                 scenarios_run=0,
@@ -105,8 +245,88 @@ class E2ERunner:
                 ],
             )
 
-    def run_e2e_scenarios(self, scenario_file: Optional[Path] = None) -> E2EResults:
-        """Run E2E scenarios from a YAML file."""
+        if report.timed_out:
+            return self._integration_timeout(start_time)
+
+        results = [
+            ScenarioResult(
+                name=outcome.node_id,
+                passed=False,
+                duration_ms=int(outcome.duration * 1000),
+                error_message=outcome.message,
+            )
+            for outcome in report.failures()
+        ]
+        if not report.success and not results:
+            # A shard exited abnormally without reporting a failing test
+            results.append(
+                ScenarioResult(
+                    name="integration_test_suite",
+                    passed=False,
+                    duration_ms=int((time.time() - start_time) * 1000),
+                    error_type="DEPENDENCY",
+                    error_message=f"pytest exited with codes {report.returncodes}",
+                )
+            )
+
+        # Same outcome definitions as _results_from_events
+        passed_tests = [o.node_id for o in report.outcomes if o.outcome in PASSED_OUTCOMES]
+        passed = len(passed_tests)
+        skipped = sum(1 for o in report.outcomes if o.outcome in SKIPPED_OUTCOMES)
+        failed = len(results)
+        return E2EResults(
+            scenarios_run=passed + failed,
+            passed=passed,
+            failed=failed,
+            skipped=skipped,
+            total_duration_ms=int((time.time() - start_time) * 1000),
+            results=results,
+            artifacts={"pytest_output": report.output, "shards": str(report.shards)},
+            passed_tests=passed_tests,
+        )
+
+    def _integration_timeout(self, start_time: float) -> E2EResults:
+        return E2EResults(
+            scenarios_run=0,
+            passed=0,
+            failed=1,
+            skipped=0,
+            total_duration_ms=int((time.time() - start_time) * 1000),
+            results=[
+                ScenarioResult(
+                    name="integration_test_suite",
+                    passed=False,
+                    duration_ms=int((time.time() - start_time) * 1000),
+                    error_type="TIMEOUT",
+                    error_message=f"Integration tests timed out after {INTEGRATION_TIMEOUT} seconds",
+                )
+            ],
+        )
+
+    def run_e2e_scenarios(
+        self,
+        scenario_file: Optional[Path] = None,
+        workers: Optional[int] = None,
+        mock_fixtures: Optional[Path] = None,
+    ) -> E2EResults:
+        """
+        Run E2E scenarios from a YAML file.
+
+        Up to `workers` scenarios (default: SCENARIO_WORKERS) run at once.
+        A scenario marked `serial: true` runs alone, after the concurrent
+        ones finish. Results are always in file order.
+
+        API step latencies are summarized per endpoint in `latency`, keyed
+        by method and full URL ("GET http://api:8080/users"; "GET mock:/users"
+        for mock-served steps), so each target keeps its own baseline. An
+        endpoint whose p95 regressed against the last passing run (see
+        LATENCY_BASELINE) is reported as a failed result; a passing run
+        becomes the new baseline.
+
+        If `mock_fixtures` is given, or a MOCK_FIXTURES file sits next to
+        the scenario file, a local MockService serves it for the run and
+        steps without a base_url are sent to it.
+        """
         start_time = time.time()
 
         if scenario_file is None:
@@ -146,11 +366,25 @@ class E2ERunner:
             with open(scenario_file) as f:
                 scenarios = yaml.safe_load(f) or []
 
-            results: list[ScenarioResult] = []
-
-            for scenario in scenarios:
-                result = self._run_single_scenario(scenario)
-                results.append(result)
+            if mock_fixtures is None and (scenario_file.parent / MOCK_FIXTURES).exists():
+                mock_fixtures = scenario_file.parent / MOCK_FIXTURES
+            mock = MockService.from_file(mock_fixtures) if mock_fixtures else None
+
+            self.latency = LatencyRecorder()
+            base_url = self.base_url
+            try:
+                if mock:
+                    self.base_url = mock.start()
+                    self._latency_target = MOCK_TARGET
+                results = self._run_scenarios(scenarios, workers or SCENARIO_WORKERS)
+            finally:
+                self.base_url = base_url
+                self._latency_target = None
+                self.http.close()
+                if mock:
+                    mock.stop()
+            latency = self.latency.summary()
+            results.extend(self._check_latency_baseline(latency, all(r.passed for r in results)))
 
             passed = sum(1 for r in results if r.passed)
             failed = sum(1 for r in results if not r.passed)
@@ -162,7 +396,9 @@ class E2ERunner:
                 skipped=0,
                 total_duration_ms=int((time.time() - start_time) * 1000),
                 results=results,
-                artifacts={"scenario_file": str(scenario_file)},
+                artifacts={"scenario_file": str(scenario_file),
+                           **({"mock_fixtures": str(mock_fixtures)} if mock_fixtures else {})},
+                latency=latency,
             )
 
         except Exception as e:
@@ -183,6 +419,54 @@ class E2ERunner:
                 ],
             )
 
+    def _check_latency_baseline(
+        self, latency: dict[str, dict[str, float]], passed: bool
+    ) -> list[ScenarioResult]:
+        """Failed results for endpoints slower than the baseline; a clean run updates it."""
+        path = self.working_dir / LATENCY_BASELINE
+        try:
+            with open(path) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError):
+            baseline = {}
+
+        regressions = [
+            ScenarioResult(
+                name=f"latency: {endpoint}",
+                passed=False,
+                duration_ms=int(now),
+                error_type="PERFORMANCE",
+                error_message=f"p95 latency regressed from {before:.0f}ms to {now:.0f}ms",
+            )
+            for endpoint, before, now in latency_regressions(latency, baseline)
+        ]
+
+        if passed and not regressions and latency:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "w") as f:
+                json.dump({**baseline, **latency}, f, indent=2)
+            os.replace(tmp, path)
+        return regressions
+
+    def _run_scenarios(self, scenarios: list[dict], workers: int) -> list[ScenarioResult]:
+        """Run scenarios concurrently (serial ones alone, last); results in input order."""
+        if workers <= 1:
+            return [self._run_single_scenario(scenario) for scenario in scenarios]
+
+        results: list[Optional[ScenarioResult]] = [None] * len(scenarios)
+        concurrent = [i for i, scenario in enumerate(scenarios) if not scenario.get("serial")]
+        if concurrent:
+            with ThreadPoolExecutor(max_workers=min(workers, len(concurrent))) as pool:
+                done = pool.map(self._run_single_scenario, [scenarios[i] for i in concurrent])
+                for i, result in zip(concurrent, done):
+                    results[i] = result
+
+        for i, scenario in enumerate(scenarios):
+            if scenario.get("serial"):
+                results[i] = self._run_single_scenario(scenario)
+        return results
+
     def _run_single_scenario(self, scenario: dict) -> ScenarioResult:
         """Run a single E2E scenario."""
         start_time = time.time()
@@ -219,41 +503,73 @@ class E2ERunner:
             )
 
     def _execute_step(self, step: dict) -> ScenarioResult:
-        """Execute a single scenario step."""
+        """Execute a single scenario step, timed; API calls go through the pooled client."""
+        start = time.perf_counter()
+        result = self._run_step(step)
+        result.duration_ms = int((time.perf_counter() - start) * 1000)
+        return result
+
+    def _run_step(self, step: dict) -> ScenarioResult:
         step_type = step.get("type", "api_call")
         endpoint = step.get("endpoint", "")
         expected_status = step.get("expected_status", 200)
 
         try:
             if step_type == "api_call":
-                import requests
-
                 method = step.get("method", "GET").lower()
-                url = f"{step.get('base_url', 'http://localhost:8080')}{endpoint}"
+                base_url = step.get("base_url", self.base_url)
+                url = f"{base_url}{endpoint}"
                 headers = step.get("headers", {})
                 body = step.get("body")
 
-                response = requests.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=body,
-                    timeout=step.get("timeout", 30),
-                )
-
-                passed = response.status_code == expected_status
-
-                if not passed:
+                name = f"{method.upper()} {endpoint}"
+                target = base_url if "base_url" in step or self._latency_target is None else self._latency_target
+                latency_key = f"{method.upper()} {target}{endpoint}"
+
+                def send() -> tuple[int, float]:
+                    response = self.http.request(
+                        method,
+                        url,
+                        headers=headers,
+                        json_body=body,
+                        timeout=step.get("timeout", 30),
+                    )
+                    self.latency.record(latency_key, response.elapsed_ms)
+                    return response.status, response.elapsed_ms
+
+                # One request, `repeat: N` sequential ones, or a `load` block
+                load = step.get("load")
+                started = time.perf_counter()
+                if load:
+                    with ThreadPoolExecutor(max_workers=max(1, load.get("concurrency", 1))) as pool:
+                        samples = list(pool.map(lambda _: send(), range(load.get("requests", 1))))
+                else:
+                    samples = [send() for _ in range(max(1, step.get("repeat", 1)))]
+                elapsed = time.perf_counter() - started
+
+                bad = [status for status, _ in samples if status != expected_status]
+                if bad:
                     return ScenarioResult(
-                        name=f"{method.upper()} {endpoint}",
+                        name=name,
                         passed=False,
                         duration_ms=0,
                         error_type="RESPONSE",
-                        error_message=f"Expected {expected_status}, got {response.status_code}",
+                        error_message=f"Expected {expected_status}, got {bad[0]}"
+                        + (f" ({len(bad)}/{len(samples)} requests)" if len(samples) > 1 else ""),
+                    )
+
+                violation = self._check_budget(step, [ms for _, ms in samples], elapsed)
+                if violation:
+                    return ScenarioResult(
+                        name=name,
+                        passed=False,
+                        duration_ms=0,
+                        error_type="PERFORMANCE",
+                        error_message=violation,
                     )
 
                 return ScenarioResult(
-                    name=f"{method.upper()} {endpoint}",
+                    name=name,
                     passed=True,
                     duration_ms=0,
                 )
@@ -293,7 +609,7 @@ class E2ERunner:
                     error_message=f"Unknown step type: {step_type}",
                 )
 
-        except subprocess.TimeoutExpired:
+        except (subprocess.TimeoutExpired, TimeoutError):
             return ScenarioResult(
                 name=step.get("command", "")[:50] if step_type == "shell_command" else endpoint,
                 passed=False,
@@ -310,6 +626,31 @@ class E2ERunner:
                 error_message=str(e),
             )
 
+    def _check_budget(self, step: dict, latencies: list[float], elapsed: float) -> Optional[str]:
+        """
+        Check an API step against its performance budget.
+
+        Budget keys: `max_latency_ms` (slowest request), `p95_ms` (over
+        `repeat` or `load` requests) and `min_rps` (throughput of a `load`
+        block). Returns a description of the first violation, or None.
+        """
+        max_latency = step.get("max_latency_ms")
+        if max_latency is not None and max(latencies) > max_latency:
+            return f"Latency {max(latencies):.0f}ms exceeds budget of {max_latency}ms"
+
+        p95_budget = step.get("p95_ms")
+        if p95_budget is not None:
+            p95 = percentile(latencies, 95)
+            if p95 > p95_budget:
+                return f"p95 latency {p95:.0f}ms over {len(latencies)} requests exceeds budget of {p95_budget}ms"
+
+        min_rps = step.get("min_rps")
+        if min_rps is not None and step.get("load"):
+            rps = len(latencies) / elapsed if elapsed > 0 else float("inf")
+            if rps < min_rps:
+                return f"Throughput {rps:.1f} req/s is below target of {min_rps} req/s"
+        return None
+
     def _parse_pytest_output(self, output: str) -> tuple[int, int, int]:
         """Parse pytest output to extract pass/fail/skip counts."""
         passed = failed = skipped = 0
@@ -348,6 +689,28 @@ class E2ERunner:
 
         return passed, failed, skipped
 
+    def triage(
+        self, results: E2EResults, history: Optional[FailureHistory] = None
+    ) -> tuple[list[Failure], FailureSummary]:
+        """
+        Classify the failures of a run and fold the run into the failure history.
+
+        Failures the history knows as flaky are listed in the summary's
+        known_flakes and do not count toward rollback. A run that executed
+        no test is not recorded.
+
+        Args:
+            history: Defaults to the history file under the working directory.
+        """
+        detector = FailureDetector()
+        if history is None:
+            history = FailureHistory(self.working_dir / HISTORY_PATH)
+        failures = detector.analyze(results)
+        summary = detector.summarize(failures, history)
+        if results.scenarios_run or results.failed:
+            history.record_run(failures, passed=results.passed_tests)
+        return failures, summary
+
     def generate_report(self, results: E2EResults) -> str:
         """Generate a summary report from E2E results."""
         lines = [
@@ -394,12 +757,21 @@ class E2ERunner:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run integration tests")
+    parser.add_argument("--all", action="store_true", help="Run every integration test, not only those the diff affects")
+    parser.add_argument("--workers", type=int, help="pytest processes (1 = no sharding)")
+    args = parser.parse_args()
+
     runner = E2ERunner()
 
     print("Running integration tests...")
-    int_results = runner.run_integration_tests()
+    int_results = runner.run_integration_tests(args.workers, all_tests=args.all)
     print(f"Integration: {int_results.passed} passed, {int_results.failed} failed")
 
     print("\nGenerating report...")
     report = runner.generate_report(int_results)
     print(report)
+
+    failures, summary = runner.triage(int_results)
+    if failures:
+        print(FailureDetector().format_report(failures, summary))
@@ -3,14 +3,27 @@ Failure Detector for Integration-Verifier Skill.
 
 Detects and classifies failures from integration and E2E test results.
 
+Messages are classified by one precompiled keyword matcher: a single
+regex pass finds every keyword with its position, and the category is the
+highest-priority one that matched (KEYWORD_PRIORITY). Benchmark it with
+`python3 failure_detector.py --benchmark 20000`.
+
 @implements: IV-2
 """
 
 from __future__ import annotations
 
+import argparse
+import json
+import random
+import re
+import time
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from functools import cached_property
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterable, Iterator, Optional, Union
 
 
 class FailureType(Enum):
@@ -21,9 +34,16 @@ class FailureType(Enum):
     TIMEOUT = "TIMEOUT"
     DEPENDENCY = "DEPENDENCY"
     DATA = "DATA"
+    PERFORMANCE = "PERFORMANCE"
     UNKNOWN = "UNKNOWN"
 
 
+# pytest outcomes counted as a pass (an unexpected pass still passed) and as
+# not run; every runner and the failure history share these definitions
+PASSED_OUTCOMES = ("passed", "xpassed")
+SKIPPED_OUTCOMES = ("skipped", "xfailed")
+
+
 class Severity(Enum):
     """Failure severity levels."""
     CRITICAL = "CRITICAL"
@@ -62,6 +82,84 @@ class FailureSummary:
     critical_failures: list[Failure]
     rollback_recommended: bool
     summary_message: str
+    known_flakes: list[Failure] = field(default_factory=list)
+
+
+def _trie_pattern(keywords: list[str]) -> str:
+    """
+    Regex alternation of keywords, factored into a prefix trie.
+
+    "timed out|timeout|token" becomes "t(?:imeout|imed out|oken)"-style
+    nesting, so at each position the engine follows one branch per
+    character instead of trying every keyword in turn.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        ends = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and not ends else f"(?:{'|'.join(branches)})"
+        return f"{body}?" if ends else body
+
+    return build(trie)
+
+
+class KeywordClassifier:
+    """
+    Multi-keyword matcher compiled into one regex (a prefix trie).
+
+    Keywords match anywhere in the message, as plain substrings
+    ("timeout" matches "ReadTimeout", "dns" matches "DNSLookupError").
+    The trie sits in a lookahead, so the scan tries every position and
+    keywords overlapping a longer match are still reported. A keyword
+    may belong to several categories; `classify` resolves overlaps by
+    priority, not by the order the keyword lists happen to be checked in.
+    """
+
+    def __init__(self, table: dict[FailureType, list[str]], priority: list[FailureType]):
+        self.categories: dict[str, list[FailureType]] = {}
+        for category, keywords in table.items():
+            for keyword in keywords:
+                self.categories.setdefault(keyword.lower(), []).append(category)
+        self.rank = {category: i for i, category in enumerate(priority)}
+        # The trie is greedy, so the longest keyword at a position is
+        # captured; shorter keywords it starts with match there too
+        self.prefixes = {
+            keyword: [k for k in self.categories if keyword.startswith(k)]
+            for keyword in self.categories
+        }
+        self.pattern = re.compile(f"(?=({_trie_pattern(list(self.categories))}))")
+
+    def _scan(self, message: str) -> Iterator[tuple[int, str]]:
+        for match in self.pattern.finditer(message.lower()):
+            for keyword in self.prefixes[match.group(1)]:
+                yield match.start(), keyword
+
+    def matches(self, message: str) -> list[tuple[FailureType, int, str]]:
+        """Every (category, position, keyword) in the lowercased message, in one pass."""
+        return [(category, position, keyword)
+                for position, keyword in self._scan(message)
+                for category in self.categories[keyword]]
+
+    def classify(self, message: str) -> FailureType:
+        """Highest-priority category that matched, or UNKNOWN."""
+        best = FailureType.UNKNOWN
+        best_rank = len(self.rank)
+        for _position, keyword in self._scan(message):
+            for category in self.categories[keyword]:
+                rank = self.rank.get(category, len(self.rank))
+                if rank < best_rank:
+                    best, best_rank = category, rank
+            if best_rank == 0:
+                break  # nothing can outrank it
+        return best
 
 
 class FailureDetector:
@@ -75,7 +173,6 @@ class FailureDetector:
         "dns",
         "socket",
         "no route to host",
-        "timeout",
     ]
 
     RESPONSE_KEYWORDS = [
@@ -122,6 +219,41 @@ class FailureDetector:
         "schema",
     ]
 
+    PERFORMANCE_KEYWORDS = [
+        "latency",
+        "throughput",
+        "exceeds budget",
+        "req/s",
+        "too slow",
+    ]
+
+    # When a message matches several categories, the first one listed wins:
+    # "connection timed out" is a TIMEOUT, "p95 latency ... expected" is PERFORMANCE.
+    KEYWORD_PRIORITY = [
+        FailureType.TIMEOUT,
+        FailureType.PERFORMANCE,
+        FailureType.NETWORK,
+        FailureType.AUTH,
+        FailureType.DEPENDENCY,
+        FailureType.DATA,
+        FailureType.RESPONSE,
+    ]
+
+    @cached_property
+    def classifier(self) -> KeywordClassifier:
+        return KeywordClassifier(
+            {
+                FailureType.NETWORK: self.NETWORK_KEYWORDS,
+                FailureType.RESPONSE: self.RESPONSE_KEYWORDS,
+                FailureType.AUTH: self.AUTH_KEYWORDS,
+                FailureType.TIMEOUT: self.TIMEOUT_KEYWORDS,
+                FailureType.DEPENDENCY: self.DEPENDENCY_KEYWORDS,
+                FailureType.DATA: self.DATA_KEYWORDS,
+                FailureType.PERFORMANCE: self.PERFORMANCE_KEYWORDS,
+            },
+            self.KEYWORD_PRIORITY,
+        )
+
     def analyze(self, test_results) -> list[Failure]:
         """Analyze test results and detect failures."""
         failures: list[Failure] = []
@@ -137,6 +269,52 @@ class FailureDetector:
 
         return failures
 
+    def analyze_events(self, events: Union[str, Path, Iterable[dict]]) -> list[Failure]:
+        """
+        Detect failures from a pytest_events stream (see scripts/pytest_events.py).
+
+        Args:
+            events: Path of the JSONL event file, or already-parsed events.
+                Failed and errored tests are classified from their node ID
+                and failure message; no terminal output is parsed.
+        """
+        if isinstance(events, (str, Path)):
+            events = self._read_events(Path(events))
+
+        failures: list[Failure] = []
+        for event in events:
+            if event.get("event") != "test" or event.get("outcome") not in ("failed", "error"):
+                continue
+            result = SimpleNamespace(
+                name=event.get("nodeid", "unknown_test"),
+                error_type=None,
+                error_message=event.get("message", ""),
+                duration_ms=int(event.get("duration", 0) * 1000),
+            )
+            failure = self._classify_failure(result)
+            if failure:
+                failures.append(failure)
+        return failures
+
+    def passed_tests(self, events: Union[str, Path, Iterable[dict]]) -> list[str]:
+        """Node IDs of the tests that passed in a pytest_events stream (for FailureHistory)."""
+        if isinstance(events, (str, Path)):
+            events = self._read_events(Path(events))
+        return [event.get("nodeid", "") for event in events
+                if event.get("event") == "test" and event.get("outcome") in PASSED_OUTCOMES]
+
+    @staticmethod
+    def _read_events(path: Path) -> Iterable[dict]:
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            return
+
     def analyze_scenario_result(self, result) -> Optional[Failure]:
         """Analyze a single scenario result for failures."""
         if result.passed:
@@ -177,38 +355,13 @@ class FailureDetector:
         """Detect the type of failure from error information."""
         # If error type is already set and valid, use it
         try:
-            return FailureType(error_type)
+            if error_type != FailureType.UNKNOWN.value:
+                return FailureType(error_type)
         except ValueError:
             pass
 
         # Otherwise, detect from message
-        message_lower = error_message.lower()
-
-        for keyword in self.NETWORK_KEYWORDS:
-            if keyword in message_lower:
-                return FailureType.NETWORK
-
-        for keyword in self.AUTH_KEYWORDS:
-            if keyword in message_lower:
-                return FailureType.AUTH
-
-        for keyword in self.TIMEOUT_KEYWORDS:
-            if keyword in message_lower:
-                return FailureType.TIMEOUT
-
-        for keyword in self.DEPENDENCY_KEYWORDS:
-            if keyword in message_lower:
-                return FailureType.DEPENDENCY
-
-        for keyword in self.DATA_KEYWORDS:
-            if keyword in message_lower:
-                return FailureType.DATA
-
-        for keyword in self.RESPONSE_KEYWORDS:
-            if keyword in message_lower:
-                return FailureType.RESPONSE
-
-        return FailureType.UNKNOWN
+        return self.classifier.classify(error_message)
 
     def _determine_severity(self, failure_type: FailureType, test_name: str) -> Severity:
         """Determine failure severity based on type and context."""
@@ -221,6 +374,7 @@ class FailureDetector:
         high_types = {
             FailureType.NETWORK,
             FailureType.TIMEOUT,
+            FailureType.PERFORMANCE,
         }
 
         medium_types = {
@@ -273,6 +427,11 @@ class FailureDetector:
                 "Review data validation rules and constraints. "
                 "Check for null values, type mismatches, or schema violations."
             ),
+            FailureType.PERFORMANCE: (
+                "The endpoint missed its latency or throughput budget. "
+                "Profile the handler and its queries, compare with the previous release, "
+                "and only raise the budget if the slowdown is intended."
+            ),
             FailureType.UNKNOWN: (
                 "Investigate the root cause of the failure. "
                 "Check logs for more detailed error information."
@@ -281,38 +440,64 @@ class FailureDetector:
 
         return recommendations.get(failure_type, recommendations[FailureType.UNKNOWN])
 
-    def summarize(self, failures: list[Failure]) -> FailureSummary:
-        """Generate a summary from detected failures."""
+    def summarize(self, failures: list[Failure], history=None) -> FailureSummary:
+        """
+        Generate a summary from detected failures.
+
+        Args:
+            history: Optional FailureHistory (failure_history.py). Failures
+                it knows as flaky are listed in `known_flakes`, annotated
+                with their recurrence, and do not count toward rollback;
+                CRITICAL failures always do.
+        """
         by_type: dict[FailureType, int] = {}
         by_severity: dict[Severity, int] = {}
         critical_failures: list[Failure] = []
+        known_flakes: list[Failure] = []
+        actionable: list[Failure] = []
 
         for failure in failures:
             by_type[failure.failure_type] = by_type.get(failure.failure_type, 0) + 1
             by_severity[failure.severity] = by_severity.get(failure.severity, 0) + 1
 
+            if (history is not None and failure.severity != Severity.CRITICAL
+                    and history.is_known_flake(failure)):
+                entry = history.lookup(failure)
+                failure.context.update(
+                    known_flake="true",
+                    seen=str(entry["count"]),
+                    flakiness=f"{entry['flakiness']:.0%}",
+                )
+                known_flakes.append(failure)
+                continue
+            actionable.append(failure)
+
             if failure.severity == Severity.CRITICAL:
                 critical_failures.append(failure)
 
         # Determine if rollback is recommended
         rollback_recommended = (
-            len([f for f in failures if f.severity == Severity.CRITICAL]) > 0
-            or len([f for f in failures if f.severity == Severity.HIGH]) >= 3
+            len([f for f in actionable if f.severity == Severity.CRITICAL]) > 0
+            or len([f for f in actionable if f.severity == Severity.HIGH]) >= 3
         )
 
         # Generate summary message
         if not failures:
             summary_message = "No failures detected."
+        elif not actionable:
+            summary_message = f"Only known flaky failures: {len(known_flakes)} (not blocking)."
         elif rollback_recommended:
             summary_message = (
                 f"Rollback recommended: {len(critical_failures)} critical failure(s), "
-                f"{len([f for f in failures if f.severity == Severity.HIGH])} high severity failure(s)."
+                f"{len([f for f in actionable if f.severity == Severity.HIGH])} high severity failure(s)."
             )
         else:
             summary_message = (
-                f"Validation issues found: {len(failures)} failure(s). "
+                f"Validation issues found: {len(actionable)} failure(s). "
                 "Review recommended before proceeding."
             )
+        if known_flakes and actionable:
+            summary_message += f" {len(known_flakes)} known flaky failure(s) skipped."
 
         return FailureSummary(
             total_failures=len(failures),
@@ -321,6 +506,7 @@ class FailureDetector:
             critical_failures=critical_failures,
             rollback_recommended=rollback_recommended,
             summary_message=summary_message,
+            known_flakes=known_flakes,
         )
 
     def format_report(self, failures: list[Failure], summary: FailureSummary) -> str:
@@ -363,7 +549,13 @@ class FailureDetector:
             lines.append(f"{severity_emoji} [{failure.severity.value}] {failure.test_name}")
             lines.append(f"   Type: {failure.failure_type.value}")
             lines.append(f"   Message: {failure.message}")
-            lines.append(f"   Recommendation: {failure.recommendation}")
+            if failure.context.get("known_flake"):
+                lines.append(
+                    f"   Known flake: seen {failure.context['seen']} times, "
+                    f"fails in {failure.context['flakiness']} of runs (not re-investigated)"
+                )
+            else:
+                lines.append(f"   Recommendation: {failure.recommendation}")
 
         lines.append("")
         lines.append("=" * 60)
@@ -373,7 +565,80 @@ class FailureDetector:
         return "\n".join(lines)
 
 
+def benchmark(count: int = 20000, seed: int = 0) -> dict[str, float]:
+    """
+    Classify `count` synthetic failure messages and report throughput.
+
+    Compares the compiled classifier with a plain scan of the keyword
+    lists (lowercase, then `in` per keyword) over the same messages.
+    """
+    detector = FailureDetector()
+    rng = random.Random(seed)
+    keywords = sorted(detector.classifier.categories)
+    filler = ("request", "handler", "user", "service", "returned", "while", "calling",
+              "payload", "at", "line", "processing", "the", "for", "module")
+    messages = []
+    for _ in range(count):
+        words = rng.choices(filler, k=rng.randint(8, 40))
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        messages.append(" ".join(words).capitalize())
+
+    lists = [(category, [k.lower() for k in kws]) for category, kws in (
+        (FailureType.TIMEOUT, detector.TIMEOUT_KEYWORDS),
+        (FailureType.PERFORMANCE, detector.PERFORMANCE_KEYWORDS),
+        (FailureType.NETWORK, detector.NETWORK_KEYWORDS),
+        (FailureType.AUTH, detector.AUTH_KEYWORDS),
+        (FailureType.DEPENDENCY, detector.DEPENDENCY_KEYWORDS),
+        (FailureType.DATA, detector.DATA_KEYWORDS),
+        (FailureType.RESPONSE, detector.RESPONSE_KEYWORDS),
+    )]
+
+    def scan(message: str) -> FailureType:
+        lowered = message.lower()
+        for category, kws in lists:
+            if any(k in lowered for k in kws):
+                return category
+        return FailureType.UNKNOWN
+
+    timings = {}
+    for label, classify in (("compiled", detector.classifier.classify), ("scan", scan)):
+        start = time.perf_counter()
+        for message in messages:
+            classify(message)
+        timings[label] = time.perf_counter() - start
+    return {
+        "messages": count,
+        "compiled_per_sec": count / timings["compiled"],
+        "scan_per_sec": count / timings["scan"],
+    }
+
+
 if __name__ == "__main__":
+    from failure_history import HISTORY_PATH, FailureHistory
+
+    parser = argparse.ArgumentParser(description="Failure classification demo and benchmark")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Classify N synthetic messages and report throughput")
+    parser.add_argument("--events", type=Path, help="Classify the failures of a pytest_events file and record the run")
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH, help="Failure history file")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        stats = benchmark(args.benchmark)
+        print(f"{stats['messages']} messages: "
+              f"compiled {stats['compiled_per_sec']:,.0f}/s, keyword scan {stats['scan_per_sec']:,.0f}/s")
+        raise SystemExit(0)
+
+    if args.events:
+        detector = FailureDetector()
+        events = list(detector._read_events(args.events))
+        failures = detector.analyze_events(events)
+        history = FailureHistory(args.history)
+        summary = detector.summarize(failures, history)
+        history.record_run(failures, passed=detector.passed_tests(events))
+        print(detector.format_report(failures, summary))
+        raise SystemExit(1 if summary.rollback_recommended else 0)
+
     # Demo usage
     from e2e_runner import ScenarioResult
     from failure_detector import FailureDetector, Failure, FailureType, Severity
@@ -406,6 +671,6 @@ if __name__ == "__main__":
     ]
 
     failures = detector.analyze(sample_failures)
-    summary = detector.summarize(failures)
+    summary = detector.summarize(failures, FailureHistory(args.history))
 
     print(detector.format_report(failures, summary))
@@ -0,0 +1,198 @@
+"""
+Failure History for Integration-Verifier Skill.
+
+Remembers failures across runs so recurring flaky failures are recognised
+instead of re-investigated every time.
+
+A failure's fingerprint is a hash of its test name and its normalized
+message: numbers, hex IDs, UUIDs, quoted values and paths are replaced by
+placeholders, so "timed out after 31.2s" and "timed out after 29.8s" are
+the same failure. Each run updates the store incrementally:
+
+- per fingerprint: count, first/last seen (time and run number), failure
+  type, sample message
+- per test: runs observed, runs failed and the last run it passed in, for
+  the flakiness rate
+
+A failure is a known flake when it has recurred (MIN_RECURRENCE), is
+intermittent — its test passed in some run after the failure was first
+seen — and the test fails in at most FLAKY_MAX_RATE of its runs. A test
+that always fails is broken, and one that passed for a long time and now
+fails every run has regressed; neither is flaky.
+
+Usage:
+    history = FailureHistory(Path(".opencode/cache/failure_history.json"))
+    history.record_run(failures, passed=["test_ok", ...])
+    history.is_known_flake(failure)
+
+    python3 failure_history.py [--path FILE]
+
+@implements: IV-2
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+HISTORY_PATH = Path(".opencode/cache/failure_history.json")
+HISTORY_VERSION = 2
+MIN_RECURRENCE = 2
+FLAKY_MAX_RATE = 0.5
+MAX_FINGERPRINTS = 2000  # least recently seen are dropped beyond this
+MESSAGE_CHARS = 300
+
+_NORMALIZERS = [
+    (re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I), "<uuid>"),
+    (re.compile(r"0x[0-9a-f]+|\b[0-9a-f]{12,}\b", re.I), "<hex>"),
+    (re.compile(r"(?:[a-z]:)?(?:[\\/][\w.-]+){2,}", re.I), "<path>"),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "<str>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_message(message: str) -> str:
+    """Message with run-specific details replaced by placeholders."""
+    text = message.strip().lower()[:MESSAGE_CHARS * 4]
+    for pattern, placeholder in _NORMALIZERS:
+        text = pattern.sub(placeholder, text)
+    return text[:MESSAGE_CHARS]
+
+
+def fingerprint(test_name: str, message: str) -> str:
+    return hashlib.sha1(f"{test_name}\0{normalize_message(message)}".encode()).hexdigest()[:16]
+
+
+class FailureHistory:
+    """Fingerprint clusters and per-test pass/fail counts, kept in one JSON file."""
+
+    def __init__(self, path: Optional[Path] = HISTORY_PATH):
+        self.path = Path(path) if path else None
+        data = {}
+        if self.path:
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+        if data.get("version") != HISTORY_VERSION:
+            data = {}
+        self.runs: int = data.get("runs", 0)
+        # fingerprint -> {test, type, message, count, first, last}
+        self.fingerprints: dict[str, dict] = data.get("fingerprints", {})
+        # test name -> [runs observed, runs failed, last passing run number (0 = never)]
+        self.tests: dict[str, list[int]] = data.get("tests", {})
+
+    def record_run(self, failures: Iterable, passed: Iterable[str] = (),
+                   now: Optional[float] = None) -> None:
+        """
+        Fold one run into the history and save it.
+
+        Args:
+            failures: Failure objects (failure_detector.Failure) of the run.
+            passed: Names of the tests that passed in the run; without them
+                no test can be told apart from one that always fails.
+        """
+        now = int(now if now is not None else time.time())
+        self.runs += 1
+        failed_tests = set()
+        for failure in failures:
+            key = fingerprint(failure.test_name, failure.message)
+            entry = self.fingerprints.get(key)
+            if entry is None:
+                entry = self.fingerprints[key] = {
+                    "test": failure.test_name,
+                    "type": failure.failure_type.value,
+                    "message": normalize_message(failure.message),
+                    "count": 0,
+                    "first": now,
+                    "first_run": self.runs,
+                }
+            entry["count"] += 1
+            entry["last"] = now
+            failed_tests.add(failure.test_name)
+
+        for name in failed_tests:
+            counts = self.tests.setdefault(name, [0, 0, 0])
+            counts[0] += 1
+            counts[1] += 1
+        for name in set(passed) - failed_tests:
+            counts = self.tests.setdefault(name, [0, 0, 0])
+            counts[0] += 1
+            counts[2] = self.runs
+
+        if len(self.fingerprints) > MAX_FINGERPRINTS:
+            keep = sorted(self.fingerprints, key=lambda k: self.fingerprints[k]["last"], reverse=True)
+            self.fingerprints = {k: self.fingerprints[k] for k in keep[:MAX_FINGERPRINTS]}
+            live = {entry["test"] for entry in self.fingerprints.values()}
+            self.tests = {name: counts for name, counts in self.tests.items()
+                          if name in live or counts[1] == 0}
+        self.save()
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": HISTORY_VERSION, "runs": self.runs,
+                       "fingerprints": self.fingerprints, "tests": self.tests},
+                      f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def flakiness(self, test_name: str) -> float:
+        """Share of observed runs in which the test failed (0.0 if never seen)."""
+        runs, failed = self.tests.get(test_name, (0, 0, 0))[:2]
+        return failed / runs if runs else 0.0
+
+    def passed_since(self, test_name: str, run: int) -> bool:
+        """True if the test passed in a run after run number `run`."""
+        return self.tests.get(test_name, (0, 0, 0))[2] > run
+
+    def lookup(self, failure) -> Optional[dict]:
+        """History entry of a failure's fingerprint, with its test's flakiness rate."""
+        entry = self.fingerprints.get(fingerprint(failure.test_name, failure.message))
+        if entry is None:
+            return None
+        return {**entry, "flakiness": self.flakiness(entry["test"])}
+
+    def is_known_flake(self, failure) -> bool:
+        """Recurring, intermittent (passed since first seen) and failing at most FLAKY_MAX_RATE."""
+        entry = self.lookup(failure)
+        return (entry is not None and entry["count"] >= MIN_RECURRENCE
+                and self.passed_since(entry["test"], entry["first_run"])
+                and 0 < entry["flakiness"] <= FLAKY_MAX_RATE)
+
+    def clusters(self) -> list[dict]:
+        """Every fingerprint with its flakiness rate, most frequent first."""
+        return sorted(
+            ({"fingerprint": key, **entry, "flakiness": self.flakiness(entry["test"])}
+             for key, entry in self.fingerprints.items()),
+            key=lambda c: (-c["count"], -c["last"]),
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show recurring failures across runs")
+    parser.add_argument("--path", type=Path, default=HISTORY_PATH, help="History file")
+    parser.add_argument("--limit", type=int, default=20, help="Clusters to show")
+    args = parser.parse_args()
+
+    history = FailureHistory(args.path)
+    print(f"{history.runs} run(s), {len(history.fingerprints)} distinct failure(s)")
+    for cluster in history.clusters()[:args.limit]:
+        first = time.strftime("%Y-%m-%d", time.localtime(cluster["first"]))
+        last = time.strftime("%Y-%m-%d", time.localtime(cluster["last"]))
+        print(f"{cluster['count']:>5}x  {cluster['flakiness']:>4.0%} flaky  {first}..{last}  "
+              f"[{cluster['type']}] {cluster['test']}: {cluster['message'][:80]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Pooled HTTP Client and Latency Recording for E2E Steps.
+
+A small keep-alive client built on http.client: idle connections are
+kept per (scheme, host, port) and reused by the next request to the same
+service, so a scenario suite opens a handful of connections instead of
+one per step. The pool is thread-safe; concurrent scenarios share it.
+
+LatencyRecorder keeps every step's latency per endpoint ("GET http://api/users")
+and reports p50/p95/p99, which the runner compares against the latencies
+of the last passing run.
+
+@implements: IV-1
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+MAX_IDLE_PER_HOST = 16
+REGRESSION_FACTOR = 1.5  # p95 may grow to this multiple of the baseline
+REGRESSION_MIN_MS = 20.0  # ... and must grow by at least this much to count
+
+# Errors of a reused keep-alive connection that the server already closed
+_STALE_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+@dataclass
+class HTTPResult:
+    """Response of one pooled request."""
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    elapsed_ms: float
+
+    def json(self) -> Any:
+        return json.loads(self.body or b"null")
+
+
+class HTTPPool:
+    """Keep-alive HTTP/1.1 connections, pooled per host."""
+
+    def __init__(self, max_idle_per_host: int = MAX_IDLE_PER_HOST):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, key: tuple[str, str, int], timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=timeout), False
+
+    def _release(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]] = None,
+        json_body: Any = None,
+        timeout: float = 30,
+    ) -> HTTPResult:
+        """
+        Send one request and read the whole response.
+
+        A request on a reused connection that the server has closed in the
+        meantime is retried once on a new connection. Timeouts surface as
+        TimeoutError (socket.timeout), connection failures as OSError.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        key = (scheme, parts.hostname or "localhost", parts.port or (443 if scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        headers = dict(headers or {})
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers.setdefault("Content-Type", "application/json")
+
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            start = time.perf_counter()
+            try:
+                conn.request(method.upper(), path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except _STALE_ERRORS:
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return HTTPResult(response.status, dict(response.getheaders()), data, elapsed_ms)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+# ─── Latency ────────────────────────────────────────────────────────
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of unsorted samples (0.0 if empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class LatencyRecorder:
+    """Step latencies per endpoint, safe to share between scenario threads."""
+    samples: dict[str, list[float]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, endpoint: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append(elapsed_ms)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """{endpoint: {count, p50, p95, p99, max}} in milliseconds."""
+        with self._lock:
+            samples = {endpoint: list(values) for endpoint, values in self.samples.items()}
+        return {
+            endpoint: {
+                "count": len(values),
+                "p50": round(percentile(values, 50), 2),
+                "p95": round(percentile(values, 95), 2),
+                "p99": round(percentile(values, 99), 2),
+                "max": round(max(values), 2),
+            }
+            for endpoint, values in sorted(samples.items())
+        }
+
+
+def latency_regressions(
+    current: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    factor: float = REGRESSION_FACTOR,
+    min_ms: float = REGRESSION_MIN_MS,
+) -> list[tuple[str, float, float]]:
+    """(endpoint, baseline p95, current p95) for endpoints whose p95 regressed."""
+    regressions = []
+    for endpoint, stats in current.items():
+        before = baseline.get(endpoint, {}).get("p95")
+        if before is None:
+            continue
+        now = stats["p95"]
+        if now > before * factor and now - before >= min_ms:
+            regressions.append((endpoint, before, now))
+    return regressions
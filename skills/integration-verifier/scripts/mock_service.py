@@ -0,0 +1,226 @@
+"""
+Mock Service for Offline E2E Runs.
+
+A lightweight HTTP/1.1 stand-in server (asyncio, standard library only)
+that answers E2E `api_call` steps from a fixtures file, so scenarios,
+budgets and the runner itself can be exercised without the real service.
+
+Fixtures (YAML or JSON):
+
+    seed: 1                      # optional, makes fault injection repeatable
+    routes:
+      - path: /health            # exact path; '*' globs allowed (/users/*)
+        method: GET              # default GET; '*' matches any method
+        status: 200
+        body: {ok: true}         # dict/list sent as JSON, strings as text
+        latency_ms: 5            # fixed delay, or [min, max] for jitter
+        error_rate: 0.1          # fraction answered with error_status
+        error_status: 503
+        drop_rate: 0.0           # fraction whose connection is closed unanswered
+        hang_rate: 0.0           # fraction never answered (client times out)
+
+Unmatched requests get 404. Connections are kept alive like a real
+server's, so the pooled client's connection reuse is measured too.
+
+Usage:
+    with MockService.from_file("tests/e2e/mock_service.yaml") as service:
+        HTTPPool().request("GET", f"{service.base_url}/health")
+
+    python3 mock_service.py tests/e2e/mock_service.yaml --port 8080
+
+E2ERunner.run_e2e_scenarios starts one automatically when a
+mock_service.yaml sits next to the scenario file.
+
+@implements: IV-1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import random
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Optional, Union
+
+REASONS = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 401: "Unauthorized",
+           403: "Forbidden", 404: "Not Found", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+def load_fixtures(path: Union[str, Path]) -> dict:
+    """Read a fixtures file (.json, otherwise YAML)."""
+    path = Path(path)
+    with open(path) as f:
+        if path.suffix == ".json":
+            return json.load(f)
+        import yaml
+
+        return yaml.safe_load(f) or {}
+
+
+class MockService:
+    """Fixture-driven HTTP stand-in running on its own event loop thread."""
+
+    def __init__(self, fixtures: dict, host: str = "127.0.0.1", port: int = 0):
+        self.routes: list[dict] = list(fixtures.get("routes", []))
+        self.host = host
+        self.port = port
+        self.stats: Counter[str] = Counter()  # "GET /path" and "fault:<kind>" counts
+        self._random = random.Random(fixtures.get("seed"))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], host: str = "127.0.0.1", port: int = 0) -> "MockService":
+        return cls(load_fixtures(path), host, port)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # ─── Lifecycle ──────────────────────────────────────────────────
+
+    def start(self) -> str:
+        """Start serving in a background thread; returns the base URL."""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="mock-service", daemon=True)
+        self._thread.start()
+        future = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._handle, self.host, self.port), self._loop)
+        self._server = future.result(timeout=10)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+
+        async def shutdown() -> None:
+            self._server.close()
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self) -> "MockService":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ─── Serving ────────────────────────────────────────────────────
+
+    def _match(self, method: str, path: str) -> Optional[dict]:
+        for route in self.routes:
+            if route.get("method", "GET").upper() not in ("*", method):
+                continue
+            if fnmatch.fnmatchcase(path, route.get("path", "/")):
+                return route
+        return None
+
+    def _fault(self, route: dict) -> Optional[str]:
+        roll = self._random.random()
+        for kind in ("drop", "hang", "error"):
+            rate = route.get(f"{kind}_rate", 0)
+            if roll < rate:
+                return kind
+            roll -= rate
+        return None
+
+    def _delay(self, route: dict) -> float:
+        latency = route.get("latency_ms", 0)
+        if isinstance(latency, (list, tuple)):
+            latency = self._random.uniform(latency[0], latency[1])
+        return latency / 1000
+
+    @staticmethod
+    def _response(status: int, body: Any, keep_alive: bool) -> bytes:
+        if isinstance(body, (dict, list)):
+            payload, content_type = json.dumps(body).encode(), "application/json"
+        else:
+            payload, content_type = str(body if body is not None else "").encode(), "text/plain"
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Status')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode("latin-1") + payload
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                path = target.split("?", 1)[0]
+                self.stats[f"{method} {path}"] += 1
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                route = self._match(method, path)
+                if route is None:
+                    writer.write(self._response(404, {"error": f"no fixture for {method} {path}"}, keep_alive))
+                else:
+                    fault = self._fault(route)
+                    if fault:
+                        self.stats[f"fault:{fault}"] += 1
+                    if fault == "drop":
+                        break
+                    if fault == "hang":
+                        await asyncio.Event().wait()  # until the server stops
+                    await asyncio.sleep(self._delay(route))
+                    if fault == "error":
+                        response = self._response(route.get("error_status", 503), route.get("error_body"), keep_alive)
+                    else:
+                        response = self._response(route.get("status", 200), route.get("body"), keep_alive)
+                    writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve E2E fixtures as a local HTTP stand-in")
+    parser.add_argument("fixtures", help="Fixtures file (YAML or JSON)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    service = MockService.from_file(args.fixtures, args.host, args.port)
+    print(f"Serving {args.fixtures} at {service.start()} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        print(dict(service.stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Tests for the streaming session importer.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from hooks.pre_tool_use.validate_intent import _iter_lines_reversed, load_session_agent
+from scripts import copy_session
+
+
+@pytest.fixture
+def storage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.chdir(project)
+    storage = tmp_path / "storage"
+    storage.mkdir()
+    monkeypatch.setenv("OPENCODE_STORAGE_PATH", str(storage))
+    return storage
+
+
+_clock = [1_700_000_000_000_000_000]
+
+
+def _message(storage: Path, session: str, n: int, cwd: str, **fields) -> None:
+    session_dir = storage / session
+    session_dir.mkdir(exist_ok=True)
+    path = session_dir / f"msg_{n:04d}.json"
+    path.write_text(json.dumps({"id": f"msg_{n}", "sessionID": session, "path": {"cwd": cwd}, **fields}))
+    _clock[0] += 1_000_000
+    os.utime(path, ns=(_clock[0], _clock[0]))
+    os.utime(session_dir, ns=(_clock[0], _clock[0]))
+
+
+def _log() -> list[dict]:
+    return [json.loads(line) for line in copy_session.SESSION_LOG.read_text().splitlines()]
+
+
+def test_finds_latest_session_for_workspace(storage: Path) -> None:
+    root = os.getcwd()
+    _message(storage, "ses_old", 1, root)
+    _message(storage, "ses_other", 1, "/elsewhere")
+    _message(storage, "ses_new", 1, root)
+    _message(storage, "ses_other", 2, "/elsewhere")
+
+    assert os.path.basename(copy_session.find_session(root)) == "ses_new"
+    cached = json.loads(copy_session.SESSION_MAP.read_text())["sessions"]
+    assert cached["ses_other"]["workspace"] == "/elsewhere"
+
+    # Cached sessions are not opened again
+    (storage / "ses_other" / "msg_0001.json").write_text("not json")
+    assert os.path.basename(copy_session.find_session(root)) == "ses_new"
+    assert copy_session.find_session("/nowhere") is None
+
+
+def test_incremental_sync_appends_only_new_messages(storage: Path) -> None:
+    root = os.getcwd()
+    for n in range(3):
+        _message(storage, "ses_a", n, root)
+
+    assert copy_session.copy_session() == copy_session.SESSION_LOG
+    assert [m["id"] for m in _log()] == ["msg_0", "msg_1", "msg_2"]
+
+    _message(storage, "ses_a", 3, root)
+    session_dir = copy_session.find_session(root)
+    assert copy_session.sync_session(session_dir) == 1
+    assert copy_session.sync_session(session_dir) == 0
+    assert [m["id"] for m in _log()] == ["msg_0", "msg_1", "msg_2", "msg_3"]
+
+    # A newer session replaces the log
+    _message(storage, "ses_b", 0, root)
+    copy_session.copy_session()
+    assert [m["sessionID"] for m in _log()] == ["ses_b"]
+
+
+def test_hook_reads_agent_from_jsonl(storage: Path, tmp_path: Path) -> None:
+    root = os.getcwd()
+    _message(storage, "ses_a", 0, root, role="assistant", agent="Builder")
+    _message(storage, "ses_a", 1, root, role="user")
+    _message(storage, "ses_a", 2, root, role="assistant", mode="oracle")
+    copy_session.copy_session()
+
+    assert load_session_agent(root, "ses_a") == "oracle"
+    assert load_session_agent(root, "ses_missing") is None
+
+    lines = tmp_path / "lines.txt"
+    lines.write_bytes(b"".join(b"line %d\n" % i for i in range(5000)))
+    assert list(_iter_lines_reversed(lines, chunk_size=7)) == [b"line %d" % i for i in reversed(range(5000))]
+
+
+def test_watch_mirrors_new_messages_and_resumes(storage: Path) -> None:
+    import threading
+    import time
+
+    root = os.getcwd()
+    _message(storage, "ses_a", 0, root)
+
+    def run_watch() -> tuple[threading.Event, threading.Thread]:
+        stop = threading.Event()
+        thread = threading.Thread(target=copy_session.watch,
+                                  kwargs={"interval": 0.01, "stop": stop, "batch": 2})
+        thread.start()
+        return stop, thread
+
+    def wait_for(count: int) -> None:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if copy_session.SESSION_LOG.exists() and len(_log()) >= count:
+                return
+            time.sleep(0.01)
+
+    stop, thread = run_watch()
+    wait_for(1)
+    for n in range(1, 6):
+        _message(storage, "ses_a", n, root)
+    wait_for(6)
+    stop.set()
+    thread.join()
+    assert [m["id"] for m in _log()] == [f"msg_{n}" for n in range(6)]
+
+    # Restart: resumes from the cursor without rewriting the log
+    _message(storage, "ses_a", 6, root)
+    stop, thread = run_watch()
+    wait_for(7)
+    stop.set()
+    thread.join()
+    assert [m["id"] for m in _log()] == [f"msg_{n}" for n in range(7)]
+
+
+def test_recent_unreadable_message_holds_the_cursor(storage: Path) -> None:
+    root = os.getcwd()
+    _message(storage, "ses_a", 0, root)
+    partial = storage / "ses_a" / "msg_0001.json"
+    partial.write_text('{"id": "msg_1"')  # still being written: mtime is now
+    session_dir = str(storage / "ses_a")
+
+    assert copy_session.sync_session(session_dir) == 1
+    partial.write_text(json.dumps({"id": "msg_1", "sessionID": "ses_a"}))
+    assert copy_session.sync_session(session_dir) == 1
+    assert [m["id"] for m in _log()] == ["msg_0", "msg_1"]
+
+
+def test_watch_survives_a_vanished_session(storage: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import shutil
+    import threading
+    import time
+
+    _message(storage, "ses_a", 0, os.getcwd())
+    session = str(storage / "ses_a")
+    monkeypatch.setattr(copy_session, "find_session", lambda *args: session)
+
+    stop = threading.Event()
+    thread = threading.Thread(target=copy_session.watch, kwargs={"interval": 0.01, "stop": stop})
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not copy_session.SESSION_LOG.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)  # let the watcher settle on the session's mtime
+    shutil.rmtree(session)
+    time.sleep(0.1)
+    assert thread.is_alive()
+    stop.set()
+    thread.join()
+    assert [m["id"] for m in _log()] == ["msg_0"]
+
+
+def test_only_files_after_the_cursor_are_read(storage: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    root = os.getcwd()
+    for n in range(1, 6):
+        _message(storage, "ses_a", n, root)
+    session_dir = str(storage / "ses_a")
+    third = storage / "ses_a" / "msg_0003.json"
+    cursor = [third.stat().st_mtime_ns, third.name]
+    # Same mtime as the cursor, later name: still new
+    os.utime(storage / "ses_a" / "msg_0004.json", ns=(cursor[0], cursor[0]))
+
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda path, *a, **kw: opened.append(os.path.basename(path))
+                        or real_open(path, *a, **kw))
+    keys = [key for key, _message in copy_session.iter_new_messages(session_dir, after=cursor)]
+
+    assert [name for _mtime, name in keys] == ["msg_0004.json", "msg_0005.json"]
+    assert opened == ["msg_0004.json", "msg_0005.json"]
@@ -0,0 +1,60 @@
+"""
+Tests for streaming pattern deduplication.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import scripts.deduplicate_patterns as dedup
+
+
+def _pattern(description: str, evidence: int = 5, severity: str = "high") -> dict:
+    return {
+        "type": "repeated_failure",
+        "severity": severity,
+        "description": description,
+        "suggestion": "Add tests",
+        "evidence": [f"{description} #{i}" for i in range(evidence)],
+    }
+
+
+def test_groups_by_normalized_key_with_bounded_examples(tmp_path: Path) -> None:
+    records = [_pattern(f"File src/auth_{i % 2}.py modified {i + 3} times") for i in range(10)]
+    records.append(_pattern("Oracle phase completed too fast", evidence=1, severity="medium"))
+    source = tmp_path / "pattern_candidates.jsonl"
+    source.write_text("".join(json.dumps(r) + "\n" for r in records))
+    output = tmp_path / "out.json"
+
+    result = dedup.deduplicate_patterns(source, output)
+    [files, oracle] = result["deduplicated_patterns"]
+    assert (files["count"], oracle["count"]) == (10, 1)
+    assert len(files["examples"]) == dedup.MAX_EXAMPLES
+    assert result["summary"]["original_count"] == 11
+    assert json.loads(output.read_text())["summary"]["deduplicated_count"] == 2
+
+    exact = dedup.deduplicate_patterns(source, output, key_mode="exact")
+    assert exact["summary"]["deduplicated_count"] == 11
+
+
+def test_bare_file_names_are_masked() -> None:
+    assert dedup.normalize_description("File a.ts modified 7 times") == \
+        dedup.normalize_description("File b.ts modified 9 times")
+    assert dedup.normalize_description("Edited config.yaml.") == "edited <path>."
+    # Dotted names that are not files stay distinct
+    assert dedup.normalize_description("auth.login failed") != dedup.normalize_description("user.save failed")
+
+
+@pytest.mark.parametrize("chunk", [7, 1 << 16])
+def test_json_input_is_streamed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, chunk: int) -> None:
+    monkeypatch.setattr(dedup, "READ_CHUNK", chunk)
+    records = [_pattern(f"Bypass #{i}: consecutive build calls", evidence=2) for i in range(20)]
+    source = tmp_path / "pattern_candidates.json"
+    source.write_text(json.dumps({"summary": {"patterns": 1, "score": 12.5}, "patterns": records, "v": 2}, indent=1))
+
+    assert list(dedup.iter_patterns(source)) == records
+    groups, total = dedup.group_patterns(dedup.iter_patterns(source))
+    assert total == 20 and len(groups) == 1 and len(groups[0]["examples"]) == 3
@@ -0,0 +1,211 @@
+"""
+Tests for concurrent E2E scenario execution.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+E2E_RUNNER = Path(__file__).parent.parent / "skills" / "integration-verifier" / "scripts" / "e2e_runner.py"
+
+
+@pytest.fixture
+def e2e_runner(monkeypatch: pytest.MonkeyPatch):
+    spec = importlib.util.spec_from_file_location("e2e_runner", E2E_RUNNER)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "e2e_runner", module)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_scenarios_run_concurrently_in_file_order(
+    tmp_path: Path, e2e_runner, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    lines = []
+    for i in range(12):
+        lines += [f"- name: s{i:02d}", "  steps:", f"    - {{type: sleep, fail: {str(i == 5).lower()}}}"]
+    lines += ["- name: exclusive", "  serial: true", "  steps:", "    - {type: sleep, exclusive: true}"]
+    scenario_file = tmp_path / "scenarios.yaml"
+    scenario_file.write_text("\n".join(lines) + "\n")
+
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0, "during_serial": None}
+
+    def fake_step(self, step):
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(0.05)
+        with lock:
+            if step.get("exclusive"):
+                running["during_serial"] = running["now"]
+            running["now"] -= 1
+        return e2e_runner.ScenarioResult("step", not step.get("fail"), 0, error_message="boom")
+
+    monkeypatch.setattr(e2e_runner.E2ERunner, "_execute_step", fake_step)
+    runner = e2e_runner.E2ERunner(tmp_path)
+
+    started = time.monotonic()
+    results = runner.run_e2e_scenarios(scenario_file, workers=4)
+    elapsed = time.monotonic() - started
+
+    assert [r.name for r in results.results] == [f"s{i:02d}" for i in range(12)] + ["exclusive"]
+    assert (results.passed, results.failed) == (12, 1)
+    assert not results.results[5].passed
+    assert running["peak"] == 4
+    assert running["during_serial"] == 1
+    assert elapsed < 13 * 0.05
+
+    serial = runner.run_e2e_scenarios(scenario_file, workers=1)
+    assert [r.name for r in serial.results] == [r.name for r in results.results]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections: set = set()
+    delay = 0.0
+
+    def do_GET(self) -> None:
+        _Handler.connections.add(self.client_address)
+        time.sleep(_Handler.delay)
+        status = 200 if self.path == "/ok" else 404
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def test_api_steps_reuse_connections_and_track_latency(
+    tmp_path: Path, e2e_runner
+) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    _Handler.connections.clear()
+    try:
+        steps = "\n".join(f"    - {{endpoint: /ok, base_url: '{base}'}}" for _ in range(10))
+        scenario_file = tmp_path / "scenarios.yaml"
+        scenario_file.write_text(f"- name: health\n  steps:\n{steps}\n"
+                                 f"- name: missing\n  steps:\n    - {{endpoint: /nope, base_url: '{base}'}}\n")
+
+        runner = e2e_runner.E2ERunner(tmp_path)
+        results = runner.run_e2e_scenarios(scenario_file, workers=1)
+        assert [r.passed for r in results.results] == [True, False]
+        assert results.results[1].error_message == "Expected 200, got 404"
+        assert len(_Handler.connections) == 1
+        assert results.latency[f"GET {base}/ok"]["count"] == 10
+        # A failing run does not become the baseline
+        assert not (tmp_path / e2e_runner.LATENCY_BASELINE).exists()
+
+        scenario_file.write_text(f"- name: health\n  steps:\n{steps}\n")
+        assert runner.run_e2e_scenarios(scenario_file).all_passed
+        assert (tmp_path / e2e_runner.LATENCY_BASELINE).exists()
+
+        _Handler.delay = 0.05
+        slow = runner.run_e2e_scenarios(scenario_file)
+        assert slow.results[-1].name == f"latency: GET {base}/ok"
+        assert "p95 latency regressed" in slow.results[-1].error_message
+        assert slow.results[0].duration_ms >= 500
+    finally:
+        _Handler.delay = 0.0
+        server.shutdown()
+        server.server_close()
+
+
+def test_performance_budgets(tmp_path: Path, e2e_runner, monkeypatch: pytest.MonkeyPatch) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    scenario_file = tmp_path / "scenarios.yaml"
+    scenario_file.write_text(
+        f"- name: repeat\n  steps:\n    - {{endpoint: /ok, base_url: '{base}', repeat: 5, p95_ms: 1000}}\n"
+        f"- name: slow\n  steps:\n    - {{endpoint: /ok, base_url: '{base}', max_latency_ms: 10}}\n"
+        f"- name: load\n  steps:\n    - {{endpoint: /ok, base_url: '{base}', "
+        f"load: {{concurrency: 4, requests: 8}}, min_rps: 100000}}\n")
+    try:
+        _Handler.delay = 0.03
+        results = e2e_runner.E2ERunner(tmp_path).run_e2e_scenarios(scenario_file, workers=1)
+    finally:
+        _Handler.delay = 0.0
+        server.shutdown()
+        server.server_close()
+
+    repeat, slow, load = results.results
+    assert repeat.passed
+    assert results.latency[f"GET {base}/ok"]["count"] == 5 + 1 + 8
+    assert slow.error_type == "PERFORMANCE"
+    assert "exceeds budget of 10ms" in slow.error_message
+    assert load.error_type == "PERFORMANCE"
+    assert "below target" in load.error_message
+
+    spec = importlib.util.spec_from_file_location("failure_detector", E2E_RUNNER.parent / "failure_detector.py")
+    failure_detector = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "failure_detector", failure_detector)
+    spec.loader.exec_module(failure_detector)
+    [failure, _] = failure_detector.FailureDetector().analyze(results)
+    assert failure.failure_type == failure_detector.FailureType.PERFORMANCE
+    assert failure.severity == failure_detector.Severity.MEDIUM
+
+
+def test_mock_service_serves_fixtures_with_faults(tmp_path: Path, e2e_runner) -> None:
+    (tmp_path / "mock_service.yaml").write_text(
+        "seed: 1\n"
+        "routes:\n"
+        "  - {path: /health, body: {ok: true}, latency_ms: [1, 5]}\n"
+        "  - {path: /users/*, method: '*', status: 201}\n"
+        "  - {path: /flaky, error_rate: 1.0, error_status: 503}\n"
+        "  - {path: /dropped, drop_rate: 1.0}\n"
+        "  - {path: /stuck, hang_rate: 1.0}\n")
+    (tmp_path / "scenarios.yaml").write_text(
+        "- name: health\n  steps:\n    - {endpoint: /health, repeat: 20, p95_ms: 1000}\n"
+        "- name: create\n  steps:\n    - {endpoint: /users/1, method: POST, body: {a: 1}, expected_status: 201}\n"
+        "- name: flaky\n  steps:\n    - {endpoint: /flaky}\n"
+        "- name: dropped\n  steps:\n    - {endpoint: /dropped}\n"
+        "- name: stuck\n  steps:\n    - {endpoint: /stuck, timeout: 0.2}\n"
+        "- name: unknown\n  steps:\n    - {endpoint: /nowhere}\n")
+
+    runner = e2e_runner.E2ERunner(tmp_path)
+    results = runner.run_e2e_scenarios(tmp_path / "scenarios.yaml")
+    by_name = {r.name: r for r in results.results}
+
+    assert by_name["health"].passed and by_name["create"].passed
+    assert results.latency["GET mock:/health"]["p50"] >= 1
+    assert by_name["flaky"].error_message == "Expected 200, got 503"
+    assert by_name["dropped"].error_type == "NETWORK"
+    assert by_name["stuck"].error_type == "TIMEOUT"
+    assert by_name["unknown"].error_message == "Expected 200, got 404"
+    assert results.artifacts["mock_fixtures"].endswith("mock_service.yaml")
+    assert runner.base_url == e2e_runner.DEFAULT_BASE_URL
+
+
+def test_latency_baseline_is_kept_per_target(tmp_path: Path, e2e_runner) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    scenario_file = tmp_path / "scenarios.yaml"
+    scenario_file.write_text("- name: ok\n  steps:\n    - {endpoint: /ok, repeat: 5}\n")
+    try:
+        assert e2e_runner.E2ERunner(tmp_path, base_url=base).run_e2e_scenarios(scenario_file).all_passed
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # The same endpoint, much slower, on a mock: not a regression of the real service
+    fixtures = tmp_path / "fixtures.yaml"
+    fixtures.write_text("routes:\n  - {path: /ok, latency_ms: 60}\n")
+    mocked = e2e_runner.E2ERunner(tmp_path, base_url=base).run_e2e_scenarios(scenario_file, mock_fixtures=fixtures)
+    assert mocked.all_passed and list(mocked.latency) == ["GET mock:/ok"]
+
+    baseline = json.loads((tmp_path / e2e_runner.LATENCY_BASELINE).read_text())
+    assert sorted(baseline) == [f"GET {base}/ok", "GET mock:/ok"]
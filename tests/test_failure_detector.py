@@ -0,0 +1,196 @@
+"""
+Tests for failure classification in the integration-verifier skill.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+FAILURE_DETECTOR = (Path(__file__).parent.parent / "skills" / "integration-verifier"
+                    / "scripts" / "failure_detector.py")
+
+
+@pytest.fixture
+def fd(monkeypatch: pytest.MonkeyPatch):
+    spec = importlib.util.spec_from_file_location("failure_detector", FAILURE_DETECTOR)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "failure_detector", module)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("Connection refused to localhost:8080", "NETWORK"),
+    ("Connection timed out after 30s", "TIMEOUT"),
+    ("socket timeout while reading", "TIMEOUT"),
+    ("p95 latency 300ms exceeds budget of 100ms", "PERFORMANCE"),
+    ("401 Unauthorized: Invalid token", "AUTH"),
+    ("ModuleNotFoundError: module not found", "DEPENDENCY"),
+    ("Field 'email' cannot be NULL", "DATA"),
+    ("Expected 200, got 500", "RESPONSE"),
+    ("requests.exceptions.ReadTimeout: read timed out", "TIMEOUT"),
+    ("ConnectTimeoutError: connect", "TIMEOUT"),
+    ("urllib3 NewConnectionError: DNSLookupError", "NETWORK"),
+    ("PermissionDeniedError: permission denied", "AUTH"),
+    ("Everything is fine", "UNKNOWN"),
+])
+def test_classify_by_priority(fd, message: str, expected: str) -> None:
+    assert fd.FailureDetector()._detect_failure_type("UNKNOWN", message).value == expected
+
+
+def test_matches_reports_every_category_with_positions(fd) -> None:
+    classifier = fd.FailureDetector().classifier
+    found = classifier.matches("Socket error: request timed out, Expected 200")
+    assert [(c.value, pos, kw) for c, pos, kw in found] == [
+        ("NETWORK", 0, "socket"), ("TIMEOUT", 22, "timed out"), ("RESPONSE", 33, "expected")]
+
+
+@pytest.mark.parametrize("message", [
+    "requests.exceptions.ReadTimeout: HTTPSConnectionPool read timed out",
+    "ConnectTimeoutError: connect",
+    "InvalidTokenError: token expired",
+    "psycopg2.errors.NotNullViolation: null value violates constraint",
+    "ServiceUnavailableError: service unavailable",
+    "ModuleNotFoundError: No module named 'app'",
+    "AssertionError: expected status code 200, got 503",
+    "sockets closed: connection reset by peer",
+    "I forgot something",
+])
+def test_matches_every_keyword_the_substring_scan_finds(fd, message: str) -> None:
+    """The compiled matcher finds the same categories as `keyword in message`."""
+    classifier = fd.FailureDetector().classifier
+    lowered = message.lower()
+    scanned = {category for keyword, categories in classifier.categories.items()
+               if keyword in lowered for category in categories}
+    assert {category for category, _pos, _kw in classifier.matches(message)} == scanned
+    best = min(scanned, key=lambda c: classifier.rank[c], default=fd.FailureType.UNKNOWN)
+    assert classifier.classify(message) == best
+
+
+def test_matches_overlapping_keywords(fd) -> None:
+    classifier = fd.KeywordClassifier(
+        {fd.FailureType.NETWORK: ["connection reset"], fd.FailureType.DATA: ["reset"],
+         fd.FailureType.TIMEOUT: ["time"], fd.FailureType.AUTH: ["timeouts"]},
+        [fd.FailureType.TIMEOUT, fd.FailureType.NETWORK])
+    found = classifier.matches("Connection reset; timeouts")
+    assert [(c.value, pos, kw) for c, pos, kw in found] == [
+        ("NETWORK", 0, "connection reset"), ("DATA", 11, "reset"),
+        ("TIMEOUT", 18, "time"), ("AUTH", 18, "timeouts")]
+
+
+def test_benchmark_reports_throughput(fd) -> None:
+    stats = fd.benchmark(500)
+    assert stats["messages"] == 500
+    assert stats["compiled_per_sec"] > 0 and stats["scan_per_sec"] > 0
+
+
+def test_history_marks_recurring_flakes(fd, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    spec = importlib.util.spec_from_file_location("failure_history", FAILURE_DETECTOR.parent / "failure_history.py")
+    fh = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "failure_history", fh)
+    spec.loader.exec_module(fh)
+
+    assert fh.normalize_message("Timed out after 31.2s at /srv/app/x.py id 'ab12'") == \
+        fh.normalize_message("timed out after 29s at /opt/app/y.py id 'zz'")
+
+    detector = fd.FailureDetector()
+
+    def failure(name: str, message: str):
+        result = type("R", (), {"name": name, "error_message": message, "error_type": None})()
+        return detector._classify_failure(result)
+
+    path = tmp_path / "history.json"
+    history = fh.FailureHistory(path)
+    for run in range(4):
+        failures = [failure("test_core_auth", "401 Unauthorized")]  # broken: fails every run
+        if run % 2:
+            failures.append(failure("test_checkout_refresh", f"auth token expired after {run}s"))
+        passed = [] if run % 2 else ["test_checkout_refresh"]
+        history.record_run(failures, passed=passed, now=1000 + run)
+
+    history = fh.FailureHistory(path)
+    assert history.runs == 4
+    [top, flake] = history.clusters()
+    assert (top["test"], top["count"], top["flakiness"]) == ("test_core_auth", 4, 1.0)
+    assert (flake["count"], flake["first"], flake["last"], flake["flakiness"]) == (2, 1001, 1003, 0.5)
+
+    current = [failure("test_checkout_refresh", "auth token expired after 7s")]
+    summary = detector.summarize(current, history)
+    assert summary.known_flakes == current and not summary.rollback_recommended
+    assert "not blocking" in summary.summary_message
+    assert "Known flake: seen 2 times" in detector.format_report(current, summary)
+
+    current.append(failure("test_core_auth", "401 Unauthorized"))
+    summary = detector.summarize(current, history)
+    assert summary.rollback_recommended
+    assert "1 known flaky failure(s) skipped" in summary.summary_message
+
+
+def test_new_regression_is_not_a_known_flake(fd, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    spec = importlib.util.spec_from_file_location("failure_history", FAILURE_DETECTOR.parent / "failure_history.py")
+    fh = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "failure_history", fh)
+    spec.loader.exec_module(fh)
+
+    detector = fd.FailureDetector()
+
+    def failure(name: str, message: str):
+        result = type("R", (), {"name": name, "error_message": message, "error_type": None})()
+        return detector._classify_failure(result)
+
+    history = fh.FailureHistory(tmp_path / "history.json")
+    for run in range(20):
+        history.record_run([], passed=["test_checkout", "test_core_login"], now=run)
+    for run in range(20, 22):
+        history.record_run([failure("test_checkout", "Expected 200, got 500"),
+                            failure("test_core_login", "401 Unauthorized")],
+                           passed=[], now=run)
+
+    # Both failed twice in a row after 20 passes: a regression, not a flake
+    current = [failure("test_checkout", "Expected 200, got 500"), failure("test_core_login", "401 Unauthorized")]
+    assert not any(history.is_known_flake(f) for f in current)
+    summary = detector.summarize(current, history)
+    assert summary.known_flakes == [] and summary.rollback_recommended
+
+    # Once it passes again it is intermittent, but a CRITICAL failure still blocks
+    history.record_run([], passed=["test_checkout", "test_core_login"], now=22)
+    assert all(history.is_known_flake(f) for f in current)
+    summary = detector.summarize(current, history)
+    assert [f.test_name for f in summary.known_flakes] == ["test_checkout"]
+    assert summary.rollback_recommended
+
+
+def test_runner_records_runs_and_skips_known_flakes(fd, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    spec = importlib.util.spec_from_file_location("e2e_runner", FAILURE_DETECTOR.parent / "e2e_runner.py")
+    e2e_runner = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "e2e_runner", e2e_runner)
+    spec.loader.exec_module(e2e_runner)
+    runner = e2e_runner.E2ERunner(tmp_path)
+
+    def run(flaky_passes: bool):
+        events = [{"event": "test", "nodeid": "tests/test_api.py::test_ok", "outcome": "passed", "duration": 0.1}]
+        if flaky_passes:
+            events.append({"event": "test", "nodeid": "tests/test_api.py::test_flaky", "outcome": "passed"})
+        else:
+            events.append({"event": "test", "nodeid": "tests/test_api.py::test_flaky", "outcome": "failed",
+                           "duration": 2.5, "message": "Connection refused to localhost:8080"})
+        events.append({"event": "finish", "exitstatus": 0 if flaky_passes else 1})
+        assert fd.FailureDetector().passed_tests(events)[0] == "tests/test_api.py::test_ok"
+        return runner.triage(runner._results_from_events(events, "", 0))
+
+    for flaky_passes in (False, True, True, False, True):
+        run(flaky_passes)
+    failures, summary = run(False)
+    assert [f.test_name for f in summary.known_flakes] == ["tests/test_api.py::test_flaky"]
+    assert not summary.rollback_recommended
+
+    history = sys.modules["failure_history"].FailureHistory(tmp_path / ".opencode/cache/failure_history.json")
+    assert history.runs == 6
+    assert history.tests["tests/test_api.py::test_ok"] == [6, 0, 6]
+
+    runner.triage(e2e_runner.E2EResults(0, 0, 0, 0, 0, artifacts={"selection": "none"}))
+    assert sys.modules["failure_history"].FailureHistory(history.path).runs == 6
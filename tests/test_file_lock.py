@@ -0,0 +1,180 @@
+"""
+Tests for the shared file locking layer and the state writers that use it.
+
+Each stress test hammers one writer from several processes; without the
+lock their read-modify-write cycles lose updates.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from scripts.file_lock import LockTimeout, atomic_write_json, file_lock, read_json, update_json
+
+PROCESSES = 6
+ITERATIONS = 20
+
+
+def _run_processes(target, *args) -> None:
+    workers = [multiprocessing.Process(target=target, args=(*args, n)) for n in range(PROCESSES)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+
+def _increment(path: str, _n: int) -> None:
+    for _ in range(ITERATIONS):
+        update_json(path, lambda data: {"count": data.get("count", 0) + 1})
+
+
+def _telemetry(root: str, n: int) -> None:
+    from scripts import system_telemetry
+
+    payload = Path(root) / f"payload_{n}.json"
+    payload.write_text(json.dumps({"script": "stress.py", "duration": 1.0, "status": "success"}))
+    sys.argv = ["system_telemetry.py", "--payload", str(payload), "--project-root", root]
+    for _ in range(ITERATIONS):
+        system_telemetry.main()
+
+
+def _task_counter(root: str, n: int) -> None:
+    from scripts.parallel_oracle_integration import TaskIDGenerator
+
+    os.chdir(root)
+    counters = [TaskIDGenerator._get_counter() for _ in range(ITERATIONS)]
+    Path(root, f"counters_{n}.json").write_text(json.dumps(counters))
+
+
+def _delegations(root: str, n: int) -> None:
+    from scripts import session_state
+
+    os.chdir(root)
+    for i in range(ITERATIONS // 2):
+        session_state.start_delegation("Oracle", f"Builder{n}", "BUILD", "IMPLEMENTATION", f"step {i}")
+        session_state.complete_delegation(f"Builder{n}")
+
+
+def _workflows(root: str, n: int) -> None:
+    from scripts import workflow_orchestrator as orchestrator
+
+    os.chdir(root)
+    for i in range(ITERATIONS // 4):
+        orchestrator.start_workflow("BUILD", f"task_{n}_{i}", f"oracle_{n}")
+
+
+def _coordinator_state(root: str, n: int) -> None:
+    from scripts.parallel_coordinator import ParallelCoordinator
+
+    os.chdir(root)
+    coordinator = ParallelCoordinator(config_path="missing.yaml")
+    coordinator.state_store = None
+    for i in range(ITERATIONS):
+        coordinator.stats["tasks_started"] = n * ITERATIONS + i
+        coordinator._save_monitoring_state()
+
+
+def test_file_lock_is_reentrant_and_times_out(tmp_path: Path) -> None:
+    target = tmp_path / "state.json"
+    acquired = threading.Event()
+    release = threading.Event()
+
+    def holder() -> None:
+        # flock is per open file description, so a second fd in another thread contends
+        with file_lock(target):
+            acquired.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    acquired.wait(5)
+    try:
+        with pytest.raises(LockTimeout):
+            with file_lock(target, timeout=0.05):
+                pass
+    finally:
+        release.set()
+        thread.join()
+
+    with file_lock(target):
+        with file_lock(target, timeout=0):
+            atomic_write_json(target, {"ok": True})
+    assert read_json(target) == {"ok": True}
+    assert read_json(tmp_path / "missing.json", {}) == {}
+
+
+def test_update_json_under_contention(tmp_path: Path) -> None:
+    path = tmp_path / "counter.json"
+    _run_processes(_increment, str(path))
+    assert read_json(path) == {"count": PROCESSES * ITERATIONS}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_system_telemetry_counts_every_call(tmp_path: Path) -> None:
+    _run_processes(_telemetry, str(tmp_path))
+    telemetry = json.loads((tmp_path / ".opencode/logs/system_telemetry.json").read_text())
+    assert telemetry["total_calls"] == PROCESSES * ITERATIONS
+    assert telemetry["scripts"]["stress.py"]["count"] == PROCESSES * ITERATIONS
+
+
+def test_task_counter_never_repeats(tmp_path: Path) -> None:
+    _run_processes(_task_counter, str(tmp_path))
+    counters = [c for f in tmp_path.glob("counters_*.json") for c in json.loads(f.read_text())]
+    assert len(counters) == PROCESSES * ITERATIONS
+    assert len(set(counters)) == len(counters)
+
+
+def test_session_snapshot_covers_whole_journal(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    from scripts import session_state
+
+    _run_processes(_delegations, str(tmp_path))
+
+    snapshot = json.loads(session_state.SESSION_STATE_FILE.read_text())
+    assert snapshot["journal_offset"] == session_state.SESSION_JOURNAL_FILE.stat().st_size
+    # Every start ends up in history (completed or interrupted) except a still-active one
+    starts = PROCESSES * (ITERATIONS // 2)
+    history = list(session_state.iter_history())
+    assert len(history) == starts - (1 if snapshot.get("active_delegation") else 0)
+
+
+def test_workflow_index_keeps_every_task(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    from scripts import workflow_orchestrator as orchestrator
+
+    _run_processes(_workflows, str(tmp_path))
+
+    index = json.loads(Path(".opencode/context/active_tasks_index.json").read_text())
+    assert len(index["tasks"]) == PROCESSES * (ITERATIONS // 4)
+    assert orchestrator.list_tasks(status="ACTIVE")["count"] == PROCESSES * (ITERATIONS // 4)
+
+
+def test_coordinator_state_is_written_under_the_lock(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    _run_processes(_coordinator_state, str(tmp_path))
+
+    state_file = tmp_path / ".opencode/context/parallel_coordinator_state.json"
+    state = json.loads(state_file.read_text())
+    assert state["stats"]["tasks_started"] % ITERATIONS == ITERATIONS - 1
+    assert not list(state_file.parent.glob("*.tmp"))
+
+    # A writer holding the lock keeps the coordinator waiting
+    from scripts.parallel_coordinator import ParallelCoordinator
+
+    coordinator = ParallelCoordinator(config_path="missing.yaml")
+    coordinator.state_store = None
+    saver = threading.Thread(target=coordinator._save_monitoring_state)
+    with file_lock(state_file):
+        saver.start()
+        saver.join(timeout=0.2)
+        assert saver.is_alive()
+    saver.join(timeout=5)
+    assert not saver.is_alive()
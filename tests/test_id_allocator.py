@@ -0,0 +1,72 @@
+"""
+Tests for the cross-process task counter allocator.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from scripts.id_allocator import CounterAllocator, get_allocator
+from scripts.task_id_generator import TaskIDGenerator
+
+PROCESSES = 6
+IDS_PER_PROCESS = 5000
+
+
+def _allocate(counter_path: str, out_path: str) -> None:
+    allocator = get_allocator(counter_path)
+    values = [allocator.next() for _ in range(IDS_PER_PROCESS)]
+    values.extend(allocator.allocate(100))
+    Path(out_path).write_text(json.dumps(values))
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_no_collisions_across_processes(tmp_path: Path) -> None:
+    counter_path = str(tmp_path / "counter")
+    # Lease a block in the parent first: forked children must not reuse it
+    parent = [get_allocator(counter_path).next() for _ in range(10)]
+
+    outputs = [tmp_path / f"ids_{n}.json" for n in range(PROCESSES)]
+    workers = [
+        multiprocessing.Process(target=_allocate, args=(counter_path, str(out)))
+        for out in outputs
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    values = parent + [v for out in outputs for v in json.loads(out.read_text())]
+    assert len(values) == 10 + PROCESSES * (IDS_PER_PROCESS + 100)
+    assert len(set(values)) == len(values)
+
+
+def test_occasional_callers_get_dense_counters(tmp_path: Path) -> None:
+    path = tmp_path / "counter"
+    assert [CounterAllocator(path).next() for _ in range(3)] == [1, 2, 3]
+    assert path.read_text() == "3"
+    assert CounterAllocator(tmp_path / "other", start=100).next() == 100
+
+
+def test_generators_share_the_counter(project: Path) -> None:
+    first = TaskIDGenerator().generate_task_id("BUILD", "one")
+    second = TaskIDGenerator().generate_task_id("BUILD", "two")
+
+    assert second["counter"] == first["counter"] + 1
+    assert Path(".opencode/.task_counter").exists()
+
+
+def test_generator_counter_wraps(project: Path) -> None:
+    generator = TaskIDGenerator()
+    generator.max_counter = 3
+    assert [generator._get_next_counter() for _ in range(5)] == [1, 2, 3, 1, 2]
@@ -0,0 +1,111 @@
+"""
+Tests for diff-based test selection.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts.impact_map import IMPACT_PATH, changed_files, select_tests
+
+E2E_RUNNER = Path(__file__).parent.parent / "skills" / "integration-verifier" / "scripts" / "e2e_runner.py"
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                   cwd=root, check=True, capture_output=True)
+
+
+def _repo(root: Path) -> None:
+    (root / "app").mkdir()
+    (root / "app" / "__init__.py").write_text("")
+    (root / "app" / "orders.py").write_text("def total():\n    return 3\n")
+    (root / "app" / "users.py").write_text("def name():\n    return 'x'\n")
+    tests = root / "tests" / "integration"
+    tests.mkdir(parents=True)
+    (tests / "test_orders.py").write_text("from app.orders import total\n\ndef test_total():\n    assert total() == 3\n")
+    (tests / "test_users.py").write_text("from app.users import name\n\ndef test_name():\n    assert name() == 'x'\n")
+    (root / ".gitignore").write_text(".opencode/\n__pycache__/\n")
+    _git(root, "init", "-q")
+    _git(root, "add", ".")
+    _git(root, "commit", "-q", "-m", "init")
+
+
+def test_selects_tests_affected_by_the_diff(tmp_path: Path) -> None:
+    _repo(tmp_path)
+    assert changed_files(tmp_path) == []
+    assert select_tests(["tests"], root=tmp_path) is None  # clean tree: run everything
+
+    (tmp_path / "app" / "orders.py").write_text("def total():\n    return 4\n")
+    assert changed_files(tmp_path) == ["app/orders.py"]
+    assert select_tests(["tests"], root=tmp_path) == ["tests/integration/test_orders.py"]
+    assert not (tmp_path / IMPACT_PATH).exists()  # selecting never writes the map
+
+    assert select_tests(["tests"], root=tmp_path, changed=["tests/integration/test_users.py"]) == [
+        "tests/integration/test_users.py"]
+    assert select_tests(["tests"], root=tmp_path, changed=["tests/conftest.py"]) is None
+    (tmp_path / "app" / "unused.py").write_text("VALUE = 1\n")
+    assert select_tests(["tests"], root=tmp_path, changed=["app/unused.py"]) == []
+    assert changed_files(tmp_path / "app") == ["orders.py"]
+
+
+def test_non_python_changes_select_everything(tmp_path: Path) -> None:
+    _repo(tmp_path)
+    (tmp_path / "app" / "settings.json").write_text('{"currency": "EUR"}\n')
+    assert changed_files(tmp_path) == ["app/settings.json"]
+    assert select_tests(["tests"], root=tmp_path) is None
+    assert select_tests(["tests"], root=tmp_path, changed=["app/orders.py", "schema.sql"]) is None
+
+
+def test_deleted_files_select_everything(tmp_path: Path) -> None:
+    _repo(tmp_path)
+    _git(tmp_path, "rm", "-q", "app/users.py")
+    assert changed_files(tmp_path) == ["app/users.py"]
+    assert select_tests(["tests"], root=tmp_path) is None
+
+    _git(tmp_path, "reset", "-q", "--hard")
+    _git(tmp_path, "mv", "app/orders.py", "app/billing.py")
+    assert select_tests(["tests"], root=tmp_path) is None
+
+
+def test_selection_uses_configured_test_file_names(tmp_path: Path) -> None:
+    _repo(tmp_path)
+    (tmp_path / "pytest.ini").write_text("[pytest]\npython_files = check_*.py\n")
+    (tmp_path / "tests" / "integration" / "check_orders.py").write_text(
+        "from app.orders import total\n\ndef test_total():\n    assert total() == 3\n")
+    assert select_tests(["tests"], root=tmp_path, changed=["app/orders.py"]) == [
+        "tests/integration/check_orders.py"]
+
+
+def test_e2e_runner_runs_only_affected_tests(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    spec = importlib.util.spec_from_file_location("e2e_runner", E2E_RUNNER)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "e2e_runner", module)
+    spec.loader.exec_module(module)
+
+    _repo(tmp_path)
+    runner = module.E2ERunner(tmp_path)
+    clean = runner.run_integration_tests(workers=1)
+    assert (clean.passed, clean.failed) == (2, 0)
+    assert "selection" not in clean.artifacts
+
+    (tmp_path / "app" / "unused.py").write_text("VALUE = 1\n")
+    untouched = runner.run_integration_tests(workers=1)
+    assert untouched.scenarios_run == 0 and untouched.artifacts["selection"] == "none"
+    assert not untouched.all_passed
+    (tmp_path / "app" / "unused.py").unlink()
+
+    (tmp_path / "app" / "users.py").write_text("def name():\n    return 'y'\n")
+    results = runner.run_integration_tests(workers=1)
+    assert (results.passed, results.failed) == (0, 1)
+    assert results.results[0].name == "tests/integration/test_users.py::test_name"
+    assert results.artifacts["selection"] == "1 affected test file(s)"
+
+    everything = runner.run_integration_tests(workers=2, all_tests=True)
+    assert (everything.passed, everything.failed) == (1, 1)
+    assert "selection" not in everything.artifacts
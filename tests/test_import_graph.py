@@ -0,0 +1,68 @@
+"""
+Tests for the cached project import graph.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from scripts.import_graph import ImportGraph, module_names, parse_imports
+
+
+def _write(root: Path, rel_path: str, text: str) -> None:
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_parse_imports_resolves_relative_and_dynamic_imports() -> None:
+    source = (
+        "import os, pkg.core\n"
+        "from . import helpers\n"
+        "from ..shared.util import thing\n"
+        "import_module('task_gc', 'TaskGC')\n"
+    )
+    assert parse_imports(source, "app/pkg/mod.py") == [
+        "app.pkg", "app.pkg.helpers", "app.shared.util", "app.shared.util.thing",
+        "os", "pkg.core", "task_gc",
+    ]
+    assert parse_imports("def broken(:\n", "x.py") == []
+    assert module_names("scripts/pkg/__init__.py") == {"scripts.pkg", "pkg"}
+
+
+def test_dependents_and_tests(tmp_path: Path) -> None:
+    _write(tmp_path, "scripts/__init__.py", "")
+    _write(tmp_path, "scripts/base.py", "X = 1\n")
+    _write(tmp_path, "scripts/middle.py", "import sys\nfrom base import X\n")
+    _write(tmp_path, "scripts/other.py", "import json\n")
+    _write(tmp_path, "tests/test_middle.py", "from scripts.middle import X\n")
+    _write(tmp_path, "tests/test_other.py", "from scripts import other\n")
+
+    graph = ImportGraph(tmp_path).build()
+    assert graph.dependents("scripts/base.py") == {"scripts/middle.py", "tests/test_middle.py"}
+    assert graph.tests_for("scripts/base.py") == ["tests/test_middle.py"]
+    assert graph.tests_for("scripts/other.py") == ["tests/test_other.py"]
+    assert graph.tests_for("tests/test_other.py") == ["tests/test_other.py"]
+    assert graph.dependencies("scripts/middle.py") == {"scripts/base.py"}
+    assert graph.closure(["tests/test_middle.py"]) == {
+        "tests/test_middle.py", "scripts/middle.py", "scripts/base.py"}
+
+
+def test_cache_reparses_only_changed_files(tmp_path: Path, monkeypatch) -> None:
+    from scripts import import_graph
+
+    _write(tmp_path, "a.py", "import b\n")
+    _write(tmp_path, "b.py", "")
+    ImportGraph(tmp_path).build()
+    assert (tmp_path / import_graph.CACHE_PATH).exists()
+
+    parsed = []
+    real_parse = import_graph.parse_imports
+    monkeypatch.setattr(import_graph, "parse_imports", lambda src, rel: parsed.append(rel) or real_parse(src, rel))
+    _write(tmp_path, "b.py", "import a\n")
+    os.utime(tmp_path / "b.py", ns=(1, 1))
+
+    graph = ImportGraph(tmp_path).build()
+    assert parsed == ["b.py"]
+    assert graph.dependents("a.py") == {"b.py"}
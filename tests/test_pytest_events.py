@@ -0,0 +1,86 @@
+"""
+Tests for the structured pytest event stream.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts.pytest_events import plugin_args, read_events, summarize
+
+SKILL_SCRIPTS = Path(__file__).parent.parent / "skills" / "integration-verifier" / "scripts"
+
+
+def _load(name: str, monkeypatch: pytest.MonkeyPatch):
+    spec = importlib.util.spec_from_file_location(name, SKILL_SCRIPTS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, name, module)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _project(root: Path) -> None:
+    tests = root / "tests" / "integration"
+    tests.mkdir(parents=True)
+    (tests / "test_mixed.py").write_text(
+        "import pytest\n\n"
+        "@pytest.fixture\ndef broken():\n    raise RuntimeError('Connection refused')\n\n"
+        "def test_ok():\n    pass\n\n"
+        "def test_bad():\n    assert 1 == 2, 'request timed out'\n\n"
+        "def test_setup_error(broken):\n    pass\n\n"
+        "@pytest.mark.skip(reason='later')\ndef test_skipped():\n    pass\n\n"
+        "@pytest.mark.xfail\ndef test_expected():\n    assert False\n")
+
+
+def test_plugin_streams_one_event_per_test(tmp_path: Path) -> None:
+    _project(tmp_path)
+    events_path = tmp_path / "events.jsonl"
+    args, env = plugin_args(events_path)
+    subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *args, "tests"],
+                   cwd=tmp_path, env=env, capture_output=True, text=True)
+
+    events = list(read_events(events_path))
+    tests = {e["nodeid"].split("::")[-1]: e for e in events if e["event"] == "test"}
+    assert {name: e["outcome"] for name, e in tests.items()} == {
+        "test_ok": "passed", "test_bad": "failed", "test_setup_error": "error",
+        "test_skipped": "skipped", "test_expected": "xfailed"}
+    assert tests["test_ok"]["nodeid"] == "tests/integration/test_mixed.py::test_ok"
+    assert "request timed out" in tests["test_bad"]["message"]
+    assert tests["test_setup_error"]["when"] == "setup"
+    assert tests["test_skipped"]["message"] == "Skipped: later"
+
+    summary = summarize(events)
+    assert summary["collected"] == 5
+    assert (summary["passed"], summary["failed"], summary["error"]) == (1, 1, 1)
+    assert summary["exitstatus"] == 1
+
+
+def test_read_events_skips_truncated_lines(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    path.write_text('{"event": "collected", "count": 2}\n{"event": "te')
+    assert summarize(read_events(path))["collected"] == 2
+    assert list(read_events(tmp_path / "missing.jsonl")) == []
+
+
+def test_consumers_read_events(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _project(tmp_path)
+    e2e_runner = _load("e2e_runner", monkeypatch)
+    results = e2e_runner.E2ERunner(tmp_path).run_integration_tests(workers=1)
+    assert (results.passed, results.failed, results.skipped) == (1, 2, 2)
+    assert [r.name.split("::")[-1] for r in results.results] == ["test_bad", "test_setup_error"]
+
+    failure_detector = _load("failure_detector", monkeypatch)
+    events = [
+        {"event": "test", "nodeid": "t.py::test_ok", "outcome": "passed", "duration": 0.1, "message": ""},
+        {"event": "test", "nodeid": "t.py::test_api", "outcome": "failed", "duration": 1.5,
+         "message": "Connection refused"},
+    ]
+    [failure] = failure_detector.FailureDetector().analyze_events(events)
+    assert failure.test_name == "t.py::test_api"
+    assert failure.failure_type == failure_detector.FailureType.NETWORK
+    assert failure.context["duration_ms"] == "1500"
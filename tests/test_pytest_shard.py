@@ -0,0 +1,121 @@
+"""
+Tests for file-level pytest sharding.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts.pytest_shard import (
+    DURATIONS_PATH, configured_test_paths, discover_test_files, file_costs, run_sharded, split_lpt,
+)
+
+E2E_RUNNER = Path(__file__).parent.parent / "skills" / "integration-verifier" / "scripts" / "e2e_runner.py"
+
+
+def _project(root: Path) -> None:
+    tests = root / "tests" / "integration"
+    tests.mkdir(parents=True)
+    (tests / "test_a.py").write_text("def test_one():\n    pass\n\ndef test_two():\n    pass\n")
+    (tests / "test_b.py").write_text(
+        "import pytest\n\nclass TestB:\n    def test_bad(self):\n        assert 1 == 2, 'mismatch'\n\n"
+        "@pytest.mark.skip\ndef test_skipped():\n    pass\n")
+    (tests / "test_c.py").write_text("def test_three():\n    pass\n")
+
+
+def test_lpt_split_balances_by_cost() -> None:
+    costs = {"a": 5.0, "b": 4.0, "c": 3.0, "d": 3.0, "e": 1.0}
+    shards = split_lpt(costs, 2)
+    loads = sorted(sum(costs[f] for f in shard) for shard in shards)
+    assert loads == [8.0, 8.0]
+    assert split_lpt({"a": 1.0}, 4) == [["a"]]
+
+    durations = {"t/x.py::test_1": 2.0, "t/x.py::test_2": 1.0, "t/y.py::test_1": 4.0}
+    assert file_costs(["t/x.py", "t/y.py", "t/new.py"], durations) == {
+        "t/x.py": 3.0, "t/y.py": 4.0, "t/new.py": 3.5}
+
+
+def test_configured_test_paths(tmp_path: Path) -> None:
+    assert configured_test_paths(tmp_path) == ["."]
+    (tmp_path / "pytest.ini").write_text("[pytest]\ntestpaths = tests other\n")
+    assert configured_test_paths(tmp_path) == ["tests", "other"]
+    (tmp_path / "pytest.ini").write_text("")  # pytest.ini wins even without a section
+    (tmp_path / "tox.ini").write_text("[pytest]\ntestpaths = elsewhere\n")
+    assert configured_test_paths(tmp_path) == ["."]
+
+
+def test_discovery_follows_pytest_config(tmp_path: Path) -> None:
+    for name in ("tests/check_api.py", "tests/test_api.py", "tests/legacy/test_old.py",
+                 "tests/fixtures/test_data.py", "tests/.hidden/test_x.py", "tests/env/pyvenv.cfg",
+                 "tests/env/test_site.py"):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("")
+
+    def found() -> list[str]:
+        return [Path(f).relative_to(tmp_path).as_posix()
+                for f in discover_test_files([tmp_path / "tests"], tmp_path)]
+
+    assert found() == ["tests/fixtures/test_data.py", "tests/legacy/test_old.py", "tests/test_api.py"]
+    (tmp_path / "setup.cfg").write_text(
+        "[tool:pytest]\npython_files = check_*.py test_*.py\nnorecursedirs = legacy fixtures\n")
+    assert found() == ["tests/.hidden/test_x.py", "tests/check_api.py", "tests/test_api.py"]
+
+
+def test_run_sharded_merges_results_and_records_durations(tmp_path: Path) -> None:
+    _project(tmp_path)
+    report = run_sharded(["tests"], workers=3, cwd=tmp_path)
+
+    assert report.shards == 3
+    assert report.collected == 5
+    assert (report.passed, report.failed, report.skipped) == (3, 1, 1)
+    assert not report.success
+    [failure] = report.failures()
+    assert failure.node_id == "tests/integration/test_b.py::TestB::test_bad"
+    assert "mismatch" in failure.message
+    assert report.summary().startswith("1 failed, 3 passed, 1 skipped in ")
+
+    durations = json.loads((tmp_path / DURATIONS_PATH).read_text())
+    assert "tests/integration/test_a.py::test_one" in durations
+    assert not any("test_skipped" in node for node in durations)
+
+
+def test_e2e_runner_uses_shards(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    spec = importlib.util.spec_from_file_location("e2e_runner", E2E_RUNNER)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "e2e_runner", module)
+    spec.loader.exec_module(module)
+    assert module.run_sharded is not None
+
+    _project(tmp_path)
+    results = module.E2ERunner(tmp_path).run_integration_tests(workers=2)
+    assert (results.passed, results.failed, results.skipped) == (3, 1, 1)
+    assert results.artifacts["shards"] == "2"
+    assert results.results[0].name.endswith("TestB::test_bad")
+
+    (tmp_path / "tests" / "integration" / "test_b.py").unlink()
+    assert module.E2ERunner(tmp_path).run_integration_tests(workers=2).all_passed
+
+
+def test_sharded_and_serial_runs_count_outcomes_alike(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    spec = importlib.util.spec_from_file_location("e2e_runner", E2E_RUNNER)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "e2e_runner", module)
+    spec.loader.exec_module(module)
+
+    _project(tmp_path)
+    (tmp_path / "tests" / "integration" / "test_x.py").write_text(
+        "import pytest\n\n@pytest.mark.xfail\ndef test_fixed():\n    pass\n\n"
+        "@pytest.mark.xfail\ndef test_known_bug():\n    assert False\n")
+    runner = module.E2ERunner(tmp_path)
+    serial = runner.run_integration_tests(workers=1, all_tests=True)
+    sharded = runner.run_integration_tests(workers=2, all_tests=True)
+
+    assert (sharded.passed, sharded.failed, sharded.skipped) == (4, 1, 2)
+    assert (serial.passed, serial.failed, serial.skipped) == (4, 1, 2)
+    assert sorted(sharded.passed_tests) == sorted(serial.passed_tests)
+    assert "tests/integration/test_x.py::test_fixed" in sharded.passed_tests
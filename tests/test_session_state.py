@@ -5,6 +5,7 @@ Tests for Session State Manager.
 """
 
 import json
+import multiprocessing
 import pytest
 from pathlib import Path
 
@@ -310,6 +311,210 @@ class TestSessionStateManager:
         assert state.current_workflow == "DEBUG"
         assert state.current_phase == "INVESTIGATION"
 
+    def test_journal_tail_replayed_after_snapshot(self):
+        """Events appended after the snapshot are recovered on load."""
+        from session_state import (
+            load_session_state,
+            start_delegation,
+            clear_session,
+            SESSION_JOURNAL_FILE,
+            SESSION_STATE_FILE,
+        )
+
+        clear_session()
+        start_delegation(
+            delegator="Oracle",
+            delegate="Builder",
+            workflow="BUILD",
+            phase="IMPLEMENTATION",
+            task_description="Crash before snapshot",
+        )
+        snapshot = SESSION_STATE_FILE.read_text()
+
+        # Simulate a writer that appended its event but died before re-snapshotting
+        with open(SESSION_JOURNAL_FILE, "a") as f:
+            f.write(json.dumps({
+                "event": "complete",
+                "at": "2026-01-01T00:00:00",
+                "delegate": "Builder",
+                "checkpoint": "Recovered",
+                "artifacts": ["a.py"],
+            }) + "\n")
+            f.write('{"event": "start", "partial')  # torn write is ignored
+
+        assert SESSION_STATE_FILE.read_text() == snapshot
+        state = load_session_state()
+        assert state.active_delegation is None
+        assert state.history[-1].checkpoint == "Recovered"
+        assert state.current_agent == "Oracle"
+
+    def test_append_after_torn_write(self):
+        """A torn journal line does not swallow the next event or break loading."""
+        from session_state import (
+            load_session_state,
+            start_delegation,
+            complete_delegation,
+            clear_session,
+            iter_history,
+            SESSION_JOURNAL_FILE,
+        )
+
+        clear_session()
+        start_delegation(
+            delegator="Oracle",
+            delegate="Builder",
+            workflow="BUILD",
+            phase="IMPLEMENTATION",
+            task_description="Before the crash",
+        )
+        with open(SESSION_JOURNAL_FILE, "a") as f:
+            f.write('{"event": "complete", "parti')  # writer died mid-line
+
+        start_delegation(
+            delegator="Oracle",
+            delegate="Janitor",
+            workflow="DEBUG",
+            phase="INVESTIGATION",
+            task_description="After the crash",
+        )
+        state = load_session_state()
+        assert state.active_delegation is not None
+        assert state.active_delegation.delegate == "Janitor"
+        assert state.history[-1].delegate == "Builder"
+        assert state.history[-1].interrupted
+
+        complete_delegation("Janitor", checkpoint="Done")
+        state = load_session_state()
+        assert state.active_delegation is None
+        assert [d.delegate for d in iter_history()] == ["Builder", "Janitor"]
+
+    def test_snapshot_history_is_bounded(self, monkeypatch):
+        """The snapshot keeps a bounded window; the journal keeps every event."""
+        import session_state
+        from session_state import (
+            start_delegation,
+            complete_delegation,
+            clear_session,
+            SESSION_JOURNAL_FILE,
+            SESSION_STATE_FILE,
+        )
+
+        monkeypatch.setattr(session_state, "HISTORY_WINDOW", 3)
+        clear_session()
+
+        for i in range(5):
+            start_delegation(
+                delegator="Oracle",
+                delegate="Builder",
+                workflow="BUILD",
+                phase="IMPLEMENTATION",
+                task_description=f"Task {i}",
+            )
+            complete_delegation(delegate="Builder", checkpoint=f"Done {i}")
+
+        data = json.loads(SESSION_STATE_FILE.read_text())
+        assert [h["task_description"] for h in data["history"]] == ["Task 2", "Task 3", "Task 4"]
+        assert len(SESSION_JOURNAL_FILE.read_text().splitlines()) == 10
+
+    def test_concurrent_writers_match_full_replay(self):
+        """Whatever snapshot wins a race, snapshot + tail equals a full replay."""
+        from session_state import load_session_state, clear_session, SESSION_STATE_FILE
+
+        clear_session()
+        workers = [multiprocessing.Process(target=_delegate_repeatedly, args=(i,)) for i in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        from_snapshot = load_session_state()
+        SESSION_STATE_FILE.unlink()
+        from_journal = load_session_state()
+
+        assert len(from_snapshot.history) == len(from_journal.history)
+        assert from_snapshot.active_delegation == from_journal.active_delegation
+        assert from_snapshot.current_agent == from_journal.current_agent
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need 3.10+")
+    def test_state_classes_use_slots(self):
+        """DelegationState and SessionState are __slots__ dataclasses."""
+        from session_state import DelegationState, SessionState
+
+        assert "__slots__" in vars(DelegationState)
+        assert "__slots__" in vars(SessionState)
+        assert not hasattr(SessionState(), "__dict__")
+
+    def test_history_materialized_on_access(self):
+        """Loading keeps history entries raw until they are read."""
+        from session_state import (
+            load_session_state,
+            start_delegation,
+            complete_delegation,
+            clear_session,
+            DelegationState,
+        )
+
+        clear_session()
+        for i in range(3):
+            start_delegation(
+                delegator="Oracle",
+                delegate="Builder",
+                workflow="BUILD",
+                phase="IMPLEMENTATION",
+                task_description=f"Task {i}",
+            )
+            complete_delegation(delegate="Builder", checkpoint="Done")
+
+        state = load_session_state()
+        assert all(isinstance(item, dict) for item in state.history._items)
+
+        assert state.history[1].task_description == "Task 1"
+        assert isinstance(state.history._items[1], DelegationState)
+        assert isinstance(state.history._items[0], dict)
+
+    def test_iter_history_streams_full_journal(self, monkeypatch):
+        """iter_history yields entries that aged out of the snapshot window."""
+        import session_state
+        from session_state import (
+            load_session_state,
+            start_delegation,
+            complete_delegation,
+            clear_session,
+            iter_history,
+        )
+
+        monkeypatch.setattr(session_state, "HISTORY_WINDOW", 2)
+        clear_session()
+        for i in range(4):
+            start_delegation(
+                delegator="Oracle",
+                delegate="Builder",
+                workflow="BUILD",
+                phase="IMPLEMENTATION",
+                task_description=f"Task {i}",
+            )
+            if i != 1:
+                complete_delegation(delegate="Builder", checkpoint="Done")
+
+        streamed = list(iter_history())
+        assert [d.task_description for d in streamed] == ["Task 0", "Task 1", "Task 2", "Task 3"]
+        assert streamed[1].interrupted is True
+        assert len(load_session_state().history) <= 3
+
+
+def _delegate_repeatedly(worker: int) -> None:
+    from session_state import start_delegation, complete_delegation
+
+    for i in range(5):
+        start_delegation(
+            delegator="Oracle",
+            delegate=f"Builder{worker}",
+            workflow="BUILD",
+            phase="IMPLEMENTATION",
+            task_description=f"Worker {worker} task {i}",
+        )
+        complete_delegation(delegate=f"Builder{worker}", checkpoint="Done")
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,145 @@
+"""
+Tests for the optional SQLite state store backend.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from scripts.state_store import (
+    SQLiteStateStore,
+    StateStore,
+    StoreTaskIndex,
+    export_markdown,
+    open_state_store,
+)
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("NSO_STATE_BACKEND", "sqlite")
+    monkeypatch.setenv("NSO_STATE_DB", str(tmp_path / "state.db"))
+    return tmp_path
+
+
+def _bump(db_path: str) -> None:
+    store = SQLiteStateStore(db_path)
+    for _ in range(25):
+        store.increment("task_counter")
+
+
+def test_put_get_query(tmp_path: Path) -> None:
+    store = SQLiteStateStore(tmp_path / "state.db")
+    store.put("workflow", "b", {"task_id": "b"}, status="ACTIVE", updated_at="2026-01-02")
+    store.put("workflow", "a", {"task_id": "a"}, status="COMPLETE", updated_at="2026-01-03")
+    store.put("workflow", "c", {"task_id": "c"}, status="active", updated_at="2026-01-01")
+
+    assert store.get("workflow", "a") == {"task_id": "a"}
+    assert store.get("workflow", "missing") is None
+    assert [r["task_id"] for r in store.query("workflow", status="ACTIVE")] == ["b", "c"]
+    assert [r["task_id"] for r in store.query("workflow", order_by="updated_at", descending=True)] == ["a", "b", "c"]
+    assert store.delete("workflow", "a") is True
+    assert store.delete("workflow", "a") is False
+
+    with pytest.raises(ValueError):
+        store.query("workflow", order_by="data")
+
+
+def test_interface_is_abstract(tmp_path: Path) -> None:
+    with pytest.raises(TypeError):
+        StateStore()
+
+    index = StoreTaskIndex(SQLiteStateStore(tmp_path / "state.db"), "task_context")
+    index.upsert("t1", status="running", created_at="2026-01-01")
+    assert [r["task_id"] for r in index.query(sort_by="created_at")] == ["t1"]
+    with pytest.raises(ValueError):
+        index.query(sort_by="workflow_type")
+
+
+def test_transaction_rolls_back_on_error(tmp_path: Path) -> None:
+    store = SQLiteStateStore(tmp_path / "state.db")
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.put("session", "current", {"current_agent": "Builder"})
+            raise RuntimeError("boom")
+
+    assert store.get("session", "current") is None
+
+
+def test_increment_is_safe_across_processes(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "state.db")
+    SQLiteStateStore(db_path)
+    workers = [multiprocessing.Process(target=_bump, args=(db_path,)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert SQLiteStateStore(db_path).increment("task_counter", step=0) == 100
+    assert SQLiteStateStore(db_path).increment("other", start=41) == 42
+
+
+def test_task_counter_uses_store(sqlite_backend: Path) -> None:
+    from scripts.id_allocator import get_allocator
+
+    allocator = get_allocator(start=7)
+    assert [allocator.next() for _ in range(3)] == [7, 8, 9]
+    assert not Path(".opencode/.task_counter").exists()
+    assert open_state_store().increment("task_counter", step=0) >= 9
+
+
+def test_file_backend_is_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("NSO_STATE_BACKEND", raising=False)
+    assert open_state_store() is None
+    with pytest.raises(ValueError):
+        open_state_store("postgres")
+
+
+def test_workflow_and_session_use_store(sqlite_backend: Path) -> None:
+    from scripts import workflow_orchestrator as orchestrator
+    from scripts import session_state
+
+    orchestrator.start_workflow("BUILD", "task_sql", "oracle_1")
+    orchestrator.transition_phase("task_sql", "ARCHITECTURE", "oracle_1", skip_gate=True)
+    session_state.start_delegation("Oracle", "Builder", "BUILD", "IMPLEMENTATION", "Build it")
+
+    # Nothing is written as markdown/JSON until export
+    assert not Path(".opencode/context/active_tasks/task_sql/workflow_state.md").exists()
+    assert not session_state.SESSION_STATE_FILE.exists()
+    assert not session_state.SESSION_JOURNAL_FILE.exists()
+
+    status = orchestrator.get_status("task_sql")
+    assert status["current_phase"] == "ARCHITECTURE"
+    assert len(status["phase_history"]) == 1
+    assert [t["task_id"] for t in orchestrator.list_tasks(status="ACTIVE")["tasks"]] == ["task_sql"]
+    assert session_state.get_active_delegation().delegate == "Builder"
+
+    store = open_state_store()
+    written = export_markdown(store, Path(".opencode"))
+
+    state_md = Path(".opencode/context/active_tasks/task_sql/workflow_state.md")
+    assert state_md in written
+    assert "**Current Phase:** ARCHITECTURE" in state_md.read_text()
+    summary = Path(".opencode/context/STATE_SUMMARY.md").read_text()
+    assert "task_sql" in summary
+    assert "Oracle → Builder" in summary
+
+
+def test_session_history_lives_in_store(sqlite_backend: Path) -> None:
+    from scripts import session_state
+
+    session_state.clear_session()
+    for delegate in ("Builder", "Janitor"):
+        session_state.start_delegation("Oracle", delegate, "BUILD", "IMPLEMENTATION", "Build it")
+        session_state.complete_delegation(delegate, checkpoint="done")
+
+    assert not session_state.SESSION_JOURNAL_FILE.exists()
+    assert [d.delegate for d in session_state.iter_history()] == ["Builder", "Janitor"]
+
+    session_state.clear_session()
+    assert list(session_state.iter_history()) == []
+    assert open_state_store().query(session_state.SESSION_EVENTS) == []
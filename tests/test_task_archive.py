@@ -0,0 +1,92 @@
+"""
+Tests for compressed task context archives.
+"""
+
+from __future__ import annotations
+
+import tarfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+import yaml
+
+from scripts import task_archive
+from scripts.task_archive import TaskArchive, pack
+from scripts.task_context_manager import TaskScopedContextManager
+
+TASKS = Path(".opencode/context/tasks")
+ARCHIVE = Path(".opencode/context/archive")
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _tree(root: Path) -> None:
+    (root / "01_memory").mkdir(parents=True)
+    (root / "empty").mkdir()
+    (root / "notes.md").write_text("hello\n")
+    (root / "01_memory" / "progress.md").write_text("Status: COMPLETED\n" * 50)
+
+
+@pytest.mark.parametrize("codec", sorted(task_archive.CODECS))
+def test_pack_reads_members_without_unpacking(project: Path, codec: str) -> None:
+    _tree(project / "src")
+    path = pack(project / "src", project / "out", "task_x", codec, metadata={"status": "completed"})
+
+    archive = TaskArchive(path)
+    assert archive.names() == ["notes.md", "01_memory/progress.md"]
+    assert archive.read_text("01_memory/progress.md") == "Status: COMPLETED\n" * 50
+    assert archive.metadata == {"status": "completed"}
+    assert "empty" not in archive
+    with pytest.raises(KeyError):
+        archive.read("missing.md")
+
+    archive.extract(project / "restored")
+    assert (project / "restored" / "notes.md").read_text() == "hello\n"
+    assert (project / "restored" / "empty").is_dir()
+
+
+def test_gzip_archive_is_a_regular_tarball(project: Path) -> None:
+    _tree(project / "src")
+    path = pack(project / "src", project / "out", "task_x", "gzip")
+
+    with tarfile.open(path, "r:gz") as tar:
+        assert tar.extractfile("notes.md").read() == b"hello\n"
+        assert sorted(tar.getnames()) == ["01_memory", "01_memory/progress.md", "empty", "notes.md"]
+
+
+def test_manager_archive_mode(project: Path) -> None:
+    config = Path(".opencode/config/task-isolation.yaml")
+    config.parent.mkdir(parents=True)
+    config.write_text(yaml.safe_dump({"cleanup": {"mode": "archive", "archive_codec": "gzip"}}))
+
+    manager = TaskScopedContextManager()
+    for task_id in ("task_done", "task_failed", "task_new"):
+        manager.create_task_context(task_id)
+    manager.get_memory_file("task_done", "progress")
+    old = (datetime.now() - timedelta(days=30)).isoformat()
+    manager.index.upsert("task_done", status="completed", created_at=old)
+    manager.index.upsert("task_failed", status="failed", created_at=old)
+
+    assert manager.cleanup_old_tasks(max_age_days=7, keep_min_tasks=1) == ["task_done", "task_failed"]
+    assert not (TASKS / "task_done").exists()
+    assert (ARCHIVE / "task_done.tar.gz").exists()
+    assert not (ARCHIVE / "task_failed.tar.gz").exists()
+
+    assert "**Task ID:** task_done" in manager.read_task_file("task_done", "01_memory/progress_task_done.md")
+    assert manager.read_task_file("task_done", "nope.md") is None
+
+    # Archived tasks survive an index rebuild and are not collected again
+    manager.index.rebuild()
+    assert {t["task_id"]: t.get("status") for t in manager.list_tasks()} == {
+        "task_done": "completed", "task_new": "initialized"}
+    assert manager.cleanup_old_tasks(max_age_days=7, keep_min_tasks=1) == []
+
+    assert manager.delete_task_context("task_done")
+    manager.gc.stop()
+    manager.gc.drain()
+    assert list(ARCHIVE.iterdir()) == []
@@ -0,0 +1,86 @@
+"""
+Tests for task context creation from the prebuilt template tree.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from scripts import task_context_manager
+from scripts.task_context_manager import TaskScopedContextManager
+
+META = Path(".opencode/context/00_meta")
+TASKS = Path(".opencode/context/tasks")
+
+
+@pytest.fixture
+def manager(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> TaskScopedContextManager:
+    monkeypatch.chdir(tmp_path)
+    manager = TaskScopedContextManager()
+    (META / "tech-stack.md").write_text("Python 3.11\n")
+    return manager
+
+
+def test_contexts_copy_template_files(manager: TaskScopedContextManager) -> None:
+    manager.create_task_context("task_a", "BUILD")
+    manager.create_task_context("task_b", "BUILD")
+
+    for sub in ("01_memory", "requirements", "workspace", "artifacts", "status", "checkpoints", "logs"):
+        assert (TASKS / "task_a" / sub / "README.md").exists()
+
+    a, b = TASKS / "task_a" / "tech-stack.md", TASKS / "task_b" / "tech-stack.md"
+    assert "READ ONLY" in a.read_text() and "Python 3.11" in a.read_text()
+    assert not os.path.samefile(a, b) and os.stat(a).st_nlink == 1
+    assert not os.access(a, os.W_OK) or os.geteuid() == 0
+    assert not (TASKS / "task_a" / ".stamp").exists()
+
+
+def test_template_rebuilt_when_global_template_changes(manager: TaskScopedContextManager) -> None:
+    manager.create_task_context("task_a")
+    (META / "tech-stack.md").write_text("Rust\n")
+    os.utime(META / "tech-stack.md", ns=(1, 1))
+    manager.create_task_context("task_b")
+
+    assert "Python 3.11" in (TASKS / "task_a" / "tech-stack.md").read_text()
+    assert "Rust" in (TASKS / "task_b" / "tech-stack.md").read_text()
+
+
+def test_falls_back_to_copy_without_reflinks(manager: TaskScopedContextManager, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(task_context_manager, "fcntl", None)
+    manager.create_task_context("task_a")
+
+    copied = TASKS / "task_a" / "tech-stack.md"
+    assert os.stat(copied).st_nlink == 1
+    assert "Python 3.11" in copied.read_text()
+
+
+def test_editing_one_task_leaves_others_alone(manager: TaskScopedContextManager) -> None:
+    manager.create_task_context("task_a")
+    manager.create_task_context("task_b")
+
+    readme = TASKS / "task_a" / "workspace" / "README.md"
+    readme.chmod(0o644)
+    readme.write_text("scratch notes\n")
+
+    assert "Isolation Rules" in (TASKS / "task_b" / "workspace" / "README.md").read_text()
+    manager.create_task_context("task_c")
+    assert "Isolation Rules" in (TASKS / "task_c" / "workspace" / "README.md").read_text()
+
+
+def test_memory_files_created_on_first_use(manager: TaskScopedContextManager) -> None:
+    manager.create_task_context("task_a", "DEBUG")
+    memory = TASKS / "task_a" / "01_memory"
+    assert sorted(p.name for p in memory.iterdir()) == ["README.md"]
+
+    path = manager.get_memory_file("task_a", "progress")
+    assert Path(path) == memory / "progress_task_a.md"
+    assert "**Workflow:** DEBUG" in Path(path).read_text()
+    assert manager.get_memory_file("task_a", "progress") == path
+    assert manager.get_memory_file("missing", "progress") is None
+    with pytest.raises(ValueError):
+        manager.get_memory_file("task_a", "notes")
+
+    assert manager.list_tasks()[0]["status"] == "initialized"
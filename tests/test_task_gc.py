@@ -0,0 +1,140 @@
+"""
+Tests for the background task garbage collector.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from scripts.parallel_coordinator import ParallelCoordinator, TaskStatus
+from scripts.task_context_manager import TaskScopedContextManager
+from scripts.task_gc import TaskGC, _RateLimiter, select_candidates
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def _ago(days: float) -> str:
+    return (NOW - timedelta(days=days)).isoformat()
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_select_candidates_by_status_and_age() -> None:
+    records = [
+        {"task_id": "old_done", "status": "completed", "updated_at": _ago(10)},
+        {"task_id": "old_failed", "status": "FAILED", "updated_at": _ago(2)},
+        {"task_id": "old_running", "status": "running", "updated_at": _ago(30)},
+        {"task_id": "new_done", "status": "completed", "updated_at": _ago(1)},
+        {"task_id": "no_stamp", "status": "completed"},
+    ]
+    retention = {"completed": 7, "failed": 1}
+
+    assert select_candidates(records, retention, now=NOW) == ["old_done", "old_failed"]
+    assert select_candidates(records, {"*": 5}, now=NOW) == ["old_done", "old_running"]
+    # The newest keep_min records are never collected
+    assert select_candidates(records, {"*": 0}, keep_min=3, now=NOW) == ["old_done", "old_failed"]
+
+
+def test_trash_is_a_rename_and_worker_empties_it(tmp_path: Path) -> None:
+    task = tmp_path / "tasks" / "task_a"
+    (task / "sub").mkdir(parents=True)
+    for i in range(20):
+        (task / "sub" / f"f{i}.md").write_text("x")
+
+    gc = TaskGC(tmp_path / ".trash", max_ops_per_second=0)
+    assert gc.trash(task) is True
+    assert not task.exists()
+    assert len(gc.pending()) == 1
+    assert gc.trash(task) is False
+
+    gc.start()
+    deadline = time.monotonic() + 5
+    while gc.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    gc.stop()
+    assert gc.pending() == []
+
+
+def test_rate_limiter_bounds_operations_per_second() -> None:
+    import threading
+
+    limiter = _RateLimiter(200, threading.Event())
+    started = time.monotonic()
+    for _ in range(300):
+        assert limiter.acquire()
+    # 200 tokens of burst, then 100 more at 200/s
+    assert time.monotonic() - started >= 0.45
+
+    stopping = threading.Event()
+    stopping.set()
+    slow = _RateLimiter(1, stopping)
+    slow.tokens = 0
+    assert slow.acquire() is False
+
+
+def test_context_manager_cleanup_uses_index_and_trash(project: Path) -> None:
+    manager = TaskScopedContextManager()
+    for name in ("task_1", "task_2", "task_3"):
+        manager.create_task_context(name)
+    manager.index.upsert("task_1", created_at=_ago(30))
+    manager.index.upsert("task_2", created_at=_ago(20))
+
+    cleaned = manager.cleanup_old_tasks(max_age_days=7, keep_min_tasks=1)
+    assert cleaned == ["task_1", "task_2"]
+    assert [t["task_id"] for t in manager.list_tasks()] == ["task_3"]
+    assert not Path(".opencode/context/tasks/task_1").exists()
+
+    manager.gc.stop()
+    manager.gc.drain()
+    assert manager.gc.pending() == []
+
+
+def test_coordinator_collects_from_index(project: Path) -> None:
+    coordinator = ParallelCoordinator(config_path="missing.yaml")
+    manager = coordinator.context_manager
+    manager.create_task_context("task_done")
+    manager.create_task_context("task_recent")
+    coordinator._record_task_status("task_done", TaskStatus.COMPLETED)
+    manager.index.upsert("task_done", updated_at=(datetime.now() - timedelta(days=30)).isoformat())
+    manager.set_task_status("task_recent", "completed")
+
+    coordinator._cleanup_old_tasks()
+
+    assert [t["task_id"] for t in manager.list_tasks()] == ["task_recent"]
+    manager.gc.stop()
+
+
+def test_coordinator_archives_in_the_background(project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import threading
+
+    coordinator = ParallelCoordinator(config_path="missing.yaml")
+    coordinator.config.setdefault("task_isolation", {})["cleanup"] = {"mode": "archive"}
+    manager = coordinator.context_manager
+    manager.create_task_context("task_done")
+    coordinator._record_task_status("task_done", TaskStatus.COMPLETED)
+    manager.index.upsert("task_done", updated_at=(datetime.now() - timedelta(days=30)).isoformat())
+
+    release = threading.Event()
+    archived = []
+
+    def slow_archive(task_id: str) -> None:
+        release.wait(5)
+        archived.append(task_id)
+
+    monkeypatch.setattr(manager, "archive_task_context", slow_archive)
+    coordinator._cleanup_old_tasks()
+    coordinator._cleanup_old_tasks()  # still queued: not submitted twice
+    assert archived == []
+
+    release.set()
+    coordinator.wait_for_archiving()
+    assert archived == ["task_done"]
+    manager.gc.stop()
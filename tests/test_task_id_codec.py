@@ -0,0 +1,92 @@
+"""
+Tests for the shared task ID codec.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from scripts import task_id_codec as codec
+from scripts.context_contamination_detector import ContextContaminationDetector
+from scripts.parallel_oracle_integration import TaskIDGenerator as OracleTaskIDGenerator
+from scripts.task_id_generator import TaskIDGenerator
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_format_and_parse_round_trip() -> None:
+    task_id = codec.format_task_id("20260212_101500", "BUILD", "ab12cd34", 7)
+    assert task_id == "task_20260212_101500_build_ab12cd34_7"
+    assert codec.parse(task_id) == {
+        "task_id": task_id,
+        "timestamp": "20260212_101500",
+        "workflow_type": "build",
+        "hash": "ab12cd34",
+        "counter": 7,
+        "additional_parts": [],
+    }
+    assert codec.parse(f"{task_id}_analysis_2")["additional_parts"] == ["analysis", "2"]
+
+    oracle_id = codec.format_oracle_id("dream-news", "BUILD", "20260208_093000", "abc123", 1)
+    assert oracle_id == "dream-news_build_20260208_093000_abc123_001"
+    parsed = codec.parse(oracle_id)
+    assert parsed["project"] == "dream-news" and parsed["counter"] == 1
+    assert codec.parse(oracle_id, oracle=False) is None
+
+
+def test_validate() -> None:
+    assert codec.validate("task_20260212_101500_debug_ff00_12", workflows=codec.WORKFLOWS)
+    assert not codec.validate("task_20260212_101500_deploy_ff00_12", workflows=codec.WORKFLOWS)
+    assert not codec.validate("task_2026_101500_build_ff00_1")
+    assert not codec.validate("")
+
+
+def test_parse_many_and_search_many() -> None:
+    names = [
+        "task_20260212_101500_build_ab12cd34_1",
+        "not-a-task",
+        "proj_review_20260212_101500_abcdef_002",
+        "task_20260212_101500_plan_00ff_3_sub_1",
+    ]
+    parsed = codec.parse_many(names)
+    assert set(parsed) == {names[0], names[2], names[3]}
+    assert parsed[names[2]]["project"] == "proj"
+    assert parsed[names[3]]["additional_parts"] == ["sub", "1"]
+
+    files = ["notes.md", "task_20260212_101500_build_ab12cd34_1_progress.md", "x_task_20260101_000000_plan_ff_9.md"]
+    assert codec.search_many(files) == {
+        files[1]: "task_20260212_101500_build_ab12cd34_1",
+        files[2]: "task_20260101_000000_plan_ff_9",
+    }
+
+
+def test_generators_produce_valid_ids(project: Path) -> None:
+    generator = TaskIDGenerator()
+    task_id = generator.generate_task_id("REVIEW", "check the thing")["task_id"]
+    assert generator.validate_task_id(task_id)
+    assert generator.parse_task_id(task_id)["workflow_type"] == "review"
+
+    oracle_id = OracleTaskIDGenerator.generate(workflow="build", agent="oracle", project="nso")
+    assert codec.parse(oracle_id)["project"] == "nso"
+
+
+def test_detector_flags_task_files_in_global_memory(project: Path) -> None:
+    memory = Path(".opencode/context/01_memory")
+    memory.mkdir(parents=True)
+    (memory / "patterns.md").write_text("")
+    (memory / "task_20260212_101500_build_ab12cd34_1_notes.md").write_text("")
+
+    detector = ContextContaminationDetector(config_path="missing.yaml")
+    events = detector._scan_global_memory()
+
+    assert [Path(e["file_path"]).name for e in events] == ["task_20260212_101500_build_ab12cd34_1_notes.md"]
+    assert detector.validate_task_id_format("task_20260212_101500_build_ab12cd34_1")
+    assert not detector.validate_task_id_format("task_20260212_101500_build_ab12_1")
+    assert not detector.validate_task_id_format("task_20260212_101500_build_ab12cd34_1_sub")
+    assert codec.validate("task_20260212_101500_build_ab12_1_sub", oracle=False)
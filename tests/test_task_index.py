@@ -0,0 +1,108 @@
+"""
+Tests for the task index used by workflow and task-context listings.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts import workflow_orchestrator as orchestrator
+from scripts.task_context_manager import TaskScopedContextManager
+from scripts.task_index import TaskIndex
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_upsert_query_and_remove(tmp_path: Path) -> None:
+    index = TaskIndex(tmp_path / "index.json")
+    index.upsert("b", status="ACTIVE", updated_at="2026-01-02")
+    index.upsert("a", status="COMPLETE", updated_at="2026-01-03")
+    index.upsert("c", status="ACTIVE", updated_at="2026-01-01")
+
+    assert [r["task_id"] for r in index.query()] == ["a", "b", "c"]
+    assert [r["task_id"] for r in index.query(status="active")] == ["b", "c"]
+    assert [r["task_id"] for r in index.query(sort_by="updated_at", reverse=True)] == ["a", "b", "c"]
+
+    assert index.remove("b") is True
+    assert index.remove("b") is False
+    assert index.get("b") is None
+
+
+def test_orchestrator_keeps_index_in_sync(project: Path) -> None:
+    orchestrator.start_workflow("BUILD", "task_one", "oracle_1")
+    orchestrator.start_workflow("DEBUG", "task_two", "oracle_1")
+    orchestrator.cancel_task("task_two", "oracle_1")
+
+    active = orchestrator.list_tasks(status="ACTIVE")
+    assert [t["task_id"] for t in active["tasks"]] == ["task_one"]
+
+    cancelled = orchestrator.list_tasks(status="CANCELLED")
+    assert cancelled["tasks"][0]["current_phase"] == "INVESTIGATION"
+
+    result = orchestrator.transition_phase("task_one", "ARCHITECTURE", "oracle_1", skip_gate=True)
+    assert result["success"] is True
+    listed = {t["task_id"]: t for t in orchestrator.list_tasks()["tasks"]}
+    assert listed["task_one"]["current_phase"] == "ARCHITECTURE"
+
+
+def test_orchestrator_rebuilds_missing_index(project: Path) -> None:
+    orchestrator.start_workflow("REVIEW", "legacy_task", "oracle_1")
+    index_path = Path(".opencode/context/active_tasks_index.json")
+    index_path.unlink()
+    (Path(".opencode/context/active_tasks") / "stray_dir").mkdir()
+
+    tasks = {t["task_id"]: t for t in orchestrator.list_tasks()["tasks"]}
+
+    assert tasks["legacy_task"]["workflow"] == "REVIEW"
+    assert tasks["stray_dir"]["status"] == "NO_STATE"
+    assert index_path.exists()
+
+
+def test_context_manager_lists_from_index(project: Path) -> None:
+    manager = TaskScopedContextManager()
+    manager.create_task_context("task_a", "BUILD")
+    manager.create_task_context("task_b", "DEBUG")
+    manager.set_task_status("task_b", "running")
+
+    assert [t["task_id"] for t in manager.list_tasks()] == ["task_a", "task_b"]
+    assert [t["task_id"] for t in manager.list_tasks("running")] == ["task_b"]
+
+    manager.delete_task_context("task_a")
+    index = json.loads(Path(".opencode/context/tasks_index.json").read_text())
+    assert list(index["tasks"]) == ["task_b"]
+
+
+def test_context_manager_rebuild_lists_bare_task_directories(project: Path) -> None:
+    manager = TaskScopedContextManager()
+    bare = Path(".opencode/context/tasks/task_20260212_101500_debug_ab12cd34_4")
+    bare.mkdir(parents=True)
+    (bare.parent / "scratch").mkdir()
+
+    manager.index.rebuild()
+    tasks = {t["task_id"]: t for t in manager.list_tasks()}
+
+    assert list(tasks) == [bare.name]
+    assert tasks[bare.name]["workflow_type"] == "DEBUG"
+    assert tasks[bare.name]["created_at"] == "2026-02-12T10:15:00"
+
+
+def test_status_comes_from_set_task_status(project: Path) -> None:
+    manager = TaskScopedContextManager()
+    manager.create_task_context("task_a", "BUILD")
+    progress = Path(manager.get_memory_file("task_a", "progress"))
+    progress.write_text(progress.read_text() + "\nStatus: COMPLETED\n")
+
+    assert [t["status"] for t in manager.list_tasks()] == ["initialized"]
+    assert manager.list_tasks("completed") == []
+
+    manager.set_task_status("task_a", "failed")
+    manager.index.rebuild()
+    assert [t["status"] for t in manager.list_tasks()] == ["failed"]
+    assert manager.set_task_status("missing", "failed") is False
@@ -0,0 +1,160 @@
+"""
+Tests for the concurrent validation harness.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+
+import pytest
+
+from scripts.validate import parse_pytest_count, run_command, run_stages
+
+
+def _sleeper(seconds: float, passed=True, line: str = ""):
+    def stage(cancel: threading.Event):
+        if cancel.wait(seconds):
+            return False, ["killed"]
+        return passed, [line] if line else []
+    return stage
+
+
+def test_stages_run_concurrently_with_ordered_output(capsys: pytest.CaptureFixture) -> None:
+    stages = [
+        ("first", _sleeper(0.3, line="one")),
+        ("second", _sleeper(0.0, line="two")),
+        ("third", _sleeper(0.3, passed=None, line="skipped")),
+    ]
+    started = time.monotonic()
+    assert run_stages(stages) is True
+    assert time.monotonic() - started < 0.55
+
+    out = [line.split(" (")[0] for line in capsys.readouterr().out.splitlines()]
+    assert out == ["first", "one", "second", "two", "third", "skipped"]
+
+
+def test_first_failure_cancels_running_stages(capsys: pytest.CaptureFixture) -> None:
+    def slow_command(cancel: threading.Event):
+        success, output = run_command([sys.executable, "-c", "import time; time.sleep(10)"], cancel=cancel)
+        return success, [output]
+
+    stages = [("slow", slow_command), ("broken", _sleeper(0.05, passed=False, line="boom"))]
+    started = time.monotonic()
+    assert run_stages(stages) is False
+    assert time.monotonic() - started < 5
+
+    out = capsys.readouterr().out
+    assert "⏹  Cancelled" in out and "boom" in out
+    assert out.index("slow") < out.index("broken")
+
+
+def test_parse_pytest_count() -> None:
+    assert parse_pytest_count("====\ncollected 12 items\n\ntests/a.py ....") == 12
+    assert parse_pytest_count("....F\n1 failed, 4 passed, 2 deselected in 0.31s\n") == 5
+    assert parse_pytest_count("3 passed, 1 error in 1.2s") == 4
+    assert parse_pytest_count("no tests ran") is None
+
+
+def test_fast_mode_runs_dependent_tests_and_caches(tmp_path, monkeypatch, capsys) -> None:
+    from scripts import validate
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "calc.py").write_text("def add(a, b):\n    return a + b\n")
+    (tmp_path / "unrelated.py").write_text("")
+    (tmp_path / "test_calc.py").write_text("from calc import add\n\ndef test_add():\n    assert add(1, 2) == 3\n")
+    (tmp_path / "test_unrelated.py").write_text("import unrelated\n\ndef test_fails():\n    assert False\n")
+
+    assert validate.run_fast_mode("calc.py") == (True, validate.EXIT_SUCCESS)
+    assert "1 dependent test file(s): test_calc.py" in capsys.readouterr().out
+
+    monkeypatch.setattr(validate, "run_stages", lambda *a, **k: pytest.fail("cache miss"))
+    assert validate.run_fast_mode("calc.py") == (True, validate.EXIT_SUCCESS)
+    assert "cached" in capsys.readouterr().out
+
+    # Changing a dependent test invalidates the cached pass
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "test_calc.py").write_text("from calc import add\n\ndef test_add():\n    assert add(1, 2) == 4\n")
+    assert validate.run_fast_mode("calc.py") == (False, validate.EXIT_VALIDATION_FAILED)
+
+
+def test_fast_mode_cache_covers_transitive_imports(tmp_path, monkeypatch) -> None:
+    from scripts import validate
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "base.py").write_text("FACTOR = 1\n")
+    (tmp_path / "helpers.py").write_text("from base import FACTOR\n\ndef scale(x):\n    return x * FACTOR\n")
+    (tmp_path / "calc.py").write_text("from helpers import scale\n\ndef add(a, b):\n    return scale(a + b)\n")
+    (tmp_path / "fixtures.py").write_text("EXPECTED = 3\n")
+    (tmp_path / "test_calc.py").write_text(
+        "from calc import add\nfrom fixtures import EXPECTED\n\ndef test_add():\n    assert add(1, 2) == EXPECTED\n")
+    assert validate.run_fast_mode("calc.py") == (True, validate.EXIT_SUCCESS)
+
+    # A dependency of a dependency of the file
+    (tmp_path / "base.py").write_text("FACTOR = 2\n")
+    assert validate.run_fast_mode("calc.py") == (False, validate.EXIT_VALIDATION_FAILED)
+
+    # A module only the selected test imports
+    (tmp_path / "base.py").write_text("FACTOR = 1\n")
+    assert validate.run_fast_mode("calc.py") == (True, validate.EXIT_SUCCESS)
+    (tmp_path / "fixtures.py").write_text("EXPECTED = 4\n")
+    assert validate.run_fast_mode("calc.py") == (False, validate.EXIT_VALIDATION_FAILED)
+
+
+def test_full_harness_verdict_cached_by_tree_state(tmp_path, monkeypatch, capsys) -> None:
+    import subprocess
+
+    from scripts import validate
+
+    monkeypatch.chdir(tmp_path)
+    subprocess.run(["git", "init", "-q"], check=True)
+    (tmp_path / "app.py").write_text("x = 1\n")
+    subprocess.run(["git", "add", "."], check=True)
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init"], check=True)
+
+    runs = []
+    verdict = [(True, validate.EXIT_SUCCESS)]
+
+    def fake_harness(jobs, test_workers=None):
+        runs.append(jobs)
+        print("stage output")
+        return verdict[0]
+
+    monkeypatch.setattr(validate, "_run_harness", fake_harness)
+
+    assert validate.run_full_harness() == (True, validate.EXIT_SUCCESS)
+    assert validate.run_full_harness() == (True, validate.EXIT_SUCCESS)
+    assert len(runs) == 1 and "cached" in capsys.readouterr().out
+
+    assert validate.run_full_harness(use_cache=False) == (True, validate.EXIT_SUCCESS)
+    assert len(runs) == 2
+
+    # Uncommitted and untracked changes are part of the key
+    (tmp_path / "app.py").write_text("x = 2\n")
+    verdict[0] = (False, validate.EXIT_VALIDATION_FAILED)
+    assert validate.run_full_harness() == (False, validate.EXIT_VALIDATION_FAILED)
+    capsys.readouterr()
+    # Failures (possibly a timeout or a crashed stage) are never cached
+    assert validate.run_full_harness() == (False, validate.EXIT_VALIDATION_FAILED)
+    assert len(runs) == 4
+    assert "stage output" in capsys.readouterr().out
+    verdict[0] = (True, validate.EXIT_SUCCESS)
+    assert validate.run_full_harness() == (True, validate.EXIT_SUCCESS)
+    assert len(runs) == 5
+
+    (tmp_path / "new.py").write_text("")
+    validate.run_full_harness()
+    assert len(runs) == 6
+
+    (tmp_path / "app.py").write_text("x = 1\n")
+    (tmp_path / "new.py").unlink()
+    assert validate.run_full_harness() == (True, validate.EXIT_SUCCESS)
+    assert len(runs) == 6
+
+    # A failing re-run drops the recorded pass for that tree state
+    verdict[0] = (False, validate.EXIT_VALIDATION_FAILED)
+    assert validate.run_full_harness(use_cache=False) == (False, validate.EXIT_VALIDATION_FAILED)
+    assert validate.run_full_harness() == (False, validate.EXIT_VALIDATION_FAILED)
+    assert len(runs) == 8